@@ -0,0 +1,12 @@
+"""
+Benchmarks for the PCA stat-arb code paths.
+
+- ``synthetic``       factor-model return generator (no network needed)
+- ``suite``           times the main entry points across universe sizes and
+                      history lengths, saving JSON results
+- ``compare``         regression gate between two suite result files
+- ``truncated_pca``   full vs truncated eigensolver on a large universe
+- ``float32_report``  float32 vs float64 backtest agreement per index
+
+Run the suite with ``python -m benchmarks.suite``.
+"""
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Performance regression gate over two ``benchmarks.suite`` result files.
+
+Cases are matched on (function, N assets, years). Each repeat timing is
+divided by the reference timing the suite paired with it (``reference_s``),
+which removes the machine's speed at that moment; between two runs of the
+same tree that drift alone is often 1.3-1.8x on a shared host. Files without
+reference timings are compared on raw times, with a warning. A case is a
+regression when all of these hold:
+
+- both sides have at least ``MIN_REPEATS`` (7) repeats; smaller cases are
+  reported as "too few repeats" and never gate,
+- the normalised median slowed down by more than ``--threshold`` (default 10%),
+- a one-sided Mann-Whitney U test on the normalised per-repeat timings
+  rejects "no slowdown" at ``--alpha`` (default 0.01),
+- the slowdown in seconds exceeds a floor that grows with the case size,
+  ``--min-delta-ms * sqrt(baseline median / 1 ms)``: 0.5 ms on a 1 ms case,
+  5 ms on a 100 ms case, since scheduler jitter accumulates over a call.
+
+A per-case diff table and a per-function geometric-mean speed ratio are
+printed; the exit status is 1 when any case regressed, 0 otherwise.
+
+Without a candidate file the baseline's cases are rerun on the current tree
+(same synthetic market settings and repeats), so a check before merging is:
+
+    python -m benchmarks.suite --output data/benchmarks/main.json   # on main
+    python -m benchmarks.compare data/benchmarks/main.json          # on the branch
+
+Usage:
+    python -m benchmarks.compare BASELINE.json [CANDIDATE.json]
+    python -m benchmarks.compare base.json new.json --threshold 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy.stats import mannwhitneyu
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+CASE_KEYS = ["function", "n_assets", "years"]
+MIN_REPEATS = 7
+
+
+def load_results(path: str) -> dict:
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def has_references(payload: dict) -> bool:
+    """Whether every case carries per-repeat reference timings."""
+    return all(
+        len(record.get("reference_s") or []) == len(record["times_s"])
+        for record in payload["results"]
+    )
+
+
+def _timing_frame(payload: dict, normalise: bool) -> pd.DataFrame:
+    """One row per case: raw median, per-repeat (normalised) timings and repeat count."""
+    rows = []
+    for record in payload["results"]:
+        times = np.asarray(record["times_s"], dtype=float)
+        scaled = times / np.asarray(record["reference_s"], dtype=float) if normalise else times
+        rows.append({
+            "function": record["function"],
+            "n_assets": record["n_assets"],
+            "years": record["years"],
+            "median_s": float(np.median(times)),
+            "scaled": scaled,
+            "repeats": len(times),
+        })
+    return pd.DataFrame(rows, columns=CASE_KEYS + ["median_s", "scaled", "repeats"])
+
+
+def _case_status(
+    row: pd.Series,
+    threshold: float,
+    min_delta_s: float,
+    alpha: float,
+) -> tuple[float, float, float, str]:
+    """``(ratio, p_value, floor_s, status)`` for one merged case row."""
+    if not isinstance(row["scaled_base"], np.ndarray) or not isinstance(row["scaled_new"], np.ndarray):
+        return np.nan, np.nan, np.nan, "missing"
+
+    base, new = row["scaled_base"], row["scaled_new"]
+    ratio = float(np.median(new) / np.median(base))
+    floor_s = min_delta_s * float(np.sqrt(row["median_s_base"] / 1e-3))
+    delta_s = (ratio - 1.0) * row["median_s_base"]
+    if min(len(base), len(new)) < MIN_REPEATS:
+        return ratio, np.nan, floor_s, "too few repeats"
+
+    if ratio > 1.0 + threshold and delta_s > floor_s:
+        p_value = float(mannwhitneyu(new, base, alternative="greater").pvalue)
+        return ratio, p_value, floor_s, "REGRESSION" if p_value < alpha else "ok"
+    if ratio < 1.0 / (1.0 + threshold) and -delta_s > floor_s:
+        p_value = float(mannwhitneyu(new, base, alternative="less").pvalue)
+        return ratio, p_value, floor_s, "improvement" if p_value < alpha else "ok"
+    return ratio, np.nan, floor_s, "ok"
+
+
+def compare_results(
+    baseline: dict,
+    candidate: dict,
+    threshold: float = 0.10,
+    min_delta_s: float = 0.0005,
+    alpha: float = 0.01,
+) -> pd.DataFrame:
+    """Per-case comparison table.
+
+    ``status`` is REGRESSION / improvement / ok / too few repeats / missing.
+    ``ratio`` is the normalised median ratio (new / base) when both files have
+    reference timings, the raw one otherwise; ``p_value`` is only computed for
+    cases past the ratio and floor checks.
+    """
+    normalise = has_references(baseline) and has_references(candidate)
+    merged = _timing_frame(baseline, normalise).merge(
+        _timing_frame(candidate, normalise),
+        on=CASE_KEYS,
+        how="outer",
+        suffixes=("_base", "_new"),
+    )
+    columns = ["ratio", "p_value", "floor_s", "status"]
+    if merged.empty:
+        return merged.assign(**{c: pd.Series(dtype=float) for c in columns})
+    merged[columns] = pd.DataFrame(
+        [_case_status(row, threshold, min_delta_s, alpha) for _, row in merged.iterrows()],
+        index=merged.index,
+        columns=columns,
+    )
+    merged["normalised"] = normalise
+    merged = merged.drop(columns=["scaled_base", "scaled_new"])
+    return merged.sort_values(CASE_KEYS).reset_index(drop=True)
+
+
+def function_summary(table: pd.DataFrame) -> pd.DataFrame:
+    """Geometric-mean median ratio and regression count per function."""
+    matched = table.dropna(subset=["ratio"])
+    return matched.groupby("function").agg(
+        cases=("ratio", "size"),
+        geomean_ratio=("ratio", lambda r: float(np.exp(np.log(r).mean()))),
+        worst_ratio=("ratio", "max"),
+        regressions=("status", lambda s: int((s == "REGRESSION").sum())),
+    )
+
+
+def format_table(table: pd.DataFrame) -> str:
+    def ms(value: float) -> str:
+        return "-" if pd.isna(value) else f"{value * 1e3:.1f}"
+
+    lines = [
+        f"{'function':<28} {'N':>5} {'years':>6} {'base ms':>10} {'new ms':>10} "
+        f"{'change':>8} {'floor ms':>9} {'p':>7}  status",
+        "-" * 100,
+    ]
+    for row in table.itertuples(index=False):
+        change = "-" if pd.isna(row.ratio) else f"{(row.ratio - 1.0) * 100:+.1f}%"
+        p_value = "-" if pd.isna(row.p_value) else f"{row.p_value:.3f}"
+        lines.append(
+            f"{row.function:<28} {row.n_assets:>5} {row.years:>6g} "
+            f"{ms(row.median_s_base):>10} {ms(row.median_s_new):>10} "
+            f"{change:>8} {ms(row.floor_s):>9} {p_value:>7}  {row.status}"
+        )
+    return "\n".join(lines)
+
+
+def rerun_baseline_cases(baseline: dict) -> dict:
+    """Time the baseline's cases on the current tree with the same settings.
+
+    Repeats are raised to ``MIN_REPEATS`` so the rerun side can always gate.
+    """
+    from benchmarks.suite import run_suite
+
+    meta = baseline["meta"]
+    results = baseline["results"]
+    return run_suite(
+        assets=sorted({r["n_assets"] for r in results}),
+        years=sorted({r["years"] for r in results}),
+        functions=list(dict.fromkeys(r["function"] for r in results)),
+        repeats=max(meta.get("repeats", MIN_REPEATS), MIN_REPEATS),
+        warmup=meta.get("warmup", 1),
+        n_factors=meta.get("n_factors", 5),
+        mean_reversion=meta.get("mean_reversion", 0.1),
+        seed=meta.get("seed", 0),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Flag statistically significant slowdowns between benchmark runs")
+    parser.add_argument("baseline", help="Baseline results JSON from benchmarks.suite.")
+    parser.add_argument(
+        "candidate",
+        nargs="?",
+        help="Candidate results JSON. Default: rerun the baseline's cases on the current tree.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative median slowdown that counts as a regression (default: 0.10 = 10%%).",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=0.5,
+        help="Slowdown floor for a 1 ms case; scales with sqrt(case median / 1 ms) (default: 0.5).",
+    )
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=0.01,
+        help="Significance level of the one-sided Mann-Whitney U test (default: 0.01).",
+    )
+    parser.add_argument("--save", type=str, default=None, help="Also save the rerun candidate results here.")
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline)
+    if args.candidate:
+        candidate = load_results(args.candidate)
+    else:
+        print(f"Rerunning {len(baseline['results'])} baseline cases on the current tree ...")
+        candidate = rerun_baseline_cases(baseline)
+        if args.save:
+            out_dir = os.path.dirname(args.save)
+            if out_dir:
+                os.makedirs(out_dir, exist_ok=True)
+            with open(args.save, "w") as fh:
+                json.dump(candidate, fh, indent=2)
+
+    table = compare_results(baseline, candidate, args.threshold, args.min_delta_ms / 1e3, args.alpha)
+    if not table.empty and not table["normalised"].iloc[0]:
+        print("Warning: no reference timings in one of the files; comparing raw times, "
+              "which drift between runs on a shared machine.")
+    print()
+    print(format_table(table))
+    print()
+    with pd.option_context("display.float_format", "{:.3f}".format):
+        print(function_summary(table).to_string())
+
+    regressions = table[table["status"] == "REGRESSION"]
+    print()
+    too_few = int((table["status"] == "too few repeats").sum())
+    if too_few:
+        print(f"{too_few} case(s) have fewer than {MIN_REPEATS} repeats and were not gated; "
+              f"rerun the suite with --repeats {MIN_REPEATS} or more.")
+    if regressions.empty:
+        print(f"No regressions above {args.threshold:.0%}.")
+        return
+    print(f"{len(regressions)} regression(s) above {args.threshold:.0%}:")
+    for row in regressions.itertuples(index=False):
+        print(f"  {row.function} N={row.n_assets} years={row.years:g}: {row.ratio:.2f}x slower")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Float32 vs float64 backtest agreement, per index.
+
+For every index with a returns file under data/<index>/, runs the signal
+and trading stages once with ``dtype="float64"`` and once with
+``dtype="float32"`` (PCA fits are shared, they always run in float64) and
+reports:
+
+- Sharpe of each run and their difference,
+- the share of (day, asset) position cells that differ,
+- the largest absolute z-score difference,
+- signal memory (z-scores + aligned returns) for each precision,
+- signal-stage wall time for each precision.
+
+When the fits retain every component (K == N) the residuals are pure
+rounding noise in either precision, so those rows disagree wildly; the
+``components``/``assets`` columns make that case easy to spot.
+
+Usage:
+    python benchmarks/float32_report.py
+    python benchmarks/float32_report.py --index nifty_bank nifty_it --lookback 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from nifty50_stat_arb.pca_backtest import (
+    BacktestConfig,
+    annualized_sharpe,
+    compute_block_betas,
+    compute_block_signals,
+    load_returns,
+    run_backtest_on_signals,
+    simulate_positions,
+)
+from nifty50_stat_arb.storage import find_frame
+from tune_hyperparams import ALL_INDICES
+
+
+def _signal_bytes(signals) -> int:
+    return sum(
+        s.zscores.memory_usage(index=False).sum() + s.returns.memory_usage(index=False).sum()
+        for s in signals
+    )
+
+
+def compare_precision(returns: pd.DataFrame, config: BacktestConfig) -> dict:
+    """Float64 vs float32 metrics for one returns matrix."""
+    block_betas = compute_block_betas(returns, config)
+
+    runs = {}
+    for dtype in ("float64", "float32"):
+        cfg = BacktestConfig(**{**config.__dict__, "dtype": dtype})
+        start = time.perf_counter()
+        signals = compute_block_signals(returns.astype(dtype), cfg, block_betas=block_betas)
+        elapsed = time.perf_counter() - start
+        results = run_backtest_on_signals(signals, cfg, verbose=False)
+        runs[dtype] = (cfg, signals, results, elapsed)
+
+    cfg64, signals64, results64, time64 = runs["float64"]
+    cfg32, signals32, results32, time32 = runs["float32"]
+
+    cells = mismatched = 0
+    max_z_diff = 0.0
+    for s64, s32 in zip(signals64, signals32):
+        z64 = s64.zscores.to_numpy()
+        z32 = s32.zscores.to_numpy(dtype=np.float64)
+        positions64 = simulate_positions(z64, cfg64)
+        positions32 = simulate_positions(s32.zscores.to_numpy(), cfg32)
+        cells += positions64.size
+        mismatched += int((positions64 != positions32).sum())
+        if np.isfinite(z64).any():
+            max_z_diff = max(max_z_diff, float(np.nanmax(np.abs(z64 - z32))))
+
+    sharpe64 = float(annualized_sharpe(results64["strategy_return"].to_numpy()))
+    sharpe32 = float(annualized_sharpe(results32["strategy_return"].to_numpy()))
+    return {
+        "assets": returns.shape[1],
+        "components": max((len(betas) for betas in block_betas), default=0),
+        "sharpe_float64": sharpe64,
+        "sharpe_float32": sharpe32,
+        "sharpe_diff": sharpe32 - sharpe64,
+        "position_mismatch_pct": 100.0 * mismatched / cells if cells else 0.0,
+        "max_abs_z_diff": max_z_diff,
+        "signal_mb_float64": _signal_bytes(signals64) / 2**20,
+        "signal_mb_float32": _signal_bytes(signals32) / 2**20,
+        "signal_s_float64": time64,
+        "signal_s_float32": time32,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Quantify float32 vs float64 backtest differences per index")
+    parser.add_argument("--index", nargs="+", metavar="NAME", help="Run only these indices. Default: all.")
+    parser.add_argument("--lookback", type=int, default=60)
+    parser.add_argument("--entry-z", type=float, default=1.5)
+    parser.add_argument("--exit-z", type=float, default=0.0)
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=os.path.join(PROJECT_ROOT, "data", "float32_report.csv"),
+        help="Path to save the report CSV.",
+    )
+    args = parser.parse_args()
+
+    selected = set(args.index) if args.index else {name for name, _ in ALL_INDICES}
+    config = BacktestConfig(
+        lookback=args.lookback,
+        long_entry_z=-args.entry_z,
+        short_entry_z=+args.entry_z,
+        long_exit_z=+args.exit_z,
+        short_exit_z=-args.exit_z,
+    )
+
+    rows = []
+    for index_name, _ in ALL_INDICES:
+        if index_name not in selected:
+            continue
+        returns_path = find_frame(os.path.join(PROJECT_ROOT, "data", index_name, "returns"))
+        if not os.path.exists(returns_path):
+            print(f"[SKIP] {index_name}: returns file not found")
+            continue
+        print(f"{index_name} ...")
+        rows.append({"index": index_name, **compare_precision(load_returns(returns_path), config)})
+
+    if not rows:
+        print("\nNo results to save.")
+        return
+
+    report = pd.DataFrame(rows).set_index("index")
+    with pd.option_context("display.float_format", "{:.4g}".format, "display.width", 160):
+        print(report.to_string())
+
+    out_dir = os.path.dirname(args.output)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    report.to_csv(args.output)
+    print(f"\nSaved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
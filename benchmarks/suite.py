@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Timing suite for the PCA / backtest / tuning entry points on synthetic data.
+
+For every (N assets, T years) case a synthetic factor-model market is
+generated (``benchmarks.synthetic``) and each function is timed ``repeats``
+times after ``warmup`` untimed calls (default 7, the fewest
+``benchmarks.compare`` will gate on):
+
+- ``compute_pca``                  Ledoit-Wolf + eigendecomposition, 80% train
+- ``compute_predicted_returns``    projection onto the retained components
+- ``run_backtest_on_df``           full rolling refit / trade backtest
+- ``run_backtest_baseline_on_df``  index mean-reversion baseline
+- ``grid_search``                  coarse threshold grid on the validation slice
+
+PCA and signal memo caches are cleared before every call, so each timing
+includes the full computation.
+
+Shared machines drift: CPU frequency, noisy neighbours and throttling can
+slow a whole run, or a few seconds of it, by tens of percent. Two measures
+keep that out of comparisons. Repeats are interleaved, so repeat r of every
+case runs before repeat r + 1 of any, and a burst spreads over many cases
+instead of shifting all repeats of one. Each timed call is also paired
+with a fixed ``reference_workload`` timed right before it (``reference_s``),
+which ``benchmarks.compare`` uses to normalise away the machine's current
+speed.
+
+Results (every repeat and its reference, plus median and min) are written
+as JSON so later runs can be compared against them.
+
+Usage:
+    python -m benchmarks.suite
+    python -m benchmarks.suite --assets 10 50 --years 1 5 --repeats 5
+    python -m benchmarks.suite --functions run_backtest_on_df grid_search
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime as dt
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.synthetic import TRADING_DAYS_PER_YEAR, synthetic_years
+from nifty50_stat_arb.pca import compute_pca
+from nifty50_stat_arb.pca_backtest import (
+    BacktestConfig,
+    _build_betas_from_ranked_table,
+    compute_predicted_returns,
+    run_backtest_baseline_on_df,
+    run_backtest_on_df,
+)
+from nifty50_stat_arb.pca_cache import reset_pca_caches
+import tune_hyperparams
+
+
+DEFAULT_ASSETS = [10, 50, 100, 250, 500]
+DEFAULT_YEARS = [1, 5, 10, 20]
+DEFAULT_OUTPUT_DIR = os.path.join(PROJECT_ROOT, "data", "benchmarks")
+DEFAULT_REPEATS = 7
+
+
+def _reset_caches() -> None:
+    reset_pca_caches()
+    tune_hyperparams._SIGNAL_CACHE.clear()
+
+
+def _prepare(name: str, returns: pd.DataFrame) -> Callable[[], object]:
+    """Build the zero-argument call timed for benchmark ``name``."""
+    config = BacktestConfig()
+
+    if name == "compute_pca":
+        return lambda: compute_pca(returns, train_fraction=0.8, variance_threshold=0.99)
+
+    if name == "compute_predicted_returns":
+        _, _, ranked_table = compute_pca(returns, train_fraction=0.8, variance_threshold=0.99)
+        betas = _build_betas_from_ranked_table(ranked_table)
+        return lambda: compute_predicted_returns(returns, betas)
+
+    if name == "run_backtest_on_df":
+        return lambda: run_backtest_on_df(returns, config, verbose=False)
+
+    if name == "run_backtest_baseline_on_df":
+        return lambda: run_backtest_baseline_on_df(returns, config, verbose=False)
+
+    if name == "grid_search":
+        _, val, _ = tune_hyperparams.split_returns(returns)
+        template = BacktestConfig(refit_months=config.refit_months, trade_months=config.trade_months)
+
+        def call():
+            with contextlib.redirect_stdout(io.StringIO()):
+                return tune_hyperparams.grid_search(
+                    val, tune_hyperparams.COARSE_ENTRY, tune_hyperparams.COARSE_EXIT, template
+                )
+
+        return call
+
+    raise ValueError(f"Unknown benchmark {name!r}; expected one of {BENCHMARKS}")
+
+
+BENCHMARKS = [
+    "compute_pca",
+    "compute_predicted_returns",
+    "run_backtest_on_df",
+    "run_backtest_baseline_on_df",
+    "grid_search",
+]
+
+
+_REFERENCE_RNG = np.random.default_rng(12345)
+_REFERENCE_RETURNS = _REFERENCE_RNG.standard_normal((600, 40))
+_REFERENCE_FRAME = pd.DataFrame(_REFERENCE_RETURNS)
+_REFERENCE_COVARIANCE = np.cov(_REFERENCE_RETURNS.T)
+
+
+def reference_workload() -> None:
+    """Fixed few-millisecond mix of what the benchmarks do.
+
+    A small eigendecomposition, a pandas rolling window, a matrix product
+    and a pure-Python loop. Its timing tracks the machine's current speed.
+    """
+    np.linalg.eigh(_REFERENCE_COVARIANCE)
+    _REFERENCE_FRAME.rolling(20).std()
+    (_REFERENCE_RETURNS @ _REFERENCE_RETURNS.T).sum()
+    total = 0
+    for i in range(3000):
+        total += i
+
+
+def _elapsed(call: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+def time_interleaved(
+    calls: list[Callable[[], object]],
+    repeats: int,
+    warmup: int,
+) -> tuple[list[list[float]], list[list[float]]]:
+    """Round-robin timings of several calls, each paired with a reference timing.
+
+    Returns ``(times, references)``, one list of ``repeats`` seconds per call.
+    """
+    for call in calls:
+        for _ in range(warmup):
+            _reset_caches()
+            call()
+    reference_workload()
+
+    times: list[list[float]] = [[] for _ in calls]
+    references: list[list[float]] = [[] for _ in calls]
+    for _ in range(repeats):
+        for i, call in enumerate(calls):
+            references[i].append(_elapsed(reference_workload))
+            _reset_caches()
+            times[i].append(_elapsed(call))
+    return times, references
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_suite(
+    assets: list[int],
+    years: list[float],
+    functions: list[str],
+    repeats: int = DEFAULT_REPEATS,
+    warmup: int = 1,
+    n_factors: int = 5,
+    mean_reversion: float = 0.1,
+    seed: int = 0,
+) -> dict:
+    """Time every function on every (assets, years) case; returns the JSON payload.
+
+    All cases are prepared first, then timed with ``time_interleaved``.
+    """
+    cases = []
+    for n_assets in assets:
+        for n_years in years:
+            returns = synthetic_years(
+                n_years, n_assets, n_factors=n_factors, mean_reversion=mean_reversion, seed=seed
+            )
+            for name in functions:
+                cases.append((name, n_assets, n_years, len(returns), _prepare(name, returns)))
+
+    all_times, all_references = time_interleaved([case[-1] for case in cases], repeats, warmup)
+
+    results = []
+    for (name, n_assets, n_years, n_days, _), times, references in zip(cases, all_times, all_references):
+        results.append({
+            "function": name,
+            "n_assets": n_assets,
+            "years": n_years,
+            "n_days": n_days,
+            "times_s": times,
+            "reference_s": references,
+            "median_s": float(np.median(times)),
+            "min_s": float(np.min(times)),
+        })
+        print(
+            f"  N={n_assets:>4} T={n_years:>4}y  {name:<28} "
+            f"median {np.median(times) * 1e3:10.1f} ms  (n={repeats})"
+        )
+
+    return {
+        "meta": {
+            "created": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "repeats": repeats,
+            "warmup": warmup,
+            "interleaved": True,
+            "n_factors": n_factors,
+            "mean_reversion": mean_reversion,
+            "seed": seed,
+            "trading_days_per_year": TRADING_DAYS_PER_YEAR,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time the backtest/PCA/tuning entry points on synthetic data")
+    parser.add_argument("--assets", type=int, nargs="+", default=DEFAULT_ASSETS, help="Universe sizes N.")
+    parser.add_argument("--years", type=float, nargs="+", default=DEFAULT_YEARS, help="History lengths in years.")
+    parser.add_argument("--functions", nargs="+", choices=BENCHMARKS, default=BENCHMARKS)
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=DEFAULT_REPEATS,
+        help=f"Timed calls per case (default: {DEFAULT_REPEATS}).",
+    )
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed calls per case first (default: 1).")
+    parser.add_argument("--factors", type=int, default=5, help="Synthetic factors K (default: 5).")
+    parser.add_argument(
+        "--mean-reversion",
+        type=float,
+        default=0.1,
+        help="Daily reversion of the idiosyncratic price deviation, 0..1 (default: 0.1).",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Results JSON path (default: data/benchmarks/benchmark_<UTC timestamp>.json).",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"Benchmarking {len(args.functions)} functions on {len(args.assets) * len(args.years)} "
+        f"synthetic markets ({args.repeats} repeats, {args.warmup} warm-up)"
+    )
+    payload = run_suite(
+        assets=args.assets,
+        years=args.years,
+        functions=args.functions,
+        repeats=args.repeats,
+        warmup=args.warmup,
+        n_factors=args.factors,
+        mean_reversion=args.mean_reversion,
+        seed=args.seed,
+    )
+
+    output = args.output or os.path.join(
+        DEFAULT_OUTPUT_DIR, f"benchmark_{dt.datetime.now(dt.timezone.utc):%Y%m%dT%H%M%SZ}.json"
+    )
+    out_dir = os.path.dirname(output)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    with open(output, "w") as fh:
+        json.dump(payload, fh, indent=2)
+    print(f"\nSaved {len(payload['results'])} timings to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Full vs truncated PCA eigensolver on a synthetic large universe.
+
+Builds a factor-model return panel (a few strong market/sector factors plus
+idiosyncratic noise), estimates the Ledoit-Wolf covariance once and times
+``pca_from_covariance`` with ``solver="full"`` and ``solver="truncated"`` at
+several variance thresholds. Also reports how closely the truncated solve
+matches the full one (eigenvalues and largest principal angle).
+
+Usage:
+    python benchmarks/truncated_pca.py
+    python benchmarks/truncated_pca.py --assets 500 --days 1000 --factors 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.covariance import LedoitWolf
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from nifty50_stat_arb.pca import pca_from_covariance, subspace_distance
+
+
+def synthetic_covariance(n_assets: int, n_days: int, n_factors: int, seed: int) -> tuple[np.ndarray, list[str]]:
+    """Ledoit-Wolf covariance of a synthetic factor-model return panel."""
+    rng = np.random.default_rng(seed)
+    factor_vol = 0.02 / np.sqrt(np.arange(1, n_factors + 1))
+    factors = rng.standard_normal((n_days, n_factors)) * factor_vol
+    loadings = rng.standard_normal((n_factors, n_assets))
+    returns = factors @ loadings + 0.01 * rng.standard_normal((n_days, n_assets))
+    columns = [f"S{i}.NS" for i in range(n_assets)]
+    return LedoitWolf().fit(returns).covariance_, columns
+
+
+def _time(func, repeats: int) -> tuple[float, object]:
+    best = np.inf
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _component_matrix(table: pd.DataFrame, columns: list[str]) -> np.ndarray:
+    return table[columns].to_numpy().T
+
+
+def run_benchmark(
+    n_assets: int,
+    n_days: int,
+    n_factors: int,
+    thresholds: list[float],
+    repeats: int,
+    seed: int,
+) -> pd.DataFrame:
+    covariance, columns = synthetic_covariance(n_assets, n_days, n_factors, seed)
+
+    rows = []
+    for threshold in thresholds:
+        full_time, full = _time(lambda: pca_from_covariance(covariance, columns, threshold, solver="full"), repeats)
+        trunc_time, trunc = _time(
+            lambda: pca_from_covariance(covariance, columns, threshold, solver="truncated"), repeats
+        )
+        k = min(len(full), len(trunc))
+        eig_err = np.max(
+            np.abs(full["eigenvalue"].to_numpy()[:k] - trunc["eigenvalue"].to_numpy()[:k])
+            / full["eigenvalue"].to_numpy()[:k]
+        )
+        angle = subspace_distance(_component_matrix(full, columns)[:, :k], _component_matrix(trunc, columns)[:, :k])
+        rows.append(
+            {
+                "threshold": threshold,
+                "components_full": len(full),
+                "components_truncated": len(trunc),
+                "full_ms": full_time * 1e3,
+                "truncated_ms": trunc_time * 1e3,
+                "speedup": full_time / trunc_time,
+                "max_rel_eigenvalue_err": eig_err,
+                "max_angle_deg": angle,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark full vs truncated PCA eigensolvers")
+    parser.add_argument("--assets", type=int, default=500)
+    parser.add_argument("--days", type=int, default=1000)
+    parser.add_argument("--factors", type=int, default=15)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.5, 0.7, 0.8, 0.9, 0.99])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"Synthetic universe: {args.assets} assets, {args.days} days, {args.factors} factors "
+        f"(best of {args.repeats})"
+    )
+    results = run_benchmark(args.assets, args.days, args.factors, args.thresholds, args.repeats, args.seed)
+    with pd.option_context("display.float_format", "{:.4g}".format, "display.width", 140):
+        print(results.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,8 @@
 Compare PCA strategy vs. index mean-reversion baseline on test set.
 
 For each sector index:
-  1. Load tuning results (best entry_z, exit_z from validation).
+  1. Load tuning results (best entry_z, exit_z from validation, plus the
+     lookback / refit / trade windows when they were tuned too).
   2. Split returns chronologically 70 / 15 / 15.
   3. Run PCA strategy on test slice with tuned params.
   4. Run baseline (index mean-reversion) on test slice with same params.
@@ -12,6 +13,7 @@ For each sector index:
 Usage:
     python compare_strategies.py
     python compare_strategies.py --index nifty_bank nifty_it
+    python compare_strategies.py --lookback 40   # override the tuned lookback
 """
 
 from __future__ import annotations
@@ -36,6 +38,8 @@ from nifty50_stat_arb.pca_backtest import (
     run_backtest_on_df,
     run_backtest_baseline_on_df,
 )
+from nifty50_stat_arb.pca_cache import DEFAULT_PCA_CACHE_DIR
+from nifty50_stat_arb.storage import find_frame
 
 # ---------------------------------------------------------------------------
 # Index registry
@@ -160,12 +164,18 @@ def compare_index(
     refit_months: int,
     trade_months: int,
     output_dir: str,
+    engine: str = "vectorized",
+    pca_cache_dir: Optional[str] = None,
 ) -> dict:
     """
     Compare PCA and baseline strategies for a single index on test set.
     Returns a dict with Sharpe comparison results.
+
+    ``engine`` selects the array-based ("vectorized") or original loop
+    ("legacy") implementation for both strategies. ``pca_cache_dir``
+    persists PCA fits between runs (None keeps them in memory).
     """
-    returns_path = os.path.join(PROJECT_ROOT, "data", index_name, "returns.csv")
+    returns_path = find_frame(os.path.join(PROJECT_ROOT, "data", index_name, "returns"))
     pca_path = os.path.join(PROJECT_ROOT, "data", index_name, "pca_components.csv")
     
     if not os.path.exists(returns_path):
@@ -188,6 +198,8 @@ def compare_index(
         short_exit_z=-exit_z,
         refit_months=refit_months,
         trade_months=trade_months,
+        engine=engine,
+        pca_cache_dir=pca_cache_dir,
     )
     
     # Run PCA strategy on test.
@@ -211,6 +223,9 @@ def compare_index(
         "index": index_name,
         "entry_z": entry_z,
         "exit_z": exit_z,
+        "lookback": lookback,
+        "refit_months": refit_months,
+        "trade_months": trade_months,
         "pca_sharpe": pca_sharpe,
         "baseline_sharpe": baseline_sharpe,
         "pca_total_return": pca_results["cumulative_return"].iloc[-1] if not pca_results.empty else np.nan,
@@ -225,6 +240,16 @@ def compare_index(
 # CLI
 # ---------------------------------------------------------------------------
 
+def _tuned_window(override: Optional[int], tuning_row: pd.Series, column: str, default: int) -> int:
+    """CLI ``override`` if given, else the tuned value in ``tuning_row`` (older files lack it), else ``default``."""
+    if override is not None:
+        return override
+    value = tuning_row.get(column)
+    if value is None or pd.isna(value):
+        return default
+    return int(value)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Compare PCA strategy vs. index mean-reversion baseline on test set."
@@ -244,20 +269,34 @@ def main() -> None:
     parser.add_argument(
         "--lookback",
         type=int,
-        default=60,
-        help="Rolling z-score lookback window (default: 60).",
+        default=None,
+        help="Rolling z-score lookback window (default: tuned value, else 60).",
     )
     parser.add_argument(
         "--refit-months",
         type=int,
-        default=6,
-        help="PCA refit window in months (default: 6).",
+        default=None,
+        help="PCA refit window in months (default: tuned value, else 6).",
     )
     parser.add_argument(
         "--trade-months",
         type=int,
-        default=6,
-        help="Trade window in months (default: 6).",
+        default=None,
+        help="Trade window in months (default: tuned value, else 6).",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["vectorized", "legacy"],
+        default="vectorized",
+        help="Backtest implementation: array-based (default) or the original per-day loops.",
+    )
+    parser.add_argument(
+        "--pca-cache-dir",
+        nargs="?",
+        const=DEFAULT_PCA_CACHE_DIR,
+        default=None,
+        metavar="DIR",
+        help="Persist PCA fits to DIR (data/pca_cache if no value). Default: memory only.",
     )
     parser.add_argument(
         "--output-dir",
@@ -295,15 +334,24 @@ def main() -> None:
         tuning_row = tuning_df.loc[index_name]
         entry_z = float(tuning_row["entry_z"])
         exit_z = float(tuning_row["exit_z"])
+        lookback = _tuned_window(args.lookback, tuning_row, "lookback", 60)
+        refit_months = _tuned_window(args.refit_months, tuning_row, "refit_months", 6)
+        trade_months = _tuned_window(args.trade_months, tuning_row, "trade_months", 6)
+        print(
+            f"  Params: entry_z={entry_z:.2f}  exit_z={exit_z:.2f}  lookback={lookback}"
+            f"  refit_months={refit_months}  trade_months={trade_months}"
+        )
         
         row = compare_index(
             index_name=index_name,
             entry_z=entry_z,
             exit_z=exit_z,
-            lookback=args.lookback,
-            refit_months=args.refit_months,
-            trade_months=args.trade_months,
+            lookback=lookback,
+            refit_months=refit_months,
+            trade_months=trade_months,
             output_dir=args.output_dir,
+            engine=args.engine,
+            pca_cache_dir=args.pca_cache_dir,
         )
         
         if row:
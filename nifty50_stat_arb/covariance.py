@@ -0,0 +1,155 @@
+"""
+Streaming Ledoit-Wolf covariance for sliding refit windows.
+
+``sklearn.covariance.LedoitWolf`` refits from the full window every time,
+which costs O(W * N^2) per refit. ``StreamingLedoitWolf`` keeps sufficient
+statistics instead, so adding or removing one day of returns costs O(N^2):
+
+- s1 = sum x, s2 = sum x^2                        (N)
+- C = sum x x^T                                   (N x N)
+- B = sum (x^2) x^T, A = sum (x^2)(x^2)^T         (N x N)
+
+The centred quantities used by the Ledoit-Wolf shrinkage intensity are
+expanded in terms of these raw moments, so the result agrees with
+``LedoitWolf().fit(window)`` (``assume_centered=False``) to floating-point
+tolerance.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator
+
+import numpy as np
+
+
+class StreamingLedoitWolf:
+    """Ledoit-Wolf shrunk covariance over a window maintained by add/remove updates."""
+
+    def __init__(self, n_features: int):
+        self.n_features = n_features
+        self.n_samples = 0
+        self._s1 = np.zeros(n_features)
+        self._s2 = np.zeros(n_features)
+        self._cross = np.zeros((n_features, n_features))
+        self._sq_cross = np.zeros((n_features, n_features))
+        self._sq_sq = np.zeros((n_features, n_features))
+
+    @classmethod
+    def from_window(cls, window: np.ndarray) -> "StreamingLedoitWolf":
+        """Build the statistics for a T x N window in one batched pass."""
+        window = np.asarray(window, dtype=float)
+        estimator = cls(window.shape[1])
+        squared = window ** 2
+        estimator.n_samples = window.shape[0]
+        estimator._s1 = window.sum(axis=0)
+        estimator._s2 = squared.sum(axis=0)
+        estimator._cross = window.T @ window
+        estimator._sq_cross = squared.T @ window
+        estimator._sq_sq = squared.T @ squared
+        return estimator
+
+    def _apply(self, x: np.ndarray, sign: float) -> None:
+        x = np.asarray(x, dtype=float)
+        squared = x ** 2
+        self.n_samples += int(sign)
+        self._s1 += sign * x
+        self._s2 += sign * squared
+        self._cross += sign * np.outer(x, x)
+        self._sq_cross += sign * np.outer(squared, x)
+        self._sq_sq += sign * np.outer(squared, squared)
+
+    def add(self, x: np.ndarray) -> None:
+        """Add one observation (length-N vector) to the window."""
+        self._apply(x, 1.0)
+
+    def remove(self, x: np.ndarray) -> None:
+        """Remove an observation previously added to the window."""
+        if self.n_samples == 0:
+            raise ValueError("Cannot remove an observation from an empty window")
+        self._apply(x, -1.0)
+
+    def slide(self, x_new: np.ndarray, x_old: np.ndarray) -> None:
+        """Add the newest day and drop the oldest one."""
+        self.add(x_new)
+        self.remove(x_old)
+
+    def empirical_covariance(self) -> np.ndarray:
+        """Maximum-likelihood covariance (divides by n, like sklearn)."""
+        n = self.n_samples
+        mean = self._s1 / n
+        return self._cross / n - np.outer(mean, mean)
+
+    def shrinkage(self) -> float:
+        """Ledoit-Wolf shrinkage intensity for the current window."""
+        n, p = self.n_samples, self.n_features
+        if n < 2:
+            raise ValueError("At least two observations are required to estimate covariance")
+        if p == 1:
+            return 0.0
+
+        mean = self._s1 / n
+        mean_sq = mean ** 2
+        emp_cov = self.empirical_covariance()
+        emp_cov_trace = np.diag(emp_cov)
+        mu = emp_cov_trace.sum() / p
+
+        # sum_ij sum_t (x_ti - m_i)^2 (x_tj - m_j)^2, expanded in raw moments.
+        beta_ = (
+            self._sq_sq.sum()
+            - 4.0 * (self._sq_cross @ mean).sum()
+            + 2.0 * self._s2.sum() * mean_sq.sum()
+            + 4.0 * mean @ self._cross @ mean
+            - 4.0 * (mean @ self._s1) * mean_sq.sum()
+            + n * mean_sq.sum() ** 2
+        )
+        delta_ = np.sum(emp_cov ** 2)
+
+        beta = 1.0 / (p * n) * (beta_ / n - delta_)
+        delta = (delta_ - 2.0 * mu * emp_cov_trace.sum() + p * mu ** 2) / p
+        beta = min(beta, delta)
+        return 0.0 if beta == 0 else beta / delta
+
+    def covariance(self) -> tuple[np.ndarray, float]:
+        """Return the shrunk covariance matrix and the shrinkage used."""
+        shrinkage = self.shrinkage()
+        emp_cov = self.empirical_covariance()
+        mu = np.trace(emp_cov) / self.n_features
+        shrunk = (1.0 - shrinkage) * emp_cov
+        shrunk.flat[:: self.n_features + 1] += shrinkage * mu
+        return shrunk, shrinkage
+
+
+def rolling_ledoit_wolf(
+    returns: np.ndarray,
+    window: int,
+    step: int = 1,
+    refresh_every: int = 250,
+) -> Iterator[tuple[int, np.ndarray, float]]:
+    """Yield ``(end, covariance, shrinkage)`` for windows ``returns[end - window:end]``.
+
+    Windows advance by ``step`` rows (1 = daily, 5 = weekly, ...) with O(N^2)
+    updates per row. Statistics are rebuilt from the raw window every
+    ``refresh_every`` rows so rounding drift from add/remove stays bounded.
+    """
+    returns = np.asarray(returns, dtype=float)
+    if window < 2 or window > len(returns):
+        raise ValueError("window must be between 2 and the number of rows")
+    if step < 1:
+        raise ValueError("step must be at least 1")
+
+    estimator = StreamingLedoitWolf.from_window(returns[:window])
+    since_refresh = 0
+    end = window
+    while True:
+        covariance, shrinkage = estimator.covariance()
+        yield end, covariance, shrinkage
+
+        if end + step > len(returns):
+            return
+        for row in range(end, end + step):
+            estimator.slide(returns[row], returns[row - window])
+        end += step
+        since_refresh += step
+        if since_refresh >= refresh_every:
+            estimator = StreamingLedoitWolf.from_window(returns[end - window:end])
+            since_refresh = 0
@@ -3,11 +3,37 @@ Data fetcher module for downloading stock data for arbitrary symbol lists.
 """
 
 import os
-from typing import List, Optional
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
 
 import pandas as pd
 import yfinance as yf
 
+from .instrumentation import timed
+from .storage import append_frame, read_frame, read_frame_labels, write_frame
+
+
+_PERIOD_UNITS = {"d": "days", "wk": "weeks", "mo": "months", "y": "years"}
+
+
+def period_start(end: pd.Timestamp, period: str) -> Optional[pd.Timestamp]:
+    """First date of a yfinance ``period`` window ending at *end*; None for ``max``."""
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=end.year, month=1, day=1)
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if match is None:
+        raise ValueError(f"Unrecognised period {period!r}")
+    return end - pd.DateOffset(**{_PERIOD_UNITS[match.group(2)]: int(match.group(1))})
+
+
+def last_completed_business_day() -> pd.Timestamp:
+    """The business day before today: the end of a period-mode window."""
+    return pd.Timestamp.today().normalize() - pd.offsets.BDay(1)
+
 
 class DataFetcher:
     """Fetches historical price data for an arbitrary list of stock symbols."""
@@ -33,6 +59,11 @@ class DataFetcher:
         self,
         symbols: Optional[List[str]] = None,
         symbols_file: Optional[str] = None,
+        max_workers: int = 1,
+        max_retries: int = 0,
+        retry_backoff: float = 1.0,
+        downloader: Optional[Callable[..., pd.DataFrame]] = None,
+        price_store: Optional["PriceStore"] = None,
     ):
         """
         Initialize the DataFetcher.
@@ -42,6 +73,16 @@ class DataFetcher:
         Args:
             symbols: Explicit list of Yahoo Finance ticker symbols.
             symbols_file: Path to a text file with one ticker per line.
+            max_workers: Number of symbols downloaded concurrently. 1 keeps
+                the serial loop.
+            max_retries: Extra attempts per symbol after a failed or empty
+                download.
+            retry_backoff: Base delay in seconds between attempts; doubles
+                after every retry.
+            downloader: Callable with the ``yf.download`` signature. Defaults
+                to ``yf.download``; inject a fake to fetch offline.
+            price_store: Shared raw prices to serve symbols from before
+                falling back to the downloader.
         """
         if symbols_file is not None:
             self.symbols = self.load_symbols_from_file(symbols_file)
@@ -49,6 +90,17 @@ class DataFetcher:
             self.symbols = symbols
         else:
             raise ValueError("Provide either 'symbols' or 'symbols_file'.")
+
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_retries < 0:
+            raise ValueError("max_retries must be non-negative")
+
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.downloader = downloader if downloader is not None else yf.download
+        self.price_store = price_store
     
     def fetch_data(
         self,
@@ -66,7 +118,8 @@ class DataFetcher:
             start_date: Start date in 'YYYY-MM-DD' format
             end_date: End date in 'YYYY-MM-DD' format
             period: Period to fetch if start_date not provided (e.g., '1y', '2y', '5y')
-            returns_cache_path: Path to CSV file where log returns will be saved
+            cache_path: Price cache file; .csv, .parquet, .feather or .npy
+            returns_cache_path: File where log returns will be saved (same formats)
             
         Returns:
             DataFrame with closing prices for all symbols
@@ -74,6 +127,13 @@ class DataFetcher:
         date_filter_start = pd.to_datetime(start_date) if start_date else None
         date_filter_end = pd.to_datetime(end_date) if end_date else None
 
+        # Period mode with a shared store: the store decides how fresh the data
+        # is, so a cache older than the store is extended from it (no network).
+        store_period = (
+            not start_date and not end_date
+            and self.price_store is not None and not self.price_store.prices.empty
+        )
+
         cache_file = None
         cached_df = None
 
@@ -87,44 +147,50 @@ class DataFetcher:
                     print(f"Failed to read cache {cache_file}: {exc}")
                     cached_df = None
 
+            appended_from = None
+            extend_end = date_filter_end
+            if cached_df is not None and store_period:
+                store_end = self.price_store.prices.index[-1]
+                # End exclusive, so one day past the store's last row.
+                extend_end = store_end + pd.Timedelta(days=1) if store_end > cached_df.index[-1] else None
             if cached_df is not None:
                 if ((date_filter_start and date_filter_start < cached_df.index[0]) or
-                        (date_filter_end and date_filter_end > cached_df.index[-1])):
-                    print("Cached data range does not cover requested dates; refreshing cache.")
-                    cached_df = None
-                else:
-                    filtered = self._filter_by_dates(cached_df, date_filter_start, date_filter_end)
-                    if filtered.empty:
-                        print("Cached data does not contain any rows for the requested range; refetching...")
+                        (extend_end and extend_end > cached_df.index[-1])):
+                    print("Cached data range does not cover requested dates; fetching missing rows.")
+                    cached_end = cached_df.index[-1]
+                    extended_df = self._extend_cache(cached_df, date_filter_start, extend_end, period)
+                    if extended_df is None:
+                        print("Incremental update failed; refreshing cache.")
                         cached_df = None
+                    elif extended_df.index[0] == cached_df.index[0]:
+                        # Tail-only update: append the new rows in place.
+                        new_rows = extended_df.loc[extended_df.index > cached_end]
+                        if not new_rows.empty:
+                            append_frame(new_rows, cache_file)
+                            print(f"Appended {len(new_rows)} new rows to cache {cache_file}")
+                            appended_from = new_rows.index[0]
+                        cached_df = extended_df
                     else:
-                        filtered = self._prepare_prices(filtered)
-                        self._save_returns(filtered, returns_cache_path)
-                        print(f"Loaded data from cache: {cache_file}")
-                        return filtered
+                        self._save_cache(extended_df, cache_file)
+                        cached_df = extended_df
 
-        print(f"Fetching data for {len(self.symbols)} stocks...")
-
-        series_list = []
-        failed_symbols = []
-
-        for symbol in self.symbols:
-            try:
-                if start_date and end_date:
-                    data = yf.download(symbol, start=start_date, end=end_date, progress=False)
+            if cached_df is not None:
+                filtered = self._filter_by_dates(cached_df, date_filter_start, date_filter_end)
+                if filtered.empty:
+                    print("Cached data does not contain any rows for the requested range; refetching...")
+                    cached_df = None
                 else:
-                    data = yf.download(symbol, period=period, progress=False)
+                    if store_period:
+                        filtered = self._trim_to_period(filtered, period)
+                    # The cache only ever holds prepared prices (new delta rows
+                    # were prepared in _extend_cache), so no second full pass.
+                    self._save_returns(filtered, returns_cache_path, appended_from=appended_from)
+                    print(f"Loaded data from cache: {cache_file}")
+                    return filtered
 
-                if not data.empty and 'Close' in data.columns:
-                    series = data['Close'].copy()
-                    series.name = symbol
-                    series_list.append(series)
-                else:
-                    failed_symbols.append(symbol)
-                    
-            except Exception as e:
-                print(f"Failed to fetch {symbol}: {e}")
-                failed_symbols.append(symbol)
+        print(f"Fetching data for {len(self.symbols)} stocks...")
+
+        series_list, failed_symbols = self._download_all(self.symbols, start_date, end_date, period)
         
         if failed_symbols:
             print(f"Warning: Failed to fetch data for {len(failed_symbols)} symbols: {failed_symbols}")
@@ -144,10 +210,159 @@ class DataFetcher:
         filtered = self._filter_by_dates(prices_df, date_filter_start, date_filter_end)
         if filtered.empty:
             raise ValueError("No data available for the requested date range")
+        if store_period:
+            filtered = self._trim_to_period(filtered, period)
 
         self._save_returns(filtered, returns_cache_path)
         return filtered
 
+    @timed("fetch.download")
+    def _download_all(
+        self,
+        symbols: List[str],
+        start_date: Optional[str],
+        end_date: Optional[str],
+        period: str,
+        retry_empty: bool = True,
+    ) -> Tuple[List[pd.Series], List[str]]:
+        """Download every symbol (concurrently if configured).
+
+        Returns the fetched series and the failed symbols, both in symbol order
+        so the column layout does not depend on which download finished first.
+        """
+        def download(symbol: str) -> Optional[pd.Series]:
+            return self._download_symbol(symbol, start_date, end_date, period, retry_empty)
+
+        if self.max_workers > 1 and len(symbols) > 1:
+            workers = min(self.max_workers, len(symbols))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                downloaded = list(pool.map(download, symbols))
+        else:
+            downloaded = [download(symbol) for symbol in symbols]
+
+        series_list = []
+        failed_symbols = []
+        for symbol, series in zip(symbols, downloaded):
+            if series is None:
+                failed_symbols.append(symbol)
+            else:
+                series_list.append(series)
+        return series_list, failed_symbols
+
+    def _download_range(
+        self,
+        symbols: List[str],
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        period: str,
+    ) -> Optional[pd.DataFrame]:
+        """Download raw closes for ``symbols`` between two dates (end exclusive).
+
+        Returns an empty frame when no symbol has rows in the range (e.g. a
+        holiday), and None when only some symbols failed, since merging a
+        partial download would forward-fill stale prices.
+        """
+        # Short delta ranges are often legitimately empty, so only errors retry.
+        series_list, failed_symbols = self._download_all(
+            symbols, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"), period, retry_empty=False
+        )
+        if not series_list:
+            return pd.DataFrame(columns=symbols)
+        if failed_symbols:
+            print(f"Warning: Failed to fetch data for {len(failed_symbols)} symbols: {failed_symbols}")
+            return None
+        raw = pd.concat(series_list, axis=1)
+        return raw.loc[(raw.index >= start) & (raw.index < end), symbols]
+
+    @timed("fetch.extend_cache")
+    def _extend_cache(
+        self,
+        cached: pd.DataFrame,
+        start_date: Optional[pd.Timestamp],
+        end_date: Optional[pd.Timestamp],
+        period: str,
+    ) -> Optional[pd.DataFrame]:
+        """Download only the rows missing before/after the cached range and merge them.
+
+        ``_prepare_prices`` is re-run over the new rows only: the head block is
+        prepared on its own (which may drop symbols not yet listed at the new
+        start), and the tail block is prepared together with the last cached
+        row so gaps forward-fill from known prices. Returns None if the delta
+        download is unusable and a full refetch is needed.
+        """
+        merged = cached
+
+        if start_date is not None and start_date < merged.index[0]:
+            head_raw = self._download_range(list(merged.columns), start_date, merged.index[0], period)
+            if head_raw is None:
+                return None
+            if not head_raw.empty:
+                head = self._prepare_prices(head_raw)
+                merged = pd.concat([head, merged[head.columns]])
+                print(f"Prepended {len(head)} rows to cached prices")
+
+        if end_date is not None and end_date > merged.index[-1]:
+            last_date = merged.index[-1]
+            tail_raw = self._download_range(
+                list(merged.columns), last_date + pd.Timedelta(days=1), end_date, period
+            )
+            if tail_raw is None:
+                return None
+            if tail_raw.empty:
+                print("No new rows available after the cached range.")
+            else:
+                seeded = pd.concat([merged.iloc[[-1]], tail_raw.astype(float)])
+                tail = self._prepare_prices(seeded).iloc[1:]
+                merged = pd.concat([merged, tail])
+                print(f"Fetched {len(tail)} new rows after {last_date.date()}")
+
+        return merged
+
+    def _download_symbol(
+        self,
+        symbol: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        period: str,
+        retry_empty: bool = True,
+    ) -> Optional[pd.Series]:
+        """Download one symbol's closes, retrying with exponential backoff.
+
+        Returns None once every attempt has failed or come back empty. With
+        ``retry_empty=False`` an empty response is accepted on the first try.
+        """
+        if self.price_store is not None:
+            stored = self.price_store.get(symbol, start_date, end_date, period)
+            if stored is not None:
+                return stored
+
+        attempts = self.max_retries + 1
+        for attempt in range(1, attempts + 1):
+            try:
+                if start_date and end_date:
+                    data = self.downloader(symbol, start=start_date, end=end_date, progress=False)
+                else:
+                    data = self.downloader(symbol, period=period, progress=False)
+
+                if not data.empty and 'Close' in data.columns:
+                    series = data['Close'].copy()
+                    series.name = symbol
+                    return series
+                error = "empty response"
+                if not retry_empty:
+                    return None
+            except Exception as e:
+                error = e
+
+            if attempt < attempts:
+                delay = self.retry_backoff * 2 ** (attempt - 1)
+                print(f"Retrying {symbol} in {delay:.1f}s (attempt {attempt}/{attempts} failed: {error})")
+                time.sleep(delay)
+            elif not isinstance(error, str):
+                print(f"Failed to fetch {symbol}: {error}")
+
+        return None
+
     @staticmethod
     def _prepare_prices(prices: pd.DataFrame) -> pd.DataFrame:
         """Clean raw prices and drop recently listed stocks from the sample.
@@ -219,32 +434,187 @@ class DataFetcher:
 
         return filtered
 
-    def _save_cache(self, prices: pd.DataFrame, cache_path: str):
-        """Persist the downloaded prices to disk."""
-        directory = os.path.dirname(cache_path)
-        if directory and not os.path.exists(directory):
-            os.makedirs(directory, exist_ok=True)
+    @staticmethod
+    def _trim_to_period(prices: pd.DataFrame, period: str) -> pd.DataFrame:
+        """Keep the ``period`` window ending at the last row."""
+        first = period_start(prices.index[-1], period)
+        return prices if first is None else prices.loc[prices.index >= first]
 
-        prices.to_csv(cache_path)
+    @timed("fetch.write_cache")
+    def _save_cache(self, prices: pd.DataFrame, cache_path: str):
+        """Persist the downloaded prices to disk (format chosen by extension)."""
+        write_frame(prices, cache_path)
         print(f"Saved data cache to {cache_path}")
 
     @staticmethod
+    @timed("fetch.read_cache")
     def _load_cache(cache_path: str) -> pd.DataFrame:
-        """Load cached prices from disk."""
-        cached = pd.read_csv(cache_path, index_col=0, parse_dates=True)
-        cached.sort_index(inplace=True)
-        return cached
+        """Load cached prices from disk (format chosen by extension)."""
+        return read_frame(cache_path)
+
+    @timed("fetch.write_returns")
+    def _save_returns(
+        self,
+        prices: pd.DataFrame,
+        returns_cache_path: Optional[str],
+        appended_from: Optional[pd.Timestamp] = None,
+    ):
+        """Compute and persist log returns if a returns path is provided.
 
-    def _save_returns(self, prices: pd.DataFrame, returns_cache_path: Optional[str]):
-        """Compute and persist log returns if a returns path is provided."""
+        When *appended_from* marks the first newly appended price row and the
+        existing returns file ends exactly one row earlier with the same
+        columns and start date, only the new returns are appended.
+        """
         if not returns_cache_path:
             return
 
-        returns = self.get_returns(prices)
-        directory = os.path.dirname(returns_cache_path)
-        if directory and not os.path.exists(directory):
-            os.makedirs(directory, exist_ok=True)
+        if appended_from is not None and os.path.exists(returns_cache_path):
+            existing_index, existing_columns = read_frame_labels(returns_cache_path)
+            position = prices.index.get_loc(appended_from)
+            if (
+                position >= 2
+                and len(existing_index) > 0
+                and existing_columns == list(prices.columns)
+                and existing_index[0] == prices.index[1]
+                and existing_index[-1] == prices.index[position - 1]
+            ):
+                new_returns = self.get_returns(prices.iloc[position - 1:])
+                append_frame(new_returns, returns_cache_path)
+                print(f"Appended {len(new_returns)} rows to returns cache {returns_cache_path}")
+                return
 
-        returns.to_csv(returns_cache_path)
+        returns = self.get_returns(prices)
+        write_frame(returns, returns_cache_path)
         print(f"Saved returns cache to {returns_cache_path}")
 
+
+class PriceStore:
+    """Raw (unprepared) close prices keyed by symbol, shared across universes.
+
+    Index symbol lists overlap heavily, so a run over several indices can
+    download the union once into a store and let every ``DataFetcher`` slice
+    its own columns from it before ``_prepare_prices``. The store keeps the
+    prices exactly as downloaded (NaN where a symbol did not trade), since
+    each universe applies its own listing and gap rules. In period mode it
+    holds only the period window ending at the last completed business day.
+    """
+
+    def __init__(self, prices: Optional[pd.DataFrame] = None):
+        self.prices = prices if prices is not None else pd.DataFrame()
+
+    @classmethod
+    def load(cls, path: str) -> "PriceStore":
+        """Load a store saved with :meth:`save` (format chosen by extension)."""
+        return cls(read_frame(path))
+
+    def save(self, path: str) -> None:
+        write_frame(self.prices, path)
+        print(f"Saved shared price store to {path} ({self.prices.shape[1]} symbols)")
+
+    def get(
+        self,
+        symbol: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        period: str = "max",
+    ) -> Optional[pd.Series]:
+        """Return one symbol's closes, limited to ``[start_date, end_date)`` when given.
+
+        The end bound is exclusive to match ``yf.download``. Without dates the
+        ``period`` window ending at the store's last date is returned. Returns
+        None if the symbol is not stored or has no rows in the range.
+        """
+        if symbol not in self.prices.columns:
+            return None
+        series = self.prices[symbol].dropna()
+        if start_date and end_date:
+            series = series.loc[
+                (series.index >= pd.Timestamp(start_date)) & (series.index < pd.Timestamp(end_date))
+            ]
+        else:
+            first = period_start(self.prices.index[-1], period)
+            if first is not None:
+                series = series.loc[series.index >= first]
+        if series.empty:
+            return None
+        return series.rename(symbol)
+
+    @timed("price_store.populate")
+    def populate(
+        self,
+        fetcher: DataFetcher,
+        symbols: List[str],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        period: str = "10y",
+    ) -> List[str]:
+        """Download whatever the store is missing for *symbols* using *fetcher*.
+
+        New symbols are downloaded in full; for symbols already stored only the
+        dates outside the stored range are fetched: before it when an earlier
+        ``start_date`` is requested, and after it up to ``end_date``.
+
+        In period mode (no dates) the store is reused as is while it reaches
+        the last completed business day, the same rule under which a
+        per-index cache is served; otherwise only the tail up to today is
+        fetched. The store is then trimmed to the ``period`` window so it does
+        not grow run after run. Returns the symbols that could not be fetched.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        stored = [s for s in symbols if s in self.prices.columns]
+        missing = [s for s in symbols if s not in self.prices.columns]
+        failed: List[str] = []
+        pieces: List[pd.DataFrame] = []
+
+        if missing:
+            print(f"Price store: downloading {len(missing)} new symbols...")
+            series_list, failed = fetcher._download_all(missing, start_date, end_date, period)
+            if series_list:
+                pieces.append(pd.concat(series_list, axis=1))
+
+        if stored and not self.prices.empty:
+            first, last = self.prices.index[0], self.prices.index[-1]
+            ranges = []
+            # End exclusive; open-ended requests extend through today.
+            tail_end = (
+                pd.Timestamp(end_date) if end_date
+                else pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+            )
+            if start_date or end_date:
+                # Only fetch ranges that contain at least one business day.
+                if start_date and len(pd.bdate_range(start_date, first - pd.Timedelta(days=1))):
+                    ranges.append((pd.Timestamp(start_date), first))
+                if len(pd.bdate_range(last + pd.Timedelta(days=1), tail_end - pd.Timedelta(days=1))):
+                    ranges.append((last + pd.Timedelta(days=1), tail_end))
+            elif last < last_completed_business_day():
+                ranges.append((last + pd.Timedelta(days=1), tail_end))
+            for range_start, range_end in ranges:
+                print(
+                    f"Price store: fetching {range_start.date()} to {range_end.date()} "
+                    f"for {len(stored)} symbols..."
+                )
+                delta = fetcher._download_range(stored, range_start, range_end, period)
+                if delta is None:
+                    failed.extend(s for s in stored if s not in failed)
+                elif not delta.empty:
+                    pieces.append(delta)
+
+        for piece in pieces:
+            self._merge(piece)
+        if not start_date and not end_date and not self.prices.empty:
+            first = period_start(last_completed_business_day(), period)
+            if first is not None:
+                self.prices = self.prices.loc[self.prices.index >= first]
+
+        if failed:
+            print(f"Warning: price store could not fetch {len(failed)} symbols: {failed}")
+        return failed
+
+    def _merge(self, new_prices: pd.DataFrame) -> None:
+        """Merge downloaded closes; new values win where dates overlap."""
+        if self.prices.empty:
+            self.prices = new_prices.sort_index()
+            return
+        merged = new_prices.combine_first(self.prices)
+        columns = list(self.prices.columns) + [c for c in new_prices.columns if c not in self.prices.columns]
+        self.prices = merged[columns].sort_index()
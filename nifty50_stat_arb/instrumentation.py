@@ -0,0 +1,236 @@
+"""
+Stage-level timing and memory spans for the pipeline.
+
+Code marks its stages with ``span`` (or whole functions with ``timed``)::
+
+    with span("pca", index=cfg.index_name):
+        ...
+
+While instrumentation is disabled (the default) ``span`` returns one shared
+no-op context manager, so the cost is a global lookup and a function call.
+After ``enable()`` every span records:
+
+- wall time (``time.perf_counter``) and process CPU time (``time.process_time``),
+- the current resident set size when the span ends and its change over the
+  span (``/proc/self/statm``; NaN where unavailable), which is what the
+  stage itself allocated and kept or freed,
+- the process-wide RSS high-water mark at the end of the span
+  (``resource.getrusage``). It only ever rises, so it tells which stage
+  first reached the peak, not how much memory a later stage used,
+- its nesting depth and the ``index`` tag, inherited from enclosing spans
+  opened in the same thread (spans in worker threads start their own
+  nesting).
+
+``Recorder.to_frame`` / ``summary`` / ``format_table`` / ``write`` turn the
+records into a DataFrame, a per-(index, stage) aggregate, a printable table
+and a JSON or CSV run report.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Iterator, Optional, TypeVar
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+F = TypeVar("F", bound=Callable)
+
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):  # Windows
+    _PAGE_SIZE = None
+
+
+def _current_rss_mb() -> float:
+    """Current resident set size of this process in MiB (NaN if unknown)."""
+    if _PAGE_SIZE is None:
+        return float("nan")
+    try:
+        with open("/proc/self/statm") as fh:
+            resident_pages = int(fh.read().split()[1])
+    except (OSError, IndexError, ValueError):  # no procfs (e.g. macOS)
+        return float("nan")
+    return resident_pages * _PAGE_SIZE / 2**20
+
+
+def _process_peak_rss_mb() -> float:
+    """High-water resident set size of this process in MiB (NaN if unknown)."""
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+@dataclass
+class SpanRecord:
+    stage: str
+    index: Optional[str]
+    depth: int
+    start_s: float  # seconds since the recorder was enabled
+    wall_s: float
+    cpu_s: float
+    rss_mb: float
+    rss_delta_mb: float
+    process_peak_rss_mb: float
+    pid: int = field(default_factory=os.getpid)
+
+
+class Recorder:
+    """Collects ``SpanRecord``s for one run (one per process; workers send theirs back)."""
+
+    def __init__(self) -> None:
+        self.records: list[SpanRecord] = []
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+
+    @property
+    def _stack(self) -> list[Optional[str]]:
+        """Index tag of each span open in the calling thread."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextlib.contextmanager
+    def span(self, stage: str, index: Optional[str] = None) -> Iterator[None]:
+        stack = self._stack
+        if index is None and stack:
+            index = stack[-1]
+        depth = len(stack)
+        stack.append(index)
+
+        rss_before = _current_rss_mb()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_end = time.perf_counter()
+            cpu_end = time.process_time()
+            rss_after = _current_rss_mb()
+            stack.pop()
+            self.records.append(SpanRecord(
+                stage=stage,
+                index=index,
+                depth=depth,
+                start_s=wall_start - self._origin,
+                wall_s=wall_end - wall_start,
+                cpu_s=cpu_end - cpu_start,
+                rss_mb=rss_after,
+                rss_delta_mb=rss_after - rss_before,
+                process_peak_rss_mb=_process_peak_rss_mb(),
+            ))
+
+    def extend(self, records: list[SpanRecord]) -> None:
+        """Merge records produced elsewhere (e.g. by a worker process)."""
+        self.records.extend(records)
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per span, in completion order."""
+        columns = list(SpanRecord.__dataclass_fields__)
+        return pd.DataFrame([asdict(r) for r in self.records], columns=columns)
+
+    def summary(self) -> pd.DataFrame:
+        """Totals per (index, stage): calls, wall/CPU seconds, RSS change, largest end RSS
+        and the process high-water mark."""
+        frame = self.to_frame()
+        if frame.empty:
+            return pd.DataFrame(
+                columns=["calls", "wall_s", "cpu_s", "rss_delta_mb", "max_rss_mb", "process_peak_rss_mb"]
+            )
+        frame["index"] = frame["index"].fillna("-")
+        return (
+            frame.groupby(["index", "stage"], sort=False)
+            .agg(
+                calls=("stage", "size"),
+                wall_s=("wall_s", "sum"),
+                cpu_s=("cpu_s", "sum"),
+                rss_delta_mb=("rss_delta_mb", "sum"),
+                max_rss_mb=("rss_mb", "max"),
+                process_peak_rss_mb=("process_peak_rss_mb", "max"),
+            )
+        )
+
+    def format_table(self) -> str:
+        """The summary as a fixed-width text table."""
+        summary = self.summary()
+        if summary.empty:
+            return "(no spans recorded)"
+        with pd.option_context("display.float_format", "{:.3f}".format, "display.width", 140):
+            return summary.to_string()
+
+    def write(self, path: str) -> None:
+        """Write every span to ``path``: ``.json`` (records + summary) or CSV otherwise."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.splitext(path)[1].lower() == ".json":
+            summary = self.summary().reset_index()
+            payload = {
+                "spans": [asdict(r) for r in self.records],
+                "summary": json.loads(summary.to_json(orient="records")),
+            }
+            with open(path, "w") as fh:
+                json.dump(payload, fh, indent=2)
+        else:
+            self.to_frame().to_csv(path, index=False)
+
+
+_RECORDER: Optional[Recorder] = None
+_NOOP = contextlib.nullcontext()
+
+
+def enable() -> Recorder:
+    """Start recording spans in this process (replaces any previous recorder)."""
+    global _RECORDER
+    _RECORDER = Recorder()
+    return _RECORDER
+
+
+def disable() -> Optional[Recorder]:
+    """Stop recording; returns the recorder that was active, if any."""
+    global _RECORDER
+    recorder, _RECORDER = _RECORDER, None
+    return recorder
+
+
+def get_recorder() -> Optional[Recorder]:
+    """The active recorder, or None when instrumentation is disabled."""
+    return _RECORDER
+
+
+def span(stage: str, index: Optional[str] = None):
+    """Context manager timing ``stage``; a shared no-op while disabled."""
+    if _RECORDER is None:
+        return _NOOP
+    return _RECORDER.span(stage, index)
+
+
+def timed(stage: str) -> Callable[[F], F]:
+    """Decorator wrapping every call of a function in ``span(stage)``."""
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _RECORDER is None:
+                return func(*args, **kwargs)
+            with _RECORDER.span(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
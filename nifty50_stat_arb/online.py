@@ -0,0 +1,137 @@
+"""
+Online residual z-score engine for end-of-day signals.
+
+``run_backtest_on_df`` recomputes predicted returns, residuals and rolling
+volatility for whole blocks of history. For live use only one new row
+arrives per day, so ``OnlineResidualSignal`` keeps the state needed to turn
+that row into z-scores and position changes directly:
+
+- the K x N beta matrix from a PCA fit,
+- a (lookback x N) ring buffer of past residuals with per-asset running
+  mean / sum of squared deviations (``rolling.RollingMoments``),
+- the current position vector (+1 long, -1 short, 0 flat).
+
+Each ``update`` costs O(N * K) for the projection plus O(N) for the
+volatility and hysteresis, and allocates only a few length-N arrays.
+Replaying a block's fit window through ``warm_up`` and its trade window
+through ``update`` reproduces the backtest's positions.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from nifty50_stat_arb.pca_backtest import (
+    BacktestConfig,
+    _build_betas_from_ranked_table,
+    _get_refit_trade_blocks,
+    compute_block_betas,
+)
+from nifty50_stat_arb.rolling import RollingMoments
+
+
+class OnlineResidualSignal:
+    """Stateful PCA-residual z-scores and hysteresis positions, one day at a time."""
+
+    def __init__(self, betas: pd.DataFrame, config: BacktestConfig):
+        self.assets: list[str] = list(betas.columns)
+        self.config = config
+        self._betas = np.ascontiguousarray(betas.to_numpy(dtype=float))  # K x N
+
+        self._window = RollingMoments(config.lookback, len(self.assets))
+        self.positions = np.zeros(len(self.assets), dtype=np.int8)
+
+    @classmethod
+    def from_ranked_table(cls, ranked_table: pd.DataFrame, config: BacktestConfig) -> "OnlineResidualSignal":
+        """Build from the ranked component table returned by ``compute_pca``."""
+        return cls(_build_betas_from_ranked_table(ranked_table), config)
+
+    # ------------------------------------------------------------------
+    # Rolling residual window
+    # ------------------------------------------------------------------
+
+    def _residuals(self, row: np.ndarray) -> np.ndarray:
+        factor_scores = self._betas @ row  # K
+        return row - factor_scores @ self._betas
+
+    def _push(self, residuals: np.ndarray) -> None:
+        self._window.push(residuals)
+
+    def rolling_std(self) -> np.ndarray:
+        """Sample std (ddof=1) of each asset's residual window; NaN until it is full of valid values."""
+        return self._window.std()
+
+    # ------------------------------------------------------------------
+    # Daily interface
+    # ------------------------------------------------------------------
+
+    def warm_up(self, history: np.ndarray) -> None:
+        """Feed past return rows (oldest first) into the residual window without trading."""
+        for row in np.asarray(history, dtype=float):
+            self._push(self._residuals(row))
+
+    def update(self, row: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Consume one day's returns (ordered like ``assets``).
+
+        The z-score uses the residual volatility of the previous ``lookback``
+        days, then today's residual joins the window. Returns
+        ``(zscores, changes)`` where ``changes`` is the int8 difference
+        between today's and yesterday's positions (non-zero = trade).
+        """
+        row = np.asarray(row, dtype=float)
+        residuals = self._residuals(row)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            zscores = residuals / self.rolling_std()
+        self._push(residuals)
+
+        previous = self.positions.copy()
+        state = self.positions
+        config = self.config
+
+        # Same order as the backtest: exits first, then entries from flat.
+        exit_long = (state == 1) & (zscores >= config.long_exit_z)
+        exit_short = (state == -1) & (zscores <= config.short_exit_z)
+        state[exit_long | exit_short] = 0
+
+        flat = state == 0
+        enter_long = flat & (zscores <= config.long_entry_z)
+        enter_short = flat & ~enter_long & (zscores >= config.short_entry_z)
+        state[enter_long] = 1
+        state[enter_short] = -1
+
+        return zscores, state - previous
+
+    def reset_positions(self) -> None:
+        """Flatten all positions, keeping the residual window (e.g. at a refit)."""
+        self.positions[:] = 0
+
+
+def replay_positions(returns: pd.DataFrame, config: BacktestConfig) -> pd.DataFrame:
+    """End-of-day positions from replaying history through ``OnlineResidualSignal``.
+
+    Follows the calendar refit/trade blocks of ``run_backtest_on_df``: each
+    block gets a fresh engine on that block's betas, warmed up on its fit
+    window and stepped through its trade window from flat. The result
+    (trade dates x assets) matches the backtest's position matrix.
+    """
+    blocks = _get_refit_trade_blocks(
+        returns.index,
+        refit_months=config.refit_months,
+        trade_months=config.trade_months,
+    )
+    frames = []
+    for (fit_dates, trade_dates), betas in zip(blocks, compute_block_betas(returns, config)):
+        engine = OnlineResidualSignal(betas, config)
+        block = returns[engine.assets]
+        engine.warm_up(block.loc[fit_dates].to_numpy())
+
+        positions = np.zeros((len(trade_dates), len(engine.assets)), dtype=np.int8)
+        for i, row in enumerate(block.loc[trade_dates].to_numpy()):
+            engine.update(row)
+            positions[i] = engine.positions
+        frames.append(pd.DataFrame(positions, index=trade_dates, columns=engine.assets))
+
+    if not frames:
+        return pd.DataFrame(columns=returns.columns, dtype=np.int8)
+    return pd.concat(frames)
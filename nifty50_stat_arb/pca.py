@@ -2,32 +2,52 @@
 Principal component analysis utilities for Nifty 50 return data.
 """
 
+from __future__ import annotations
+
 import argparse
 import os
 
 import numpy as np
 import pandas as pd
+from scipy.sparse.linalg import eigsh
 from sklearn.covariance import LedoitWolf
 
+from nifty50_stat_arb.instrumentation import timed
+from nifty50_stat_arb.storage import read_frame
+
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DEFAULT_RETURNS_PATH = os.path.join(PROJECT_ROOT, "data", "nifty50", "returns.csv")
 DEFAULT_PCA_COMPONENTS_PATH = os.path.join(PROJECT_ROOT, "data", "nifty50", "pca_components.csv")
 
 
-def load_returns(returns_path: str = DEFAULT_RETURNS_PATH) -> pd.DataFrame:
-    """Load return data from disk."""
-    returns = pd.read_csv(returns_path, index_col=0, parse_dates=True)
-    returns.sort_index(inplace=True)
+def load_returns(
+    returns_path: str = DEFAULT_RETURNS_PATH,
+    mmap: bool = False,
+    dtype: str | None = None,
+) -> pd.DataFrame:
+    """Load return data from disk (.csv, .parquet, .feather or memory-mappable .npy).
+
+    ``dtype`` (e.g. "float32") casts the values after loading.
+    """
+    returns = read_frame(returns_path, mmap=mmap)
+    if dtype is not None and (returns.dtypes != dtype).any():
+        returns = returns.astype(dtype)
     return returns
 
 
+@timed("pca.compute_pca")
 def compute_pca(
     returns: pd.DataFrame,
     train_fraction: float = 0.8,
     variance_threshold: float = 0.99,
+    solver: str = "full",
 ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    """Compute PCA on the first train_fraction of returns using Ledoit-Wolf covariance."""
+    """Compute PCA on the first train_fraction of returns using Ledoit-Wolf covariance.
+
+    ``solver="truncated"`` finds only the leading eigenpairs needed to reach
+    ``variance_threshold`` (see ``pca_from_covariance``).
+    """
     if returns.empty:
         raise ValueError("Returns data is empty")
 
@@ -50,31 +70,209 @@ def compute_pca(
         index=training_returns.columns,
         columns=training_returns.columns,
     )
-    eigenvalues, eigenvectors = np.linalg.eigh(covariance.to_numpy())
+    ranked_table = pca_from_covariance(
+        covariance.to_numpy(), covariance.columns, variance_threshold, solver=solver
+    )
+
+    covariance_df = pd.DataFrame(covariance, index=covariance.index, columns=covariance.columns)
+    training_slice = training_returns
+
+    return covariance_df, training_slice, ranked_table
+
+
+def pca_from_covariance(
+    covariance: np.ndarray,
+    columns: pd.Index | list[str],
+    variance_threshold: float = 0.99,
+    solver: str = "full",
+) -> pd.DataFrame:
+    """Build the ranked component table from an already-estimated covariance matrix.
+
+    Lets callers that maintain their own covariance (e.g. a streaming
+    Ledoit-Wolf estimator over a sliding window) produce the same table as
+    ``compute_pca``.
+
+    Solvers:
+        "full"       ``np.linalg.eigh`` of the whole matrix.
+        "truncated"  Lanczos (``scipy.sparse.linalg.eigsh``) for the leading k
+                     eigenpairs only, growing k until the threshold is met.
+                     Explained variance is measured against the trace, so the
+                     percentages are exact without the trailing eigenvalues.
+    """
+    if solver == "full":
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        return _rank_eigenpairs(eigenvalues, eigenvectors, columns, variance_threshold)
+    if solver == "truncated":
+        eigenvalues, eigenvectors = truncated_eigh(covariance, variance_threshold)
+        return _rank_eigenpairs(
+            eigenvalues,
+            eigenvectors,
+            columns,
+            variance_threshold,
+            total_variance=float(np.trace(covariance)),
+        )
+    raise ValueError(f"Unknown solver {solver!r}; expected 'full' or 'truncated'")
+
+
+def truncated_eigh(
+    covariance: np.ndarray,
+    variance_threshold: float = 0.99,
+    initial_k: int | None = None,
+    max_fraction: float = 0.2,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Leading eigenpairs of a covariance matrix, just enough to cover ``variance_threshold``.
+
+    Starts from ``initial_k`` components (default N // 20, at least 8) and
+    doubles k until the leading eigenvalues explain the threshold share of
+    ``trace(covariance)``. Every missing component is at most as large as the
+    smallest one found so far, which bounds how many more are needed; once
+    that bound pushes k past ``max_fraction`` of N a full ``eigh`` is cheaper,
+    so it falls back to that. Returns eigenvalues in descending order with
+    matching eigenvector columns.
+
+    Two cheap checks decide before any Lanczos run: k never starts below
+    the Cauchy-Schwarz bound ``(threshold * trace)^2 / ||C||_F^2`` (k
+    eigenvalues sum to at most ``sqrt(k * sum(eigenvalues^2))``), and when
+    that starting k is past half the cap, so a miss could not be retried,
+    the full ``eigh`` runs directly. The latter always holds below ~80
+    assets (e.g. the Nifty universes), where ``eigh`` is cheap anyway.
+    """
+    n_features = covariance.shape[0]
+    total_variance = np.trace(covariance)
+    max_k = int(max_fraction * n_features)
+    k = initial_k or max(8, n_features // 20)
+    squared_norm = float(np.sum(covariance * covariance))
+    if squared_norm > 0:
+        k = max(k, int(np.ceil((variance_threshold * total_variance) ** 2 / squared_norm)))
+    if 2 * k > max_k:
+        k = n_features  # straight to eigh
+    # Deterministic start vector so repeated fits give identical signs.
+    v0 = np.full(n_features, 1.0 / np.sqrt(n_features))
+
+    while k <= max_k and k < n_features - 1:
+        eigenvalues, eigenvectors = eigsh(covariance, k=k, which="LA", v0=v0)
+        order = np.argsort(eigenvalues)[::-1]
+        eigenvalues, eigenvectors = eigenvalues[order], eigenvectors[:, order]
+        missing = variance_threshold * total_variance - eigenvalues.sum()
+        if missing <= 0:
+            return eigenvalues, eigenvectors
+        k = max(2 * k, k + int(np.ceil(missing / eigenvalues[-1])))
+
+    eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+    order = np.argsort(eigenvalues)[::-1]
+    return eigenvalues[order], eigenvectors[:, order]
+
 
+@timed("pca.batched_pca")
+def batched_pca(
+    windows: list[pd.DataFrame],
+    variance_threshold: float = 0.99,
+    return_covariances: bool = False,
+):
+    """Ranked component tables for many return windows with one batched ``eigh``.
+
+    Each window gets its own Ledoit-Wolf covariance; the covariances are
+    stacked into a (B x N x N) array and decomposed in a single
+    ``np.linalg.eigh`` call. All windows must share the same columns.
+    Results are identical to calling ``compute_pca(window, train_fraction=1.0)``
+    on each window. With ``return_covariances=True`` the stacked covariance
+    array is returned as well, as ``(tables, covariances)``.
+    """
+    if not windows:
+        return ([], np.empty((0, 0, 0))) if return_covariances else []
+
+    columns = windows[0].columns
+    for window in windows:
+        if not window.columns.equals(columns):
+            raise ValueError("All windows must have the same columns for batched PCA")
+        if window.shape[0] < 2:
+            raise ValueError("At least two rows are required to estimate covariance")
+
+    covariances = np.stack([LedoitWolf().fit(window.to_numpy()).covariance_ for window in windows])
+    eigenvalues, eigenvectors = np.linalg.eigh(covariances)
+
+    tables = [
+        _rank_eigenpairs(eigenvalues[b], eigenvectors[b], columns, variance_threshold)
+        for b in range(len(windows))
+    ]
+    return (tables, covariances) if return_covariances else tables
+
+
+def _rank_eigenpairs(
+    eigenvalues: np.ndarray,
+    eigenvectors: np.ndarray,
+    columns: pd.Index | list[str],
+    variance_threshold: float,
+    total_variance: float | None = None,
+) -> pd.DataFrame:
+    """Sort eigenpairs by variance and keep components up to the threshold.
+
+    ``total_variance`` defaults to the sum of the given eigenvalues; pass the
+    covariance trace when only the leading eigenpairs are available.
+    """
     order = np.argsort(eigenvalues)[::-1]
     eigenvalues = eigenvalues[order]
     eigenvectors = eigenvectors[:, order]
 
-    total_variance = eigenvalues.sum()
+    if total_variance is None:
+        total_variance = eigenvalues.sum()
     explained_ratio = eigenvalues / total_variance
     cumulative_ratio = np.cumsum(explained_ratio)
 
-    component_count = int(np.searchsorted(cumulative_ratio, variance_threshold) + 1)
+    component_count = min(
+        int(np.searchsorted(cumulative_ratio, variance_threshold) + 1),
+        len(eigenvalues),
+    )
 
     ranked_table = pd.DataFrame(
         eigenvectors[:, :component_count].T,
-        columns=covariance.columns,
+        columns=list(columns),
     )
     ranked_table.insert(0, "cumulative_variance_pct", cumulative_ratio[:component_count] * 100)
     ranked_table.insert(0, "explained_variance_pct", explained_ratio[:component_count] * 100)
     ranked_table.insert(0, "eigenvalue", eigenvalues[:component_count])
     ranked_table.insert(0, "component", [f"PC{i}" for i in range(1, component_count + 1)])
 
-    covariance_df = pd.DataFrame(covariance, index=covariance.index, columns=covariance.columns)
-    training_slice = training_returns
+    return ranked_table
 
-    return covariance_df, training_slice, ranked_table
+
+class SubspaceTracker:
+    """Track the leading eigenvectors of a slowly changing covariance matrix.
+
+    Each update runs a few steps of subspace iteration warm-started from the
+    previous basis, followed by a Rayleigh-Ritz rotation so the columns come
+    out ordered by eigenvalue. With day-to-day covariance changes this costs
+    O(N^2 k) instead of a full O(N^3) ``eigh``.
+    """
+
+    def __init__(self, basis: np.ndarray):
+        self.basis = np.linalg.qr(np.asarray(basis, dtype=float))[0]  # N x k, orthonormal
+        self.eigenvalues = np.full(self.basis.shape[1], np.nan)
+
+    def update(self, covariance: np.ndarray, iterations: int = 1) -> np.ndarray:
+        """Refine the basis against a new covariance matrix and return it."""
+        basis = self.basis
+        for _ in range(iterations):
+            basis = np.linalg.qr(covariance @ basis)[0]
+
+        projected = basis.T @ covariance @ basis
+        eigenvalues, rotation = np.linalg.eigh(projected)
+        order = np.argsort(eigenvalues)[::-1]
+        self.basis = basis @ rotation[:, order]
+        self.eigenvalues = eigenvalues[order]
+        return self.basis
+
+
+def subspace_distance(basis_a: np.ndarray, basis_b: np.ndarray) -> float:
+    """Largest principal angle, in degrees, between two orthonormal bases.
+
+    When the bases differ in width, the narrower one is measured against the
+    span of the wider one.
+    """
+    if basis_a.shape[1] > basis_b.shape[1]:
+        basis_a, basis_b = basis_b, basis_a
+    singular_values = np.linalg.svd(basis_b.T @ basis_a, compute_uv=False)
+    return float(np.degrees(np.arccos(np.clip(singular_values.min(), -1.0, 1.0))))
 
 
 def print_pca_summary(
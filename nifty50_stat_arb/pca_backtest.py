@@ -19,7 +19,17 @@ from dataclasses import dataclass
 import numpy as np
 import pandas as pd
 
-from nifty50_stat_arb.pca import compute_pca
+from nifty50_stat_arb.covariance import rolling_ledoit_wolf
+from nifty50_stat_arb.instrumentation import timed
+from nifty50_stat_arb.pca import (
+    SubspaceTracker,
+    compute_pca,
+    pca_from_covariance,
+    subspace_distance,
+)
+from nifty50_stat_arb.pca_cache import get_pca_cache
+from nifty50_stat_arb.rolling import rolling_std_windows
+from nifty50_stat_arb.storage import read_frame
 
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -39,12 +49,25 @@ class BacktestConfig:
     short_exit_z: float = 0.0
     refit_months: int = 6
     trade_months: int = 6
+    engine: str = "vectorized"  # "vectorized" position matrix or "legacy" per-asset loop
+    refit_mode: str = "calendar"  # "calendar" month blocks or "daily" tracked subspace
+    daily_fit_window: int = 126  # trading days in the rolling covariance window ("daily" mode)
+    subspace_iterations: int = 1  # warm-started subspace iterations per day ("daily" mode)
+    pca_solver: str = "full"  # "full" batched eigh or "truncated" leading eigenpairs only
+    variance_threshold: float = 0.99  # explained variance the factor model keeps at each refit
+    pca_cache_dir: str | None = None  # persist memoized PCA fits here (None = memory only)
+    dtype: str = "float64"  # "float32" residuals, z-scores and PnL (PCA stays float64)
 
 
-def load_returns(path: str) -> pd.DataFrame:
-    """Load returns CSV indexed by date."""
-    returns = pd.read_csv(path, index_col=0, parse_dates=True)
-    returns.sort_index(inplace=True)
+def load_returns(path: str, mmap: bool = False, dtype: str | None = None) -> pd.DataFrame:
+    """Load returns indexed by date; ``mmap`` shares ``.npy`` matrices read-only.
+
+    ``dtype`` (e.g. "float32") casts the values after loading, which makes a
+    private copy of a memory-mapped matrix.
+    """
+    returns = read_frame(path, mmap=mmap)
+    if dtype is not None and (returns.dtypes != dtype).any():
+        returns = returns.astype(dtype)
     return returns
 
 
@@ -131,108 +154,568 @@ def _get_refit_trade_blocks(
     return blocks
 
 
-def run_backtest_on_df(returns: pd.DataFrame, config: BacktestConfig, verbose: bool = True) -> pd.DataFrame:
-    """Core rolling refit / trade PCA residual strategy on a pre-loaded returns DataFrame."""
-    blocks = _get_refit_trade_blocks(
-        returns.index,
-        refit_months=config.refit_months,
-        trade_months=config.trade_months,
+def simulate_positions(zscores: np.ndarray, config: BacktestConfig) -> np.ndarray:
+    """Run the entry/exit hysteresis over a T x N z-score matrix.
+
+    Days are scanned in order while all assets are updated together with
+    array ops. NaN z-scores compare False everywhere, so those assets keep
+    their previous position. Returns the end-of-day position matrix
+    (+1 long, -1 short, 0 flat) as int8.
+    """
+    return _scan_positions(
+        zscores,
+        long_entry=config.long_entry_z,
+        short_entry=config.short_entry_z,
+        long_exit=config.long_exit_z,
+        short_exit=config.short_exit_z,
     )
 
-    if not blocks:
-        return pd.DataFrame(columns=["strategy_return", "cumulative_return", "long_count", "short_count"])
 
+def _scan_positions(
+    zscores: np.ndarray,
+    long_entry: float | np.ndarray,
+    short_entry: float | np.ndarray,
+    long_exit: float | np.ndarray,
+    short_exit: float | np.ndarray,
+) -> np.ndarray:
+    """Hysteresis scan shared by single runs and threshold grids.
+
+    Thresholds may be scalars or arrays broadcasting against one row of
+    ``zscores`` (e.g. shape (G, 1) for G threshold sets); the result has shape
+    (T,) + broadcast shape.
+    """
+    n_days = zscores.shape[0]
+    state_shape = np.broadcast_shapes(
+        zscores.shape[1:],
+        np.shape(long_entry),
+        np.shape(short_entry),
+        np.shape(long_exit),
+        np.shape(short_exit),
+    )
+    positions = np.zeros((n_days,) + state_shape, dtype=np.int8)
+    state = np.zeros(state_shape, dtype=np.int8)
+
+    for t in range(n_days):
+        z = zscores[t]
+
+        # Exit rules by z-score reversion.
+        exit_long = (state == 1) & (z >= long_exit)
+        exit_short = (state == -1) & (z <= short_exit)
+        state[exit_long | exit_short] = 0
+
+        flat = state == 0
+        enter_long = flat & (z <= long_entry)
+        enter_short = flat & ~enter_long & (z >= short_entry)
+        state[enter_long] = 1
+        state[enter_short] = -1
+
+        positions[t] = state
+
+    return positions
+
+
+def _masked_row_means(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Row-wise NaN-skipping mean of ``values`` over ``mask``; 0.0 where a row selects nothing.
+
+    Each row is reduced on its own compacted selection so the summation order
+    matches ``pd.Series.mean`` on the same assets exactly.
+    """
+    means = np.zeros(len(values), dtype=values.dtype)
+    for i in np.flatnonzero(mask.any(axis=1)):
+        selected = values[i, mask[i]]
+        missing = np.isnan(selected)
+        if missing.any():
+            selected = np.where(missing, 0.0, selected)
+        count = selected.size - int(missing.sum())
+        means[i] = selected.sum() / count if count > 0 else np.nan
+    return means
+
+
+def _print_position_events(
+    dates: pd.DatetimeIndex,
+    assets: list[str],
+    zscores: np.ndarray,
+    positions: np.ndarray,
+) -> None:
+    """Print daily exits then entries, in asset order, from a position matrix."""
+    previous = np.zeros(positions.shape[1], dtype=np.int8)
+    for t, date in enumerate(dates):
+        current = positions[t]
+        for j in np.flatnonzero((previous != 0) & (current != previous)):
+            side = "EXIT LONG " if previous[j] == 1 else "EXIT SHORT"
+            print(f"{date.date()} {side} {assets[j]:12s} z={zscores[t, j]: .4f}")
+        for j in np.flatnonzero((current != 0) & (current != previous)):
+            side = "ENTER LONG" if current[j] == 1 else "ENTER SHORT"
+            print(f"{date.date()} {side} {assets[j]:12s} z={zscores[t, j]: .4f}")
+        previous = current
+
+
+def _trade_block_vectorized(
+    test_zscores: pd.DataFrame,
+    test_returns: pd.DataFrame,
+    config: BacktestConfig,
+    verbose: bool,
+) -> tuple[list[float], list[int], list[int], list[pd.Timestamp]]:
+    """Trade one block from its full T x N position matrix."""
+    dates = test_zscores.index
+    zscores = test_zscores.to_numpy(dtype=config.dtype)
+    returns = test_returns.to_numpy(dtype=config.dtype)
+
+    positions = simulate_positions(zscores, config)
+    if verbose:
+        _print_position_events(dates, list(test_zscores.columns), zscores, positions)
+
+    # Days without a single valid z-score are skipped outright (no PnL row).
+    active = ~np.isnan(zscores).all(axis=1)
+    rows = np.flatnonzero(active[:-1])
+
+    long_mask = positions[rows] == 1
+    short_mask = positions[rows] == -1
+    next_returns = returns[rows + 1]
+
+    long_pnl = _masked_row_means(next_returns, long_mask)
+    short_pnl = np.where(short_mask.any(axis=1), -_masked_row_means(next_returns, short_mask), 0.0)
+    day_pnl = 0.5 * long_pnl + 0.5 * short_pnl
+
+    return (
+        day_pnl.tolist(),
+        long_mask.sum(axis=1).tolist(),
+        short_mask.sum(axis=1).tolist(),
+        list(dates[rows + 1]),
+    )
+
+
+def _trade_block_legacy(
+    test_zscores: pd.DataFrame,
+    test_returns: pd.DataFrame,
+    config: BacktestConfig,
+    verbose: bool,
+) -> tuple[list[float], list[int], list[int], list[pd.Timestamp]]:
+    """Trade one block with the original per-day, per-asset dict loop."""
     portfolio_returns: list[float] = []
     long_counts: list[int] = []
     short_counts: list[int] = []
     pnl_dates: list[pd.Timestamp] = []
 
-    for block_num, (fit_dates, trade_dates) in enumerate(blocks, start=1):
-        fit_returns = returns.loc[fit_dates]
+    test_dates = list(test_zscores.index)
+    assets = list(test_zscores.columns)
+    positions = {asset: 0 for asset in assets}  # +1 long, -1 short, 0 flat
 
-        _, _, ranked_table = compute_pca(
-            fit_returns,
-            train_fraction=1.0,
-            variance_threshold=0.99,
-        )
-        betas = _build_betas_from_ranked_table(ranked_table)
+    for i, date in enumerate(test_dates):
+        day_z = test_zscores.loc[date].dropna()
+        if day_z.empty:
+            continue
 
-        # Compute z-scores with context from fit + trade to preserve rolling-vol logic.
-        block_slice = returns.loc[fit_dates[0]:trade_dates[-1]].copy()
-        predicted = compute_predicted_returns(block_slice, betas)
-        aligned_returns = block_slice[predicted.columns].copy()
-        residuals = aligned_returns - predicted
-        rolling_std = residuals.rolling(config.lookback).std().shift(1)
-        zscores = residuals / rolling_std
+        for asset, pos in list(positions.items()):
+            z_value = day_z.get(asset, np.nan)
+            if np.isnan(z_value):
+                continue
 
-        test_dates = [d for d in trade_dates if d in zscores.index]
-        if len(test_dates) < 2:
-            continue
+            # Exit rules by z-score reversion.
+            if pos == 1 and z_value >= config.long_exit_z:
+                if verbose:
+                    print(f"{date.date()} EXIT LONG  {asset:12s} z={z_value: .4f}")
+                positions[asset] = 0
+            elif pos == -1 and z_value <= config.short_exit_z:
+                if verbose:
+                    print(f"{date.date()} EXIT SHORT {asset:12s} z={z_value: .4f}")
+                positions[asset] = 0
 
-        test_zscores = zscores.loc[test_dates].copy()
-        test_returns = aligned_returns.loc[test_dates].copy()
+        for asset in day_z.index:
+            if positions[asset] != 0:
+                continue
 
-        assets = list(test_zscores.columns)
-        positions = {asset: 0 for asset in assets}  # +1 long, -1 short, 0 flat
+            z_value = day_z[asset]
+            if z_value <= config.long_entry_z:
+                positions[asset] = 1
+                if verbose:
+                    print(f"{date.date()} ENTER LONG {asset:12s} z={z_value: .4f}")
+            elif z_value >= config.short_entry_z:
+                positions[asset] = -1
+                if verbose:
+                    print(f"{date.date()} ENTER SHORT {asset:12s} z={z_value: .4f}")
 
-        if verbose:
-            print(
-                f"\nBlock {block_num}: fit {fit_dates[0].date()} to {fit_dates[-1].date()} | "
-                f"trade {test_dates[0].date()} to {test_dates[-1].date()}"
-            )
+        # Apply end-of-day positions to next-day return.
+        if i + 1 < len(test_dates):
+            next_date = test_dates[i + 1]
+            next_ret = test_returns.loc[next_date]
 
-        for i, date in enumerate(test_dates):
-            day_z = test_zscores.loc[date].dropna()
-            if day_z.empty:
-                continue
+            long_assets = [asset for asset, pos in positions.items() if pos == 1]
+            short_assets = [asset for asset, pos in positions.items() if pos == -1]
 
-            for asset, pos in list(positions.items()):
-                z_value = day_z.get(asset, np.nan)
-                if np.isnan(z_value):
-                    continue
+            long_pnl = next_ret[long_assets].mean() if long_assets else 0.0
+            short_pnl = -next_ret[short_assets].mean() if short_assets else 0.0
+            day_pnl = 0.5 * long_pnl + 0.5 * short_pnl
 
-                # Exit rules by z-score reversion.
-                if pos == 1 and z_value >= config.long_exit_z:
-                    if verbose:
-                        print(f"{date.date()} EXIT LONG  {asset:12s} z={z_value: .4f}")
-                    positions[asset] = 0
-                elif pos == -1 and z_value <= config.short_exit_z:
-                    if verbose:
-                        print(f"{date.date()} EXIT SHORT {asset:12s} z={z_value: .4f}")
-                    positions[asset] = 0
+            portfolio_returns.append(float(day_pnl))
+            long_counts.append(len(long_assets))
+            short_counts.append(len(short_assets))
+            pnl_dates.append(next_date)
 
-            for asset in day_z.index:
-                if positions[asset] != 0:
-                    continue
+    return portfolio_returns, long_counts, short_counts, pnl_dates
 
-                z_value = day_z[asset]
-                if z_value <= config.long_entry_z:
-                    positions[asset] = 1
-                    if verbose:
-                        print(f"{date.date()} ENTER LONG {asset:12s} z={z_value: .4f}")
-                elif z_value >= config.short_entry_z:
-                    positions[asset] = -1
-                    if verbose:
-                        print(f"{date.date()} ENTER SHORT {asset:12s} z={z_value: .4f}")
 
-            # Apply end-of-day positions to next-day return.
-            if i + 1 < len(test_dates):
-                next_date = test_dates[i + 1]
-                next_ret = test_returns.loc[next_date]
+TRADING_ENGINES = {
+    "vectorized": _trade_block_vectorized,
+    "legacy": _trade_block_legacy,
+}
 
-                long_assets = [asset for asset, pos in positions.items() if pos == 1]
-                short_assets = [asset for asset, pos in positions.items() if pos == -1]
 
-                long_pnl = next_ret[long_assets].mean() if long_assets else 0.0
-                short_pnl = -next_ret[short_assets].mean() if short_assets else 0.0
-                day_pnl = 0.5 * long_pnl + 0.5 * short_pnl
+@dataclass
+class BlockSignal:
+    """Trade-window z-scores and aligned returns for one refit/trade block."""
 
-                portfolio_returns.append(float(day_pnl))
-                long_counts.append(len(long_assets))
-                short_counts.append(len(short_assets))
-                pnl_dates.append(next_date)
+    block_num: int
+    fit_dates: pd.DatetimeIndex
+    zscores: pd.DataFrame  # trade dates x assets
+    returns: pd.DataFrame  # trade dates x assets, same layout as zscores
 
-    pnl = pd.Series(portfolio_returns, index=pnl_dates, name="strategy_return")
+
+@timed("backtest.block_betas")
+def compute_block_betas(returns: pd.DataFrame, config: BacktestConfig) -> list[pd.DataFrame]:
+    """PCA betas for every calendar block's fit window, from one batched eigendecomposition.
+
+    The list lines up with ``_get_refit_trade_blocks`` and can be passed to
+    ``compute_block_signals`` / ``run_backtest_on_df`` as ``block_betas``.
+    Fits are memoized by window fingerprint (``pca_cache``), so windows seen
+    earlier in the process, or saved under ``config.pca_cache_dir``, skip the
+    covariance and eigen work entirely.
+    """
+    blocks = _get_refit_trade_blocks(
+        returns.index,
+        refit_months=config.refit_months,
+        trade_months=config.trade_months,
+    )
+    return _fit_window_betas(returns, [fit_dates for fit_dates, _ in blocks], config)
+
+
+def _fit_window_betas(
+    returns: pd.DataFrame,
+    fit_windows: list[pd.DatetimeIndex],
+    config: BacktestConfig,
+) -> list[pd.DataFrame]:
+    """PCA betas for each fit window (memoized, batched unless the solver is truncated)."""
+    # Eigen-solves always run in float64, whatever ``config.dtype`` is.
+    windows = [returns.loc[fit_dates].astype(np.float64) for fit_dates in fit_windows]
+    cache = get_pca_cache(config.pca_cache_dir)
+    if config.pca_solver == "truncated":
+        ranked_tables = [
+            cache.compute_pca(
+                window, train_fraction=1.0, variance_threshold=config.variance_threshold, solver="truncated"
+            )[2]
+            for window in windows
+        ]
+    else:
+        ranked_tables = cache.batched_pca(windows, variance_threshold=config.variance_threshold)
+    return [_build_betas_from_ranked_table(table) for table in ranked_tables]
+
+
+@timed("backtest.signals")
+def compute_block_signals(
+    returns: pd.DataFrame,
+    config: BacktestConfig,
+    block_betas: list[pd.DataFrame] | None = None,
+) -> list[BlockSignal]:
+    """Signal stage: PCA refit, residuals and rolling z-scores for every block.
+
+    Depends only on ``returns``, ``lookback``, ``refit_months`` and
+    ``trade_months``, so the result can be computed once and reused across
+    any number of entry/exit threshold settings. ``block_betas`` (from
+    ``compute_block_betas``) skips the per-block PCA; by default all blocks
+    are decomposed in one batched call.
+    """
+    blocks = _get_refit_trade_blocks(
+        returns.index,
+        refit_months=config.refit_months,
+        trade_months=config.trade_months,
+    )
+    if block_betas is None:
+        block_betas = compute_block_betas(returns, config)
+    if len(block_betas) != len(blocks):
+        raise ValueError(f"Expected betas for {len(blocks)} blocks, got {len(block_betas)}")
+
+    return _residual_zscores(returns, blocks, block_betas, [config.lookback], config.dtype)[config.lookback]
+
+
+def _residual_zscores(
+    returns: pd.DataFrame,
+    blocks: list[tuple[pd.DatetimeIndex, pd.DatetimeIndex]],
+    block_betas: list[pd.DataFrame],
+    lookbacks: list[int],
+    dtype: str,
+) -> dict[int, list[BlockSignal]]:
+    """Residuals per block once, z-scored against every lookback in ``lookbacks``."""
+    # Residuals run from the fit start, as the rolling std did on each
+    # block's fit + trade slice, so the compensated running moments reach
+    # the trade window in the same state. The segments of all blocks are
+    # rolled together (see ``rolling.rolling_std_windows``).
+    values = returns.to_numpy(dtype=dtype)
+    segments: list[np.ndarray] = []
+    layouts: list[tuple[int, pd.DatetimeIndex, pd.DatetimeIndex, list[str], int]] = []
+    for block_num, ((fit_dates, trade_dates), betas) in enumerate(zip(blocks, block_betas), start=1):
+        if len(trade_dates) < 2:
+            continue
+        assets = [c for c in returns.columns if c in betas.columns]
+        if not assets:
+            raise ValueError("No overlapping assets between returns and PCA component file")
+
+        trade_start = returns.index.get_loc(trade_dates[0])
+        trade_end = returns.index.get_loc(trade_dates[-1]) + 1
+        start = returns.index.get_loc(fit_dates[0])
+
+        block_values = values[start:trade_end, returns.columns.get_indexer(assets)]
+        b = betas[assets].to_numpy(dtype=dtype)  # K x N
+        segments.append(block_values - (block_values @ b.T) @ b)
+        layouts.append((block_num, fit_dates, trade_dates, assets, trade_start - start))
+
+    signals: dict[int, list[BlockSignal]] = {lookback: [] for lookback in lookbacks}
+    for (block_num, fit_dates, trade_dates, assets, offset), (residuals, prior_stds) in zip(
+        layouts, _lagged_rolling_stds(segments, lookbacks)
+    ):
+        block_returns = returns.loc[trade_dates, assets].astype(dtype)
+        for lookback, prior_std in prior_stds.items():
+            with np.errstate(divide="ignore", invalid="ignore"):
+                zscores = residuals[offset:] / prior_std[offset:]
+            signals[lookback].append(BlockSignal(
+                block_num=block_num,
+                fit_dates=fit_dates,
+                zscores=pd.DataFrame(zscores, index=trade_dates, columns=assets),
+                returns=block_returns,
+            ))
+
+    return signals
+
+
+@timed("backtest.signal_grid")
+def compute_signal_grid(
+    returns: pd.DataFrame,
+    config: BacktestConfig,
+    lookbacks: list[int],
+    refit_months: list[int],
+    trade_months: list[int],
+) -> dict[tuple[int, int, int], list[BlockSignal]]:
+    """Calendar-mode signals for every (lookback, refit_months, trade_months) combination.
+
+    Shares work across the grid instead of calling ``compute_block_signals``
+    per combination:
+
+    - for each refit length the fit windows are the same whatever the trade
+      length, so each window is fitted once (and memoized as usual);
+    - trade windows of different lengths start on the same day after a fit
+      window, so residuals are computed once over the longest of them and
+      the shorter blocks take a prefix;
+    - the rolling residual std of every block is computed in one call per
+      lookback (``rolling_std_windows``).
+
+    Other settings (dtype, PCA solver and cache) come from ``config``.
+    Returns ``{(lookback, refit, trade): signals}``; each list matches what
+    ``compute_block_signals`` returns for that combination.
+    """
+    lookbacks = sorted(set(lookbacks))
+    grid: dict[tuple[int, int, int], list[BlockSignal]] = {}
+    for refit in sorted(set(refit_months)):
+        blocks_by_trade = {
+            trade: _get_refit_trade_blocks(returns.index, refit_months=refit, trade_months=trade)
+            for trade in sorted(set(trade_months))
+        }
+
+        # One covering block per fit window: its longest trade window.
+        covering: dict[pd.Timestamp, tuple[pd.DatetimeIndex, pd.DatetimeIndex]] = {}
+        for blocks in blocks_by_trade.values():
+            for fit_dates, trade_dates in blocks:
+                known = covering.get(fit_dates[0])
+                if known is None or len(trade_dates) > len(known[1]):
+                    covering[fit_dates[0]] = (fit_dates, trade_dates)
+        fit_starts = list(covering)
+        covering_blocks = [covering[start] for start in fit_starts]
+
+        betas = _fit_window_betas(returns, [fit_dates for fit_dates, _ in covering_blocks], config)
+        shared = _residual_zscores(returns, covering_blocks, betas, lookbacks, config.dtype)
+
+        for trade, blocks in blocks_by_trade.items():
+            for lookback in lookbacks:
+                by_start = dict(zip(fit_starts, shared[lookback]))
+                signals = []
+                for block_num, (fit_dates, trade_dates) in enumerate(blocks, start=1):
+                    full = by_start[fit_dates[0]]
+                    n = len(trade_dates)
+                    signals.append(BlockSignal(
+                        block_num=block_num,
+                        fit_dates=fit_dates,
+                        zscores=full.zscores.iloc[:n],
+                        returns=full.returns.iloc[:n],
+                    ))
+                grid[(lookback, refit, trade)] = signals
+
+    return grid
+
+
+def _lagged_rolling_std(
+    segments: list[np.ndarray],
+    lookback: int,
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Pair each residual segment with the rolling std of its previous ``lookback`` rows.
+
+    Equivalent to ``residuals.rolling(lookback).std().shift(1)`` per segment.
+    """
+    return [(residuals, stds[lookback]) for residuals, stds in _lagged_rolling_stds(segments, [lookback])]
+
+
+def _lagged_rolling_stds(
+    segments: list[np.ndarray],
+    lookbacks: list[int],
+) -> list[tuple[np.ndarray, dict[int, np.ndarray]]]:
+    """``_lagged_rolling_std`` for several lookbacks at once.
+
+    Segments of equal width are stacked so all of them are rolled in one
+    ``rolling_std_windows`` call per lookback.
+    """
+    if not segments:
+        return []
+    if len({segment.shape[1] for segment in segments}) == 1:
+        lengths = [len(segment) for segment in segments]
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        stacked = rolling_std_windows(np.concatenate(segments), lookbacks, segment_starts=starts)
+        per_segment = zip(*(np.split(std, np.cumsum(lengths)[:-1]) for std in stacked))
+    else:
+        per_segment = (rolling_std_windows(segment, lookbacks) for segment in segments)
+
+    paired = []
+    for residuals, stds in zip(segments, per_segment):
+        prior_stds = {}
+        for lookback, std in zip(lookbacks, stds):
+            prior_std = np.empty_like(std)
+            prior_std[0] = np.nan
+            prior_std[1:] = std[:-1]
+            prior_stds[lookback] = prior_std
+        paired.append((residuals, prior_stds))
+    return paired
+
+
+@timed("backtest.daily_signals")
+def compute_daily_signals(
+    returns: pd.DataFrame,
+    config: BacktestConfig,
+    drift_check_every: int = 21,
+) -> tuple[list[BlockSignal], pd.DataFrame]:
+    """Signal stage for daily refits with a tracked PCA subspace.
+
+    Each trading day t uses betas fitted on the ``daily_fit_window`` days
+    before t: the Ledoit-Wolf covariance slides one day at a time
+    (``rolling_ledoit_wolf``) and the leading eigenvectors are updated by a
+    warm-started subspace iteration seeded from the previous day's basis.
+    The component count is fixed by a full solve on the first window.
+
+    Every ``drift_check_every`` days the tracked subspace is compared with a
+    fresh ``compute_pca`` solution on the same window. Returns one
+    ``BlockSignal`` covering all tradable days plus the drift diagnostics
+    (date, components, largest principal angle, variance captured).
+    """
+    diagnostics_columns = [
+        "tracked_components",
+        "fresh_components",
+        "max_angle_deg",
+        "tracked_variance_pct",
+        "fresh_variance_pct",
+    ]
+    window = config.daily_fit_window
+    values = returns.to_numpy(dtype=float)
+    n_days, n_assets = values.shape
+    if window < 2 or n_days < window + 2:
+        return [], pd.DataFrame(columns=diagnostics_columns)
+
+    residuals = np.full((n_days, n_assets), np.nan, dtype=config.dtype)
+    diagnostics: dict[pd.Timestamp, list[float]] = {}
+    tracker: SubspaceTracker | None = None
+
+    for t, (_, covariance, _) in zip(range(window, n_days), rolling_ledoit_wolf(values, window)):
+        if tracker is None:
+            initial = pca_from_covariance(covariance, returns.columns, config.variance_threshold)
+            tracker = SubspaceTracker(_build_betas_from_ranked_table(initial).to_numpy().T)
+        basis = tracker.update(covariance, iterations=config.subspace_iterations)
+
+        x = values[t]
+        residuals[t] = x - (x @ basis) @ basis.T
+
+        if drift_check_every and (t - window) % drift_check_every == 0:
+            _, _, fresh_table = compute_pca(
+                returns.iloc[t - window:t],
+                train_fraction=1.0,
+                variance_threshold=config.variance_threshold,
+            )
+            fresh_basis = _build_betas_from_ranked_table(fresh_table).to_numpy().T
+            total_variance = np.trace(covariance)
+            diagnostics[returns.index[t]] = [
+                basis.shape[1],
+                fresh_basis.shape[1],
+                subspace_distance(basis, fresh_basis),
+                100.0 * np.trace(basis.T @ covariance @ basis) / total_variance,
+                fresh_table["cumulative_variance_pct"].iloc[-1],
+            ]
+
+    [(residuals, prior_std)] = _lagged_rolling_std([residuals], config.lookback)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zscores = pd.DataFrame(
+            residuals[window:] / prior_std[window:],
+            index=returns.index[window:],
+            columns=returns.columns,
+        )
+
+    diagnostics_df = pd.DataFrame.from_dict(diagnostics, orient="index", columns=diagnostics_columns)
+    signal = BlockSignal(
+        block_num=1,
+        fit_dates=returns.index[:window],
+        zscores=zscores,
+        returns=returns.iloc[window:].astype(config.dtype),
+    )
+    return [signal], diagnostics_df
+
+
+def build_signals(returns: pd.DataFrame, config: BacktestConfig) -> list[BlockSignal]:
+    """Signal stage for ``config.refit_mode`` ("calendar" or "daily")."""
+    if config.refit_mode == "calendar":
+        return compute_block_signals(returns, config)
+    if config.refit_mode == "daily":
+        signals, _ = compute_daily_signals(returns, config)
+        return signals
+    raise ValueError(f"Unknown refit_mode {config.refit_mode!r}; expected 'calendar' or 'daily'")
+
+
+@timed("backtest.trading")
+def run_backtest_on_signals(
+    signals: list[BlockSignal],
+    config: BacktestConfig,
+    verbose: bool = True,
+) -> pd.DataFrame:
+    """Trading stage: apply the entry/exit thresholds in ``config`` to precomputed signals."""
+    if config.engine not in TRADING_ENGINES:
+        raise ValueError(
+            f"Unknown engine {config.engine!r}; expected one of {sorted(TRADING_ENGINES)}"
+        )
+    trade_block = TRADING_ENGINES[config.engine]
+
+    portfolio_returns: list[float] = []
+    long_counts: list[int] = []
+    short_counts: list[int] = []
+    pnl_dates: list[pd.Timestamp] = []
+
+    for signal in signals:
+        if verbose:
+            test_dates = signal.zscores.index
+            print(
+                f"\nBlock {signal.block_num}: fit {signal.fit_dates[0].date()} to {signal.fit_dates[-1].date()} | "
+                f"trade {test_dates[0].date()} to {test_dates[-1].date()}"
+            )
+
+        block_returns, block_longs, block_shorts, block_dates = trade_block(
+            signal.zscores, signal.returns, config, verbose
+        )
+        portfolio_returns.extend(block_returns)
+        long_counts.extend(block_longs)
+        short_counts.extend(block_shorts)
+        pnl_dates.extend(block_dates)
+
+    pnl = pd.Series(portfolio_returns, index=pnl_dates, name="strategy_return", dtype=config.dtype)
     cumulative = (1.0 + pnl).cumprod() - 1.0
     return pd.DataFrame({
         "strategy_return": pnl,
@@ -242,30 +725,146 @@ def run_backtest_on_df(returns: pd.DataFrame, config: BacktestConfig, verbose: b
     })
 
 
-def run_backtest(config: BacktestConfig) -> pd.DataFrame:
-    """Run rolling refit / trade PCA residual strategy."""
-    returns = load_returns(config.returns_path)
-    result = run_backtest_on_df(returns, config, verbose=True)
-    return result
+def run_backtest_on_df(
+    returns: pd.DataFrame,
+    config: BacktestConfig,
+    verbose: bool = True,
+    block_betas: list[pd.DataFrame] | None = None,
+) -> pd.DataFrame:
+    """Core rolling refit / trade PCA residual strategy on a pre-loaded returns DataFrame.
 
-def run_backtest_baseline_on_df(returns: pd.DataFrame, config: BacktestConfig, verbose: bool = True) -> pd.DataFrame:
-    """
-    Index mean-reversion baseline strategy on a pre-loaded returns DataFrame.
-    
-    Instead of PCA residuals per asset, we use a single index-level z-score:
-    - Index return = mean return across all assets
-    - z-score = (index_return - rolling_mean) / rolling_std
-    - Entry/exit rules apply to the entire index (all assets held equally)
+    ``block_betas`` optionally supplies precomputed per-block betas
+    (``compute_block_betas``) for the calendar refit mode.
     """
-    blocks = _get_refit_trade_blocks(
-        returns.index,
-        refit_months=config.refit_months,
-        trade_months=config.trade_months,
-    )
+    if config.engine not in TRADING_ENGINES:
+        raise ValueError(
+            f"Unknown engine {config.engine!r}; expected one of {sorted(TRADING_ENGINES)}"
+        )
 
-    if not blocks:
+    if config.refit_mode == "daily":
+        signals, diagnostics = compute_daily_signals(returns, config)
+        if verbose and not diagnostics.empty:
+            print(
+                f"Subspace tracking drift vs fresh PCA over {len(diagnostics)} checks: "
+                f"median {diagnostics['max_angle_deg'].median():.2f} deg, "
+                f"max {diagnostics['max_angle_deg'].max():.2f} deg"
+            )
+        if not signals:
+            return pd.DataFrame(columns=["strategy_return", "cumulative_return", "long_count", "short_count"])
+        return run_backtest_on_signals(signals, config, verbose=verbose)
+
+    if not _get_refit_trade_blocks(returns.index, config.refit_months, config.trade_months):
         return pd.DataFrame(columns=["strategy_return", "cumulative_return", "long_count", "short_count"])
 
+    signals = compute_block_signals(returns, config, block_betas=block_betas)
+    return run_backtest_on_signals(signals, config, verbose=verbose)
+
+
+def annualized_sharpe(daily: np.ndarray, axis: int = 0) -> np.ndarray:
+    """Tuning objective: ((1 + mean) ** 252 - 1) / (std * sqrt(252)), -inf if degenerate.
+
+    Same definition as ``tune_hyperparams.compute_sharpe``, vectorized along ``axis``.
+    """
+    daily = np.asarray(daily, dtype=float)
+    n_days = daily.shape[axis]
+    if n_days < 2:
+        return np.full(np.delete(daily.shape, axis), -np.inf)
+
+    ann_ret = (1.0 + daily.mean(axis=axis)) ** 252 - 1.0
+    ann_vol = daily.std(axis=axis, ddof=1) * np.sqrt(252)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = ann_ret / ann_vol
+    return np.where(ann_vol > 0, sharpe, -np.inf)
+
+
+def _float_values(frame: pd.DataFrame) -> np.ndarray:
+    """``frame`` as a floating-point array, keeping float32 data in float32."""
+    values = frame.to_numpy()
+    return values if np.issubdtype(values.dtype, np.floating) else values.astype(float)
+
+
+@timed("backtest.threshold_grid")
+def evaluate_threshold_grid(
+    zscores: pd.DataFrame | list[pd.DataFrame],
+    returns: pd.DataFrame | list[pd.DataFrame],
+    entry_grid: list[float],
+    exit_grid: list[float],
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Evaluate every symmetric (entry_z, exit_z) pair in one vectorized pass.
+
+    ``zscores``/``returns`` are trade-window matrices, either one block or a
+    list of blocks (positions reset at each block, as in the backtest). Each
+    pair uses long_entry=-entry, short_entry=+entry, long_exit=+exit,
+    short_exit=-exit; pairs with exit_z >= entry_z are skipped. All pairs are
+    scanned together by broadcasting the thresholds over a leading grid axis.
+
+    Returns:
+        sharpe: entry_grid x exit_grid surface of ``annualized_sharpe``
+            (NaN for skipped pairs).
+        daily_returns: date x (entry_z, exit_z) strategy returns for every
+            evaluated pair.
+    """
+    if isinstance(zscores, pd.DataFrame):
+        zscores = [zscores]
+    if isinstance(returns, pd.DataFrame):
+        returns = [returns]
+
+    pairs = [(e, x) for e in entry_grid for x in exit_grid if x < e]
+    surface = pd.DataFrame(np.nan, index=pd.Index(entry_grid, name="entry_z"),
+                           columns=pd.Index(exit_grid, name="exit_z"))
+    columns = pd.MultiIndex.from_tuples(pairs, names=["entry_z", "exit_z"])
+    if not pairs:
+        return surface, pd.DataFrame(columns=columns, dtype=float)
+
+    entry = np.array([e for e, _ in pairs])[:, None]  # G x 1
+    exit_ = np.array([x for _, x in pairs])[:, None]
+
+    block_pnl: list[np.ndarray] = []
+    pnl_dates: list[pd.Timestamp] = []
+    for block_z, block_r in zip(zscores, returns):
+        z = _float_values(block_z)
+        r = _float_values(block_r)
+        positions = _scan_positions(z, -entry, entry, exit_, -exit_)  # T x G x N
+
+        active = ~np.isnan(z).all(axis=1)
+        rows = np.flatnonzero(active[:-1])
+        held = positions[rows]
+        next_returns = r[rows + 1][:, None, :]
+        observed = ~np.isnan(next_returns)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            legs = []
+            for side in (1, -1):
+                mask = held == side
+                counted = mask & observed
+                total = np.where(counted, next_returns, 0.0).sum(axis=-1)
+                mean = total / counted.sum(axis=-1).astype(total.dtype)
+                legs.append(np.where(mask.any(axis=-1), side * mean, 0.0))
+        block_pnl.append(0.5 * legs[0] + 0.5 * legs[1])
+        pnl_dates.extend(block_z.index[rows + 1])
+
+    daily = np.concatenate(block_pnl, axis=0) if block_pnl else np.empty((0, len(pairs)))
+    sharpe = annualized_sharpe(daily, axis=0)
+    for (e, x), value in zip(pairs, sharpe):
+        surface.loc[e, x] = value
+
+    daily_returns = pd.DataFrame(daily, index=pd.DatetimeIndex(pnl_dates), columns=columns)
+    return surface, daily_returns
+
+
+def run_backtest(config: BacktestConfig) -> pd.DataFrame:
+    """Run rolling refit / trade PCA residual strategy."""
+    returns = load_returns(config.returns_path, dtype=config.dtype)
+    result = run_backtest_on_df(returns, config, verbose=True)
+    return result
+
+def _baseline_legacy(
+    returns: pd.DataFrame,
+    config: BacktestConfig,
+    blocks: list[tuple[pd.DatetimeIndex, pd.DatetimeIndex]],
+    verbose: bool,
+) -> tuple[list[float], list[int], list[int], list[pd.Timestamp]]:
+    """Index baseline with the original per-block rolling stats and per-day loop."""
     portfolio_returns: list[float] = []
     long_counts: list[int] = []
     short_counts: list[int] = []
@@ -324,6 +923,134 @@ def run_backtest_baseline_on_df(returns: pd.DataFrame, config: BacktestConfig, v
                 short_counts.append(short_count)
                 pnl_dates.append(next_date)
 
+    return portfolio_returns, long_counts, short_counts, pnl_dates
+
+
+def _print_index_events(
+    dates: pd.DatetimeIndex,
+    zscores: np.ndarray,
+    positions: np.ndarray,
+    config: BacktestConfig,
+) -> None:
+    """Print the baseline's exits and entries for one block, as the legacy loop does."""
+    previous = 0
+    for date, z_value, current in zip(dates, zscores, positions):
+        if np.isnan(z_value):
+            continue
+        exited = (previous == 1 and z_value >= config.long_exit_z) or (
+            previous == -1 and z_value <= config.short_exit_z
+        )
+        if exited:
+            side = "EXIT LONG " if previous == 1 else "EXIT SHORT"
+            print(f"{date.date()} {side} (index) z={z_value: .4f}")
+        if current != 0 and (exited or previous == 0):
+            side = "ENTER LONG" if current == 1 else "ENTER SHORT"
+            print(f"{date.date()} {side} (index) z={z_value: .4f}")
+        previous = current
+
+
+def _baseline_vectorized(
+    returns: pd.DataFrame,
+    config: BacktestConfig,
+    blocks: list[tuple[pd.DatetimeIndex, pd.DatetimeIndex]],
+    verbose: bool,
+) -> tuple[list[float], list[int], list[int], list[pd.Timestamp]]:
+    """Index baseline from one pass over the full history.
+
+    The index series and its lagged rolling z-score are computed once; each
+    block only masks the z-scores whose lookback window would reach back
+    before the block's fit start (where the per-block rolling stats are
+    NaN). The trade windows are stacked as NaN-padded columns and scanned
+    together, so the hysteresis costs one pass over the longest block.
+    """
+    dates = returns.index
+    n_assets = returns.shape[1]
+    index_returns = returns.mean(axis=1)
+    rolling = index_returns.rolling(config.lookback)
+    zscores = ((index_returns - rolling.mean().shift(1)) / rolling.std().shift(1)).to_numpy()
+    index_values = index_returns.to_numpy()
+
+    fit_starts = dates.get_indexer([fit_dates[0] for fit_dates, _ in blocks])
+    trade_starts = dates.get_indexer([trade_dates[0] for _, trade_dates in blocks])
+    lengths = np.array([len(trade_dates) for _, trade_dates in blocks])
+
+    stacked = np.full((lengths.max(), len(blocks)), np.nan)
+    for b, (fit_start, trade_start, length) in enumerate(zip(fit_starts, trade_starts, lengths)):
+        block_z = zscores[trade_start:trade_start + length].copy()
+        warmup = np.arange(trade_start, trade_start + length) - fit_start < config.lookback
+        block_z[warmup] = np.nan
+        stacked[:length, b] = block_z
+
+    positions = _scan_positions(
+        stacked,
+        long_entry=config.long_entry_z,
+        short_entry=config.short_entry_z,
+        long_exit=config.long_exit_z,
+        short_exit=config.short_exit_z,
+    )
+
+    portfolio_returns: list[float] = []
+    long_counts: list[int] = []
+    short_counts: list[int] = []
+    pnl_dates: list[pd.Timestamp] = []
+
+    for b, (trade_start, length) in enumerate(zip(trade_starts, lengths)):
+        block_z = stacked[:length, b]
+        block_positions = positions[:length, b]
+        if verbose:
+            trade_dates = dates[trade_start:trade_start + length]
+            print(f"\nBlock {b + 1}: trade {trade_dates[0].date()} to {trade_dates[-1].date()}")
+            _print_index_events(trade_dates, block_z, block_positions, config)
+
+        # Days with a NaN z-score are skipped outright (no PnL row).
+        rows = np.flatnonzero(~np.isnan(block_z[:-1]))
+        held = block_positions[rows]
+        portfolio_returns.extend((held * index_values[trade_start + rows + 1]).tolist())
+        long_counts.extend(np.where(held == 1, n_assets, 0).tolist())
+        short_counts.extend(np.where(held == -1, n_assets, 0).tolist())
+        pnl_dates.extend(dates[trade_start + rows + 1])
+
+    return portfolio_returns, long_counts, short_counts, pnl_dates
+
+
+BASELINE_ENGINES = {
+    "vectorized": _baseline_vectorized,
+    "legacy": _baseline_legacy,
+}
+
+
+@timed("backtest.baseline")
+def run_backtest_baseline_on_df(returns: pd.DataFrame, config: BacktestConfig, verbose: bool = True) -> pd.DataFrame:
+    """
+    Index mean-reversion baseline strategy on a pre-loaded returns DataFrame.
+    
+    Instead of PCA residuals per asset, we use a single index-level z-score:
+    - Index return = mean return across all assets
+    - z-score = (index_return - rolling_mean) / rolling_std
+    - Entry/exit rules apply to the entire index (all assets held equally)
+
+    ``config.engine`` picks the array-based implementation ("vectorized")
+    or the original per-block loop ("legacy"); both return the same frame
+    up to floating-point rounding in the rolling statistics.
+    """
+    if config.engine not in BASELINE_ENGINES:
+        raise ValueError(
+            f"Unknown engine {config.engine!r}; expected one of {sorted(BASELINE_ENGINES)}"
+        )
+
+    blocks = _get_refit_trade_blocks(
+        returns.index,
+        refit_months=config.refit_months,
+        trade_months=config.trade_months,
+    )
+
+    if not blocks:
+        return pd.DataFrame(columns=["strategy_return", "cumulative_return", "long_count", "short_count"])
+
+    portfolio_returns, long_counts, short_counts, pnl_dates = BASELINE_ENGINES[config.engine](
+        returns, config, blocks, verbose
+    )
+
     pnl = pd.Series(portfolio_returns, index=pnl_dates, name="strategy_return")
     cumulative = (1.0 + pnl).cumprod() - 1.0
     return pd.DataFrame({
@@ -369,6 +1096,37 @@ def main() -> None:
     parser.add_argument("--short-entry-z", type=float, default=2.5)
     parser.add_argument("--long-exit-z", type=float, default=-1.5)
     parser.add_argument("--short-exit-z", type=float, default=1.5)
+    parser.add_argument(
+        "--refit-mode",
+        choices=["calendar", "daily"],
+        default="calendar",
+        help="Calendar-month PCA refits or daily refits with subspace tracking",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["vectorized", "legacy"],
+        default="vectorized",
+        help="Trading engine: array-based position matrix or the original per-asset loop",
+    )
+    parser.add_argument(
+        "--pca-solver",
+        choices=["full", "truncated"],
+        default="full",
+        help="Full eigendecomposition or only the leading eigenpairs (large universes; "
+             "pays off only when --variance-threshold needs few components)",
+    )
+    parser.add_argument(
+        "--variance-threshold",
+        type=float,
+        default=0.99,
+        help="Cumulative explained variance the factor model keeps at each refit (default: 0.99)",
+    )
+    parser.add_argument(
+        "--dtype",
+        choices=["float64", "float32"],
+        default="float64",
+        help="Precision of residuals, z-scores and PnL (PCA always runs in float64)",
+    )
     parser.add_argument(
         "--save-results-path",
         type=str,
@@ -391,6 +1149,11 @@ def main() -> None:
         short_entry_z=args.short_entry_z,
         long_exit_z=args.long_exit_z,
         short_exit_z=args.short_exit_z,
+        engine=args.engine,
+        refit_mode=args.refit_mode,
+        pca_solver=args.pca_solver,
+        variance_threshold=args.variance_threshold,
+        dtype=args.dtype,
     )
 
     results = run_backtest(config)
@@ -0,0 +1,246 @@
+"""
+Memoized PCA fits keyed by a fingerprint of the fit window.
+
+The same fit windows are decomposed over and over: every tuning evaluation,
+strategy comparison and pipeline rerun on unchanged data refits identical
+Ledoit-Wolf covariances. ``PCACache`` keeps the results in a bounded
+in-memory LRU and, optionally, in a directory of pickles that survives
+between runs (and is shared between worker processes). Persistence is
+opt-in: the entry points only use ``DEFAULT_PCA_CACHE_DIR`` when run with
+``--pca-cache-dir``.
+
+The key is a SHA-1 over the window's float64 bytes, its column names and
+the fit settings (train fraction, variance threshold, estimator, solver), so
+any change in the data or settings is a miss, never a stale hit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from nifty50_stat_arb.pca import batched_pca, compute_pca
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_PCA_CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "pca_cache")
+
+ESTIMATOR = "ledoit_wolf"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0  # served from memory
+    disk_hits: int = 0  # loaded from cache_dir
+    misses: int = 0  # covariance + eigendecomposition computed
+    evictions: int = 0  # entries dropped from memory or disk
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.disk_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.hits + self.disk_hits) / self.lookups if self.lookups else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.hits} memory hits, {self.disk_hits} disk hits, {self.misses} misses "
+            f"({self.hit_rate:.0%} hit rate), {self.evictions} evictions"
+        )
+
+
+def window_fingerprint(
+    returns: pd.DataFrame,
+    train_fraction: float,
+    variance_threshold: float,
+    estimator: str = ESTIMATOR,
+    solver: str = "full",
+) -> str:
+    """Hex digest identifying a PCA fit: window contents, columns and fit settings."""
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(returns.to_numpy(dtype=float)).tobytes())
+    digest.update(str(returns.shape).encode())
+    digest.update("\x1f".join(map(str, returns.columns)).encode())
+    digest.update(f"{train_fraction!r}|{variance_threshold!r}|{estimator}|{solver}".encode())
+    return digest.hexdigest()
+
+
+class PCACache:
+    """Two-level (memory LRU + optional directory) cache of PCA fits.
+
+    Entries are ``(covariance_df, ranked_table)`` pairs as produced by
+    ``compute_pca``. ``max_entries`` bounds the in-memory LRU;
+    ``max_disk_entries`` bounds the number of files in ``cache_dir``, the
+    least recently used (by mtime) going first. The directory is listed
+    once up front and then only when the tracked file count passes the
+    bound (other processes sharing it are picked up at that rescan); each
+    eviction trims to 90% of the bound so rescans stay rare.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_entries: int = 256,
+        max_disk_entries: int = 4096,
+    ):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.stats = CacheStats()
+        self._memory: OrderedDict[str, tuple[pd.DataFrame, pd.DataFrame]] = OrderedDict()
+        self._disk_entries = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._disk_entries = len(self._disk_files())
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[tuple[pd.DataFrame, pd.DataFrame]]:
+        """Cached ``(covariance_df, ranked_table)`` for ``key``, or None."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.stats.hits += 1
+            return self._memory[key]
+
+        if self.cache_dir:
+            path = self._path(key)
+            try:
+                entry = pd.read_pickle(path)
+            except (OSError, EOFError, ValueError):
+                entry = None
+            if entry is not None:
+                os.utime(path)
+                self._remember(key, entry)
+                self.stats.disk_hits += 1
+                return entry
+
+        self.stats.misses += 1
+        return None
+
+    def put(self, key: str, covariance: pd.DataFrame, ranked_table: pd.DataFrame) -> None:
+        """Store a fit in memory and, if configured, on disk."""
+        entry = (covariance, ranked_table)
+        self._remember(key, entry)
+        if self.cache_dir:
+            path = self._path(key)
+            # Write-then-rename so concurrent workers never read a partial file.
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            is_new = not os.path.exists(path)
+            pd.to_pickle(entry, tmp_path)
+            os.replace(tmp_path, path)
+            self._disk_entries += is_new
+            if self._disk_entries > self.max_disk_entries:
+                self._evict_disk()
+
+    def clear(self) -> None:
+        """Drop the in-memory entries (files in ``cache_dir`` are kept)."""
+        self._memory.clear()
+
+    def _remember(self, key: str, entry: tuple[pd.DataFrame, pd.DataFrame]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _disk_files(self) -> list[str]:
+        return [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if name.endswith(".pkl")
+        ]
+
+    def _evict_disk(self) -> None:
+        files = self._disk_files()
+        self._disk_entries = len(files)
+        if len(files) <= self.max_disk_entries:
+            return
+        excess = len(files) - int(self.max_disk_entries * 0.9)
+        files.sort(key=lambda path: os.stat(path).st_mtime)
+        for path in files[:excess]:
+            try:
+                os.remove(path)
+                self.stats.evictions += 1
+            except FileNotFoundError:
+                pass
+            self._disk_entries -= 1
+
+    # ------------------------------------------------------------------
+    # Cached counterparts of the pca module entry points
+    # ------------------------------------------------------------------
+
+    def compute_pca(
+        self,
+        returns: pd.DataFrame,
+        train_fraction: float = 0.8,
+        variance_threshold: float = 0.99,
+        solver: str = "full",
+    ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """``pca.compute_pca`` with memoization; same return value."""
+        key = window_fingerprint(returns, train_fraction, variance_threshold, solver=solver)
+        entry = self.get(key)
+        if entry is None:
+            covariance, training_slice, ranked_table = compute_pca(
+                returns,
+                train_fraction=train_fraction,
+                variance_threshold=variance_threshold,
+                solver=solver,
+            )
+            self.put(key, covariance, ranked_table)
+            return covariance, training_slice, ranked_table
+
+        train_size = max(2, int(len(returns) * train_fraction))
+        covariance, ranked_table = entry
+        return covariance, returns.iloc[:train_size].copy(), ranked_table
+
+    def batched_pca(
+        self,
+        windows: list[pd.DataFrame],
+        variance_threshold: float = 0.99,
+    ) -> list[pd.DataFrame]:
+        """``pca.batched_pca`` with memoization; only the missing windows are decomposed."""
+        keys = [window_fingerprint(window, 1.0, variance_threshold) for window in windows]
+        tables: list[Optional[pd.DataFrame]] = []
+        for key in keys:
+            entry = self.get(key)
+            tables.append(None if entry is None else entry[1])
+
+        missing = [i for i, table in enumerate(tables) if table is None]
+        if missing:
+            fresh, covariances = batched_pca(
+                [windows[i] for i in missing],
+                variance_threshold=variance_threshold,
+                return_covariances=True,
+            )
+            for i, table, covariance in zip(missing, fresh, covariances):
+                columns = windows[i].columns
+                self.put(keys[i], pd.DataFrame(covariance, index=columns, columns=columns), table)
+                tables[i] = table
+        return tables
+
+
+_CACHES: dict[Optional[str], PCACache] = {}
+
+
+def get_pca_cache(cache_dir: Optional[str] = None) -> PCACache:
+    """Process-wide cache for ``cache_dir`` (None = memory only), created on first use."""
+    key = os.path.abspath(cache_dir) if cache_dir else None
+    if key not in _CACHES:
+        _CACHES[key] = PCACache(cache_dir=key)
+    return _CACHES[key]
+
+
+def reset_pca_caches() -> None:
+    """Forget every process-wide cache (files in their directories are kept)."""
+    _CACHES.clear()
@@ -34,6 +34,21 @@ class PipelineConfig:
     end_date: Optional[str] = None
     period: str = "10y"  # used only when start_date/end_date are not given
 
+    # Price/returns cache format: "csv", "parquet", "feather" or "npy"
+    cache_format: str = "csv"
+
+    # Download concurrency and per-symbol retries
+    download_workers: int = 1
+    download_retries: int = 0
+
+    # Optional shared raw-price store (see data_fetcher.PriceStore); symbols
+    # found there are sliced from it instead of being downloaded again
+    price_store_path: Optional[str] = None
+
+    # Memoized PCA fits are persisted here and reused by later runs on
+    # unchanged data (None keeps them in memory only)
+    pca_cache_dir: Optional[str] = None
+
     # Backtest parameters
     train_fraction: float = 0.8
     variance_threshold: float = 0.99
@@ -59,11 +74,11 @@ class PipelineConfig:
     # Convenience path properties
     @property
     def prices_path(self) -> str:
-        return os.path.join(self.data_dir, "prices.csv")
+        return os.path.join(self.data_dir, f"prices.{self.cache_format}")
 
     @property
     def returns_path(self) -> str:
-        return os.path.join(self.data_dir, "returns.csv")
+        return os.path.join(self.data_dir, f"returns.{self.cache_format}")
 
     @property
     def pca_components_path(self) -> str:
@@ -73,6 +88,10 @@ class PipelineConfig:
     def backtest_results_path(self) -> str:
         return os.path.join(self.data_dir, "backtest_results.csv")
 
+    @property
+    def log_path(self) -> str:
+        return os.path.join(self.data_dir, "pipeline.log")
+
 
 def run_pipeline(cfg: PipelineConfig, refresh_cache: bool = False) -> pd.DataFrame:
     """
@@ -86,13 +105,25 @@ def run_pipeline(cfg: PipelineConfig, refresh_cache: bool = False) -> pd.DataFra
         4. Run z-score backtest, save results CSV (``cfg.backtest_results_path``),
            save position-counts+PnL plot
 
+    Each step runs in an instrumentation span tagged with the index name
+    (see ``instrumentation``), so enabling it records per-stage timings.
+
     Returns:
         The backtest results DataFrame.
     """
-    from nifty50_stat_arb.data_fetcher import DataFetcher
-    from nifty50_stat_arb.pca import compute_pca, load_returns
+    from nifty50_stat_arb.instrumentation import span
+
+    with span("pipeline", index=cfg.index_name):
+        return _run_pipeline(cfg, refresh_cache)
+
+
+def _run_pipeline(cfg: PipelineConfig, refresh_cache: bool) -> pd.DataFrame:
+    from nifty50_stat_arb.data_fetcher import DataFetcher, PriceStore
+    from nifty50_stat_arb.pca import load_returns
+    from nifty50_stat_arb.pca_cache import get_pca_cache
     from nifty50_stat_arb.pca_backtest import BacktestConfig, run_backtest, summarize_results
     from nifty50_stat_arb.eigenvalue_plotting import plot_eigenvalue_profile, plot_position_counts
+    from nifty50_stat_arb.instrumentation import span
 
     os.makedirs(cfg.data_dir, exist_ok=True)
     os.makedirs(cfg.plots_dir, exist_ok=True)
@@ -104,33 +135,38 @@ def run_pipeline(cfg: PipelineConfig, refresh_cache: bool = False) -> pd.DataFra
     # ------------------------------------------------------------------
     # 1. Fetch prices
     # ------------------------------------------------------------------
+    fetch_options = dict(max_workers=cfg.download_workers, max_retries=cfg.download_retries)
+    if cfg.price_store_path and os.path.exists(cfg.price_store_path):
+        fetch_options["price_store"] = PriceStore.load(cfg.price_store_path)
     if cfg.symbols_file:
-        fetcher = DataFetcher(symbols_file=cfg.symbols_file)
+        fetcher = DataFetcher(symbols_file=cfg.symbols_file, **fetch_options)
     elif cfg.symbols:
-        fetcher = DataFetcher(symbols=cfg.symbols)
+        fetcher = DataFetcher(symbols=cfg.symbols, **fetch_options)
     else:
         raise ValueError(f"[{cfg.index_name}] Either symbols_file or symbols must be set.")
 
-    prices = fetcher.fetch_data(
-        start_date=cfg.start_date,
-        end_date=cfg.end_date,
-        period=cfg.period,
-        cache_path=cfg.prices_path,
-        returns_cache_path=cfg.returns_path,
-        refresh_cache=refresh_cache,
-    )
+    with span("fetch"):
+        prices = fetcher.fetch_data(
+            start_date=cfg.start_date,
+            end_date=cfg.end_date,
+            period=cfg.period,
+            cache_path=cfg.prices_path,
+            returns_cache_path=cfg.returns_path,
+            refresh_cache=refresh_cache,
+        )
     print(f"[{cfg.index_name}] Prices: {prices.shape[0]} days x {prices.shape[1]} stocks")
 
     # ------------------------------------------------------------------
     # 2. PCA
     # ------------------------------------------------------------------
-    returns = load_returns(cfg.returns_path)
-    _, _, ranked_table = compute_pca(
-        returns,
-        train_fraction=cfg.train_fraction,
-        variance_threshold=cfg.variance_threshold,
-    )
-    ranked_table.to_csv(cfg.pca_components_path, index=False)
+    with span("pca"):
+        returns = load_returns(cfg.returns_path)
+        _, _, ranked_table = get_pca_cache(cfg.pca_cache_dir).compute_pca(
+            returns,
+            train_fraction=cfg.train_fraction,
+            variance_threshold=cfg.variance_threshold,
+        )
+        ranked_table.to_csv(cfg.pca_components_path, index=False)
     n_components = len(ranked_table)
     cum_var = ranked_table["cumulative_variance_pct"].iloc[-1]
     print(
@@ -139,10 +175,11 @@ def run_pipeline(cfg: PipelineConfig, refresh_cache: bool = False) -> pd.DataFra
     )
 
     # Eigenvalue profile plot
-    eig_plot_path = plot_eigenvalue_profile(
-        csv_path=cfg.pca_components_path,
-        plots_dir=cfg.plots_dir,
-    )
+    with span("plot.eigenvalues"):
+        eig_plot_path = plot_eigenvalue_profile(
+            csv_path=cfg.pca_components_path,
+            plots_dir=cfg.plots_dir,
+        )
     print(f"[{cfg.index_name}] Eigenvalue plot -> {eig_plot_path}")
 
     # ------------------------------------------------------------------
@@ -157,18 +194,21 @@ def run_pipeline(cfg: PipelineConfig, refresh_cache: bool = False) -> pd.DataFra
         short_entry_z=cfg.short_entry_z,
         long_exit_z=cfg.long_exit_z,
         short_exit_z=cfg.short_exit_z,
+        pca_cache_dir=cfg.pca_cache_dir,
     )
-    results = run_backtest(bt_config)
-    summarize_results(results)
-    results.to_csv(cfg.backtest_results_path)
+    with span("backtest"):
+        results = run_backtest(bt_config)
+        summarize_results(results)
+        results.to_csv(cfg.backtest_results_path)
     print(f"[{cfg.index_name}] Backtest results -> {cfg.backtest_results_path}")
 
     # Position counts + PnL plot
-    pos_plot_path = plot_position_counts(
-        results=results,
-        plots_dir=cfg.plots_dir,
-        initial_capital=cfg.initial_capital,
-    )
+    with span("plot.positions"):
+        pos_plot_path = plot_position_counts(
+            results=results,
+            plots_dir=cfg.plots_dir,
+            initial_capital=cfg.initial_capital,
+        )
     print(f"[{cfg.index_name}] Position counts plot -> {pos_plot_path}")
 
     return results
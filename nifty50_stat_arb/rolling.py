@@ -0,0 +1,183 @@
+"""
+Rolling moments over fixed-length trailing windows.
+
+Both tools for the residual-volatility step of the backtest use the
+Welford add/remove updates with Kahan-compensated means that
+``DataFrame.rolling(window).std()`` uses, in the same order, so their
+rounding error does not grow with the length of the history and results
+match pandas bit for bit:
+
+- ``RollingMoments`` keeps the running moments of each column over a ring
+  buffer, O(N) per new row.
+- ``rolling_std`` computes the trailing-window sample standard deviation of
+  every column of a T x N array. ``segment_starts`` lets several
+  independent series (e.g. one per refit block) be processed in one call:
+  the segments are laid side by side as columns of one ``RollingMoments``,
+  so each starts from a fresh state exactly as if it had been rolled on its
+  own, and the loop runs over the rows of the longest segment rather than
+  the whole history. A single series goes straight to pandas' compiled
+  loop, which computes the same values. ``rolling_std_windows`` does this
+  for several window lengths on the same layout.
+
+Both follow ``DataFrame.rolling(window).std()`` semantics (a window that is
+not yet full or holds any NaN yields NaN), except that windows with zero
+variance, where pandas returns 0 and a z-score would be infinite, are NaN.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def rolling_std(
+    values: np.ndarray,
+    window: int,
+    ddof: int = 1,
+    segment_starts: np.ndarray | list[int] | None = None,
+) -> np.ndarray:
+    """Trailing-window standard deviation of each column of ``values``.
+
+    Row t covers rows ``t - window + 1 .. t``; the result keeps the input's
+    floating dtype. With ``segment_starts`` the rows are treated as
+    consecutive independent segments beginning at those offsets, and windows
+    that would reach back into an earlier segment are NaN, exactly as if each
+    segment had been rolled on its own.
+    """
+    return rolling_std_windows(values, [window], ddof=ddof, segment_starts=segment_starts)[0]
+
+
+def rolling_std_windows(
+    values: np.ndarray,
+    windows: list[int],
+    ddof: int = 1,
+    segment_starts: np.ndarray | list[int] | None = None,
+) -> list[np.ndarray]:
+    """``rolling_std`` for several window lengths over one side-by-side layout.
+
+    The segments are rearranged once into a (longest segment) x
+    (segments * N) array, NaN-padded at the end of shorter segments (which
+    only affects rows past their end); each window is then one pass of
+    ``RollingMoments`` down its rows. Returns one array per entry of
+    ``windows``.
+    """
+    if min(windows) <= ddof:
+        raise ValueError("window must be larger than ddof")
+    values = np.asarray(values)
+    if not np.issubdtype(values.dtype, np.floating):
+        values = values.astype(float)
+    out_dtype = values.dtype
+    squeeze = values.ndim == 1
+    if squeeze:
+        values = values[:, None]
+    n_rows, n_columns = values.shape
+
+    # Segment of every row and the row's offset within it.
+    starts = np.zeros(1, dtype=int) if segment_starts is None else np.asarray(segment_starts, dtype=int)
+    segment_of_row = np.searchsorted(starts, np.arange(n_rows), side="right") - 1
+    offsets = np.arange(n_rows) - starts[segment_of_row]
+    longest = int(offsets.max()) + 1 if n_rows else 0
+
+    side_by_side = np.full((longest, len(starts), n_columns), np.nan)
+    side_by_side[offsets, segment_of_row] = values
+    side_by_side = side_by_side.reshape(longest, -1)
+
+    results = []
+    for window in windows:
+        if len(starts) == 1:
+            std = pd.DataFrame(side_by_side, copy=False).rolling(window).std(ddof=ddof).to_numpy()
+            # pandas reports 0 for a zero-variance window; no usable scale.
+            std = np.where(std > 0, std, np.nan)
+        else:
+            moments = RollingMoments(window, side_by_side.shape[1])
+            std = np.empty_like(side_by_side)
+            for i, row in enumerate(side_by_side):
+                moments.push(row)
+                std[i] = moments.std(ddof)
+        std = std.reshape(longest, len(starts), n_columns)[offsets, segment_of_row]
+        std = std.astype(out_dtype, copy=False)
+        results.append(std[:, 0] if squeeze else std)
+
+    return results
+
+
+class RollingMoments:
+    """Mean and variance of each column over the last ``window`` pushed rows.
+
+    NaN entries occupy a slot but are left out of that column's moments;
+    ``std`` is NaN for a column until its window holds ``window`` valid values.
+    Updates follow pandas' rolling variance step for step (removal of the
+    oldest value first, each with its own Kahan compensation term), so
+    ``std`` after pushing rows equals ``DataFrame.rolling(window).std()``
+    on those rows.
+    """
+
+    def __init__(self, window: int, n_columns: int):
+        if window < 2:
+            raise ValueError("window must be at least 2 to estimate a standard deviation")
+        self.window = window
+        self._buffer = np.full((window, n_columns), np.nan)
+        self._head = 0  # next slot to overwrite (oldest row)
+        self._count = np.zeros(n_columns)  # non-NaN values in the window
+        self._mean = np.zeros(n_columns)
+        self._m2 = np.zeros(n_columns)  # sum of squared deviations from the mean
+        self._add_compensation = np.zeros(n_columns)
+        self._remove_compensation = np.zeros(n_columns)
+        # Length of the run of identical values ending at the last valid
+        # one: a window made only of that run has zero variance, whatever
+        # rounding is left in ``_m2`` (pandas' GH#42064 rule).
+        self._last = np.full(n_columns, np.nan)
+        self._same_run = np.zeros(n_columns)
+
+    def push(self, row: np.ndarray) -> None:
+        """Slide the window: drop the oldest value per column and add ``row``."""
+        old = self._buffer[self._head].copy()
+        self._buffer[self._head] = row
+        self._head = (self._head + 1) % self.window
+        # Every column is updated and NaN ones are masked back, which is
+        # cheaper than fancy indexing when most columns are valid.
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self._remove(old)
+            self._add(row)
+
+    def _remove(self, value: np.ndarray) -> None:
+        drop = ~np.isnan(value)
+        count = self._count - drop
+        compensation = self._remove_compensation
+        previous_mean = self._mean - compensation
+        y = value - compensation
+        t = y - self._mean
+        new_compensation = t + self._mean - y
+        new_mean = self._mean - t / count
+        new_m2 = self._m2 - (value - previous_mean) * (value - new_mean)
+
+        # A column whose window empties resets its moments but, as in
+        # pandas, keeps its compensation term.
+        keep = drop & (count > 0)
+        emptied = drop & (count == 0)
+        self._mean = np.where(keep, new_mean, np.where(emptied, 0.0, self._mean))
+        self._m2 = np.where(keep, new_m2, np.where(emptied, 0.0, self._m2))
+        self._remove_compensation = np.where(keep, new_compensation, compensation)
+        self._count = count
+
+    def _add(self, value: np.ndarray) -> None:
+        add = ~np.isnan(value)
+        count = self._count + add
+        compensation = self._add_compensation
+        previous_mean = self._mean - compensation
+        y = value - compensation
+        t = y - self._mean
+        new_mean = self._mean + t / count
+
+        self._add_compensation = np.where(add, t + self._mean - y, compensation)
+        self._m2 = np.where(add, self._m2 + (value - previous_mean) * (value - new_mean), self._m2)
+        self._mean = np.where(add, new_mean, self._mean)
+        self._count = count
+        self._same_run = np.where(add, np.where(value == self._last, self._same_run + 1, 1), self._same_run)
+        self._last = np.where(add, value, self._last)
+
+    def std(self, ddof: int = 1) -> np.ndarray:
+        """Per-column standard deviation of the current window (NaN if zero)."""
+        usable = (self._count == self.window) & (self._same_run < self._count) & (self._m2 > 0)
+        with np.errstate(invalid="ignore"):
+            return np.where(usable, np.sqrt(self._m2 / (self.window - ddof)), np.nan)
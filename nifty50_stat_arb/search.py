@@ -0,0 +1,328 @@
+"""
+Budgeted hyperparameter search strategies.
+
+A search runs over a ``SearchSpace`` -- named dimensions, each a list of
+candidate values, plus an optional validity constraint -- and calls an
+objective ``objective(params, fidelity) -> score`` (higher is better).
+``fidelity`` in (0, 1] is the share of the validation data to use; only
+successive halving asks for less than 1.
+
+Strategies (``SEARCH_STRATEGIES``):
+
+- ``grid``     every valid point, or an evenly strided subset of ``budget``,
+- ``random``   ``budget`` distinct points drawn uniformly,
+- ``halving``  successive halving: many random points on a short validation
+  prefix, keeping the best 1/eta at each rung while the prefix grows by eta,
+- ``tpe``      tree-structured Parzen estimator over the candidate indices:
+  after random start-up points, candidates drawn from the density of the
+  best ``gamma`` share are ranked by good / bad density ratio.
+
+An objective may also return one score per cross-validation fold; the
+search then ranks by their mean and keeps the per-fold values.
+
+``budget`` caps the number of objective calls and ``seed`` makes every
+strategy reproducible. Every call is recorded as an ``Evaluation`` so the
+search can be audited afterwards (``SearchResult.to_frame``).
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+Objective = Callable[[dict, float], "float | Sequence[float]"]
+
+
+@dataclass
+class Evaluation:
+    order: int  # position in the search, from 0
+    params: dict
+    score: float
+    fidelity: float = 1.0  # share of the validation data used
+    rung: int = 0  # successive-halving rung (0 elsewhere)
+    fold_scores: tuple[float, ...] = ()  # per-fold scores when ``score`` is their mean
+
+
+@dataclass
+class SearchResult:
+    strategy: str
+    best_params: dict
+    best_score: float
+    evaluations: list[Evaluation] = field(default_factory=list)
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per evaluation: order, strategy, one column per parameter, fidelity, rung, score.
+
+        Cross-validated evaluations add ``score_std`` (sample std over folds)
+        and one ``fold_<k>`` column per fold.
+        """
+        rows = []
+        for e in self.evaluations:
+            row = {
+                "order": e.order,
+                "strategy": self.strategy,
+                **e.params,
+                "fidelity": e.fidelity,
+                "rung": e.rung,
+                "score": e.score,
+            }
+            if e.fold_scores:
+                row["score_std"] = fold_std(e.fold_scores)
+                row.update({f"fold_{k}": s for k, s in enumerate(e.fold_scores, start=1)})
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+
+def fold_std(fold_scores: Sequence[float]) -> float:
+    """Sample std of per-fold scores (NaN for one fold or a non-finite score)."""
+    scores = np.asarray(fold_scores, dtype=float)
+    if len(scores) < 2 or not np.isfinite(scores).all():
+        return math.nan
+    return float(scores.std(ddof=1))
+
+
+class SearchSpace:
+    """Product of discrete candidate lists, filtered by ``constraint(params)``."""
+
+    def __init__(
+        self,
+        dimensions: dict[str, Sequence],
+        constraint: Optional[Callable[[dict], bool]] = None,
+    ):
+        if not dimensions:
+            raise ValueError("a search space needs at least one dimension")
+        self.dimensions = {name: list(values) for name, values in dimensions.items()}
+        self.constraint = constraint
+        self.names = list(self.dimensions)
+        self.sizes = np.array([len(values) for values in self.dimensions.values()])
+
+        # Valid points as rows of per-dimension candidate indices.
+        grid = np.array(list(product(*(range(size) for size in self.sizes))), dtype=int)
+        valid = [self.is_valid(self.params(row)) for row in grid]
+        self.indices = grid[np.asarray(valid, dtype=bool)]
+        if len(self.indices) == 0:
+            raise ValueError("the constraint rejects every point of the search space")
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def params(self, row: Sequence[int]) -> dict:
+        """Parameter dict for one row of candidate indices."""
+        return {name: self.dimensions[name][i] for name, i in zip(self.names, row)}
+
+    def is_valid(self, params: dict) -> bool:
+        return self.constraint is None or bool(self.constraint(params))
+
+
+# ---------------------------------------------------------------------------
+# Bookkeeping shared by the strategies
+# ---------------------------------------------------------------------------
+
+class _Recorder:
+    """Counts objective calls against the budget and records each one."""
+
+    def __init__(self, objective: Objective, budget: int):
+        self.objective = objective
+        self.budget = budget
+        self.evaluations: list[Evaluation] = []
+
+    @property
+    def remaining(self) -> int:
+        return self.budget - len(self.evaluations)
+
+    def __call__(self, params: dict, fidelity: float = 1.0, rung: int = 0) -> float:
+        value = self.objective(params, fidelity)
+        fold_scores: tuple[float, ...] = ()
+        if np.ndim(value):
+            fold_scores = tuple(float(s) for s in value)
+            score = float(np.mean(fold_scores))
+        else:
+            score = float(value)
+        if math.isnan(score):
+            score = -math.inf
+        self.evaluations.append(Evaluation(len(self.evaluations), params, score, fidelity, rung, fold_scores))
+        return score
+
+
+def _result(strategy: str, recorder: _Recorder) -> SearchResult:
+    full = [e for e in recorder.evaluations if e.fidelity >= 1.0]
+    if not full:
+        return SearchResult(strategy, {}, -math.inf, recorder.evaluations)
+    best = max(full, key=lambda e: e.score)  # first of equal scores wins
+    return SearchResult(strategy, dict(best.params), best.score, recorder.evaluations)
+
+
+# ---------------------------------------------------------------------------
+# Strategies
+# ---------------------------------------------------------------------------
+
+def grid_strategy(space: SearchSpace, recorder: _Recorder, rng: np.random.Generator) -> None:
+    """Every valid point in product order; an evenly strided subset if the budget is smaller."""
+    rows = space.indices
+    if recorder.budget < len(rows):
+        rows = rows[np.unique(np.linspace(0, len(rows) - 1, recorder.budget).round().astype(int))]
+    for row in rows:
+        recorder(space.params(row))
+
+
+def random_strategy(space: SearchSpace, recorder: _Recorder, rng: np.random.Generator) -> None:
+    """``budget`` distinct valid points, uniformly at random."""
+    picks = rng.permutation(len(space))[: recorder.budget]
+    for row in space.indices[picks]:
+        recorder(space.params(row))
+
+
+def halving_strategy(
+    space: SearchSpace,
+    recorder: _Recorder,
+    rng: np.random.Generator,
+    eta: int = 3,
+    min_fidelity: float = 1.0 / 9.0,
+) -> None:
+    """Successive halving over validation prefixes growing by ``eta`` up to the full slice.
+
+    The starting population is the largest that fits the budget when each
+    rung keeps the best 1/eta of the previous one.
+    """
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    n_rungs = 1 + max(0, int(round(math.log(1.0 / min_fidelity, eta))))
+    fidelities = [eta ** (rung - n_rungs + 1) for rung in range(n_rungs)]
+    cost_per_start = sum(eta ** -rung for rung in range(n_rungs))
+    population = min(len(space), max(1, int(recorder.budget / cost_per_start)))
+
+    survivors = space.indices[rng.permutation(len(space))[:population]]
+    for rung, fidelity in enumerate(fidelities):
+        if rung > 0:
+            keep = max(1, len(survivors) // eta)
+            order = np.argsort(-np.asarray(scores), kind="stable")
+            survivors = survivors[order[:keep]]
+        survivors = survivors[: recorder.remaining]
+        scores = [recorder(space.params(row), fidelity, rung) for row in survivors]
+        if not scores:
+            break
+
+
+def _parzen_log_density(
+    rows: np.ndarray,
+    centers: np.ndarray,
+    sizes: np.ndarray,
+    prior_weight: float,
+) -> np.ndarray:
+    """Log of a product of per-dimension discrete Gaussian mixtures (plus a uniform prior)."""
+    log_density = np.zeros(len(rows))
+    for d, size in enumerate(sizes):
+        kernel = _discrete_kernel(size, len(centers))
+        mixture = kernel[centers[:, d]].sum(axis=0) + prior_weight / size
+        mixture /= len(centers) + prior_weight
+        log_density += np.log(mixture[rows[:, d]])
+    return log_density
+
+
+def _discrete_kernel(size: int, n_centers: int) -> np.ndarray:
+    """size x size row-normalised Gaussian kernel over candidate indices."""
+    bandwidth = max(1.0, size / (1.0 + n_centers) ** 0.5)
+    support = np.arange(size)
+    kernel = np.exp(-0.5 * ((support[None, :] - support[:, None]) / bandwidth) ** 2)
+    return kernel / kernel.sum(axis=1, keepdims=True)
+
+
+def tpe_strategy(
+    space: SearchSpace,
+    recorder: _Recorder,
+    rng: np.random.Generator,
+    n_startup: Optional[int] = None,
+    gamma: float = 0.25,
+    n_candidates: int = 24,
+    prior_weight: float = 1.0,
+) -> None:
+    """Tree-structured Parzen estimator on the candidate-index lattice.
+
+    Dimensions are modelled independently (as in TPE): each gets a discrete
+    Gaussian mixture centred on the good points and another on the rest.
+    ``n_candidates`` draws from the good mixture are scored by the log
+    density ratio and the best unseen valid one is evaluated next.
+    """
+    if n_startup is None:
+        n_startup = max(5, recorder.budget // 4)
+    index_of = {tuple(row): i for i, row in enumerate(space.indices)}
+    seen: set[int] = set()
+    rows: list[np.ndarray] = []
+    scores: list[float] = []
+
+    def evaluate(i: int) -> None:
+        seen.add(i)
+        row = space.indices[i]
+        rows.append(row)
+        scores.append(recorder(space.params(row)))
+
+    for i in rng.permutation(len(space))[: min(n_startup, recorder.budget)]:
+        evaluate(int(i))
+
+    while recorder.remaining > 0 and len(seen) < len(space):
+        order = np.argsort(-np.asarray(scores), kind="stable")
+        n_good = max(1, int(math.ceil(gamma * len(scores))))
+        observed = np.asarray(rows)
+        good, bad = observed[order[:n_good]], observed[order[n_good:]]
+
+        # Draw candidates from the good mixture, one dimension at a time.
+        draws = np.empty((n_candidates, len(space.sizes)), dtype=int)
+        for d, size in enumerate(space.sizes):
+            kernel = _discrete_kernel(size, len(good))
+            centers = good[rng.integers(len(good), size=n_candidates), d]
+            use_prior = rng.random(n_candidates) < prior_weight / (len(good) + prior_weight)
+            for c in range(n_candidates):
+                p = np.full(size, 1.0 / size) if use_prior[c] else kernel[centers[c]]
+                draws[c, d] = rng.choice(size, p=p)
+
+        candidates = [index_of.get(tuple(row)) for row in draws]
+        fresh = sorted({i for i in candidates if i is not None and i not in seen})
+        if not fresh:
+            unseen = np.setdiff1d(np.arange(len(space)), list(seen))
+            evaluate(int(rng.choice(unseen)))
+            continue
+
+        cand_rows = space.indices[fresh]
+        ratio = _parzen_log_density(cand_rows, good, space.sizes, prior_weight)
+        if len(bad):
+            ratio = ratio - _parzen_log_density(cand_rows, bad, space.sizes, prior_weight)
+        evaluate(fresh[int(np.argmax(ratio))])
+
+
+SEARCH_STRATEGIES = {
+    "grid": grid_strategy,
+    "random": random_strategy,
+    "halving": halving_strategy,
+    "tpe": tpe_strategy,
+}
+
+
+def run_search(
+    strategy: str,
+    space: SearchSpace,
+    objective: Objective,
+    budget: Optional[int] = None,
+    seed: int = 0,
+    **options,
+) -> SearchResult:
+    """Run ``strategy`` on ``space`` with at most ``budget`` objective calls.
+
+    ``budget`` defaults to the size of the space. ``options`` go to the
+    strategy (e.g. ``eta`` for halving, ``gamma`` for tpe). The best point
+    is the highest score among full-fidelity evaluations.
+    """
+    if strategy not in SEARCH_STRATEGIES:
+        raise ValueError(f"Unknown search strategy {strategy!r}; expected one of {sorted(SEARCH_STRATEGIES)}")
+    budget = len(space) if budget is None else budget
+    if budget < 1:
+        raise ValueError("budget must be at least 1")
+
+    recorder = _Recorder(objective, budget)
+    SEARCH_STRATEGIES[strategy](space, recorder, np.random.default_rng(seed), **options)
+    return _result(strategy, recorder)
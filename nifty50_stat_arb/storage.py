@@ -0,0 +1,144 @@
+"""
+On-disk storage backends for date-indexed price and return tables.
+
+The backend is picked from the file extension:
+
+- ``.csv``      plain text, the original format (also used for unknown extensions)
+- ``.parquet``  columnar binary via pandas/pyarrow
+- ``.feather``  Arrow IPC via pandas/pyarrow
+- ``.npy``      raw float matrix plus ``<stem>.index.npy`` (dates) and
+                ``<stem>.columns.npy`` (symbols) side files; can be loaded
+                memory-mapped so several worker processes share one copy
+
+Parquet and Feather need ``pyarrow`` installed; CSV and NPY only need numpy
+and pandas.
+
+Every file is written to a temporary path and moved into place with
+``os.replace``, so a reader (possibly memory-mapping the old file) never
+sees a partially written one. The three ``.npy`` files are each replaced
+atomically (side files first, the matrix last); a reader racing a rewrite
+gets a shape mismatch error rather than silently misaligned data.
+"""
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# Preference order used when looking up an existing table by its stem.
+SUPPORTED_EXTENSIONS = (".npy", ".parquet", ".feather", ".csv")
+
+
+def _extension(path: str) -> str:
+    return os.path.splitext(path)[1].lower()
+
+
+def _npy_side_paths(path: str) -> tuple[str, str]:
+    stem = os.path.splitext(path)[0]
+    return f"{stem}.index.npy", f"{stem}.columns.npy"
+
+
+def _tmp_path(path: str) -> str:
+    # Keep the extension last: np.save appends ".npy" to names without it.
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{os.getpid()}.tmp{ext}"
+
+
+def write_frame(frame: pd.DataFrame, path: str) -> None:
+    """Write a date-indexed table using the backend implied by ``path``."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    ext = _extension(path)
+    if ext == ".npy":
+        index_path, columns_path = _npy_side_paths(path)
+        pieces = [
+            (index_path, frame.index.to_numpy(dtype="datetime64[ns]")),
+            (columns_path, np.asarray(frame.columns, dtype=str)),
+            (path, np.ascontiguousarray(frame.to_numpy(dtype=float))),
+        ]
+        for target, array in pieces:
+            np.save(_tmp_path(target), array)
+        for target, _ in pieces:
+            os.replace(_tmp_path(target), target)
+        return
+
+    tmp_path = _tmp_path(path)
+    if ext == ".parquet":
+        frame.to_parquet(tmp_path)
+    elif ext == ".feather":
+        frame.rename_axis("date").reset_index().to_feather(tmp_path)
+    else:
+        frame.to_csv(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def read_frame(path: str, mmap: bool = False) -> pd.DataFrame:
+    """Read a date-indexed table written by :func:`write_frame`, sorted by date.
+
+    With ``mmap=True`` an ``.npy`` matrix is memory-mapped read-only instead of
+    loaded into private memory; other formats ignore the flag.
+    """
+    ext = _extension(path)
+    if ext == ".parquet":
+        frame = pd.read_parquet(path)
+    elif ext == ".feather":
+        frame = pd.read_feather(path)
+        frame = frame.set_index(frame.columns[0]).rename_axis(None)
+    elif ext == ".npy":
+        index_path, columns_path = _npy_side_paths(path)
+        values = np.load(path, mmap_mode="r" if mmap else None)
+        frame = pd.DataFrame(
+            values,
+            index=pd.DatetimeIndex(np.load(index_path)),
+            columns=np.load(columns_path).tolist(),
+            copy=False,
+        )
+    else:
+        frame = pd.read_csv(path, index_col=0, parse_dates=True)
+
+    if not frame.index.is_monotonic_increasing:
+        frame = frame.sort_index()
+    return frame
+
+
+def read_frame_labels(path: str) -> tuple[pd.DatetimeIndex, list]:
+    """Sorted dates and column names of a stored table.
+
+    For ``.npy`` only the small side files are read, not the matrix.
+    """
+    if _extension(path) == ".npy":
+        index_path, columns_path = _npy_side_paths(path)
+        return pd.DatetimeIndex(np.load(index_path)).sort_values(), np.load(columns_path).tolist()
+    frame = read_frame(path)
+    return frame.index, list(frame.columns)
+
+
+def append_frame(frame: pd.DataFrame, path: str) -> None:
+    """Append rows to an existing table; CSV appends in place, others are rewritten."""
+    if not os.path.exists(path):
+        write_frame(frame, path)
+        return
+
+    if _extension(path) in (".parquet", ".feather", ".npy"):
+        existing = read_frame(path)
+        write_frame(pd.concat([existing, frame]), path)
+    else:
+        frame.to_csv(path, mode="a", header=False)
+
+
+def find_frame(stem: str) -> str:
+    """Return the first existing ``stem + ext`` in :data:`SUPPORTED_EXTENSIONS` order.
+
+    Falls back to ``stem + ".csv"`` when nothing exists yet, so callers can keep
+    reporting the conventional CSV path.
+    """
+    for ext in SUPPORTED_EXTENSIONS:
+        candidate = stem + ext
+        if os.path.exists(candidate):
+            return candidate
+    return stem + ".csv"
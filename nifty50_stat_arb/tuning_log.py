@@ -0,0 +1,145 @@
+"""
+Append-only, resumable log of tuning evaluations.
+
+Every evaluated configuration is written as one JSON line as soon as its
+score is known, keyed by a hash of everything the score depends on: the
+index, a fingerprint of its returns data, the parameters (thresholds plus
+every backtest setting that changes a score), the validation fidelity, the
+precision, the metric and a version of the scoring code. When an index
+finishes, a ``result`` record with its summary row and all its evaluations
+is appended as well.
+
+A resumed run (``resume=True``) opens the same file, serves logged scores
+instead of recomputing them and skips indices whose ``result`` is already
+there, so an interrupted run continues where it stopped. ``results_from_log``
+rebuilds the ``tuning_results.csv`` table (and the evaluation table) from the
+file alone.
+
+Each record goes out in a single ``os.write`` on an ``O_APPEND`` descriptor,
+so it reaches the OS as soon as it is produced and lines from parallel
+worker processes do not interleave. A line cut short by a crash is ignored
+on the next load (and terminated, so later records start on a fresh line).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+def data_fingerprint(returns: pd.DataFrame) -> str:
+    """Hex digest of a returns matrix: values, dates and column names."""
+    digest = hashlib.sha1(np.ascontiguousarray(returns.to_numpy(dtype=float)).tobytes())
+    digest.update(returns.index.asi8.tobytes())
+    digest.update("\x1f".join(map(str, returns.columns)).encode())
+    return digest.hexdigest()
+
+
+def _to_builtin(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(obj, sort_keys: bool = False) -> str:
+    return json.dumps(obj, sort_keys=sort_keys, default=_to_builtin)
+
+
+def record_key(**fields) -> str:
+    """Stable key for a record: SHA-1 of the fields as sorted JSON."""
+    return hashlib.sha1(_dumps(fields, sort_keys=True).encode()).hexdigest()
+
+
+class EvaluationLog:
+    """JSON-lines evaluation log; lookups are served from an in-memory index of the file.
+
+    Existing records are only loaded with ``resume=True``; otherwise they
+    are kept in the file but never served, and new records are appended.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        self._records: dict[str, dict] = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if resume:
+            for record in read_log(path):
+                self._records[record["key"]] = record
+        self.loaded = len(self._records)
+        self._terminate_partial_line()
+
+    def _terminate_partial_line(self) -> None:
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, "rb") as fh:
+            fh.seek(-1, os.SEEK_END)
+            if fh.read(1) == b"\n":
+                return
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, b"\n")
+        finally:
+            os.close(fd)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def lookup(self, key: str) -> Optional[dict]:
+        return self._records.get(key)
+
+    def append(self, record: dict) -> None:
+        """Write ``record`` (which must carry a ``key``) and make it visible to ``lookup``."""
+        line = (_dumps(record) + "\n").encode()
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+        self._records[record["key"]] = record
+
+
+def read_log(path: str) -> list[dict]:
+    """All complete records in ``path``, in file order (missing file = no records)."""
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path) as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:  # partial line from an interrupted write
+                continue
+            if isinstance(record, dict) and "key" in record:
+                records.append(record)
+    return records
+
+
+def results_from_log(path: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """``(results, evaluations)`` tables rebuilt from the ``result`` records of a log.
+
+    ``results`` has one row per index (its latest result, indexed by index
+    name) with the same columns ``tune_hyperparams`` writes to
+    ``tuning_results.csv``; ``evaluations`` has every evaluation of those runs.
+    """
+    latest: dict[str, dict] = {}
+    for record in read_log(path):
+        if record.get("kind") == "result":
+            latest.pop(record["index"], None)  # rows in the order their latest runs finished
+            latest[record["index"]] = record
+
+    rows = [record["row"] for record in latest.values()]
+    evaluations = [
+        {"index": name, **evaluation}
+        for name, record in latest.items()
+        for evaluation in record.get("evaluations", [])
+    ]
+    results = pd.DataFrame(rows)
+    if not results.empty:
+        results = results.set_index("index")
+    return results, pd.DataFrame(evaluations)
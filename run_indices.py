@@ -8,20 +8,31 @@ Usage:
     python run_indices.py --index nifty_bank nifty_it          # subset only
     python run_indices.py --refresh-cache                      # re-download prices
     python run_indices.py --capital 500000                     # ₹5L starting capital
+    python run_indices.py --download-workers 16                # faster cold fetch
+    python run_indices.py --workers 4                          # 4 indices at once
+    python run_indices.py --pca-cache-dir                      # keep PCA fits on disk
+    python run_indices.py --profile data/run_profile.json      # per-stage timings
 """
 
 from __future__ import annotations
 
 import argparse
+import contextlib
 import os
 import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, PROJECT_ROOT)
 
+from nifty50_stat_arb import instrumentation
+from nifty50_stat_arb.data_fetcher import DataFetcher, PriceStore
+from nifty50_stat_arb.pca_cache import DEFAULT_PCA_CACHE_DIR
 from nifty50_stat_arb.pipeline import PipelineConfig, run_pipeline
 
 SYMBOLS_DIR = os.path.join(PROJECT_ROOT, "data", "symbols")
+SHARED_DIR = os.path.join(PROJECT_ROOT, "data", "shared")
 
 # ---------------------------------------------------------------------------
 # Index registry
@@ -47,6 +58,11 @@ def build_config(
     end_date: str | None,
     period: str,
     capital: float,
+    download_workers: int = 1,
+    download_retries: int = 0,
+    cache_format: str = "csv",
+    price_store_path: str | None = None,
+    pca_cache_dir: str | None = None,
 ) -> PipelineConfig:
     return PipelineConfig(
         index_name=index_name,
@@ -55,9 +71,99 @@ def build_config(
         end_date=end_date,
         period=period,
         initial_capital=capital,
+        download_workers=download_workers,
+        download_retries=download_retries,
+        cache_format=cache_format,
+        price_store_path=price_store_path,
+        pca_cache_dir=pca_cache_dir,
     )
 
 
+def build_price_store(
+    selected: list[tuple[str, str]],
+    store_path: str,
+    start_date: str | None,
+    end_date: str | None,
+    period: str,
+    refresh_cache: bool,
+    download_workers: int,
+    download_retries: int,
+) -> None:
+    """Download the union of all selected symbol lists once into a shared store.
+
+    Only symbols and date ranges not already in the store on disk are
+    fetched (stored symbols are extended up to ``end_date``; in period mode
+    only once the store is behind the last completed business day, and the
+    store is trimmed to the period); each pipeline then slices its columns
+    from it, including period-mode runs with an existing per-index cache.
+    """
+    union: list[str] = []
+    for _, symbols_file in selected:
+        union.extend(DataFetcher.load_symbols_from_file(os.path.join(SYMBOLS_DIR, symbols_file)))
+    union = list(dict.fromkeys(union))
+
+    if os.path.exists(store_path) and not refresh_cache:
+        store = PriceStore.load(store_path)
+    else:
+        store = PriceStore()
+
+    print(f"Shared price store: {len(union)} unique symbols across {len(selected)} indices")
+    fetcher = DataFetcher(symbols=union, max_workers=download_workers, max_retries=download_retries)
+    store.populate(fetcher, union, start_date=start_date, end_date=end_date, period=period)
+    if not store.prices.empty:
+        store.save(store_path)
+
+
+def _run_index_worker(
+    cfg: PipelineConfig,
+    refresh_cache: bool,
+    profile: bool = False,
+) -> tuple[str, str | None, list[instrumentation.SpanRecord]]:
+    """Process-pool entry point: run one index with stdout/stderr sent to its log.
+
+    Plotting uses the Agg backend (set in eigenvalue_plotting) and every figure
+    is created and closed inside the worker, so no figure state is shared.
+    Returns the index name, an error message (None on success) and, with
+    ``profile``, the worker's instrumentation spans.
+    """
+    os.makedirs(cfg.data_dir, exist_ok=True)
+    recorder = instrumentation.enable() if profile else None
+    error = None
+    with open(cfg.log_path, "w") as log, contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            run_pipeline(cfg, refresh_cache=refresh_cache)
+        except Exception as exc:
+            traceback.print_exc()
+            error = str(exc)
+    instrumentation.disable()
+    return cfg.index_name, error, recorder.records if recorder else []
+
+
+def run_parallel(
+    configs: list[PipelineConfig],
+    refresh_cache: bool,
+    workers: int,
+) -> list[str]:
+    """Run pipelines in a process pool; return the names that failed, in input order."""
+    errors: dict[str, str | None] = {}
+    recorder = instrumentation.get_recorder()
+    with ProcessPoolExecutor(max_workers=min(workers, len(configs))) as pool:
+        futures = [
+            pool.submit(_run_index_worker, cfg, refresh_cache, recorder is not None)
+            for cfg in configs
+        ]
+        log_paths = {cfg.index_name: cfg.log_path for cfg in configs}
+        for done, future in enumerate(as_completed(futures), start=1):
+            index_name, error, records = future.result()
+            errors[index_name] = error
+            if recorder is not None:
+                recorder.extend(records)
+            status = "OK" if error is None else f"ERROR: {error}"
+            print(f"[{done}/{len(configs)}] {index_name}: {status} (log: {log_paths[index_name]})")
+
+    return [cfg.index_name for cfg in configs if errors.get(cfg.index_name) is not None]
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Run the PCA stat-arb pipeline for multiple Nifty sector indices."
@@ -94,14 +200,73 @@ def main() -> None:
         action="store_true",
         help="Force re-download of price data even if a cache exists.",
     )
+    parser.add_argument(
+        "--download-workers",
+        type=int,
+        default=8,
+        help="Symbols downloaded concurrently per index (default: 8, 1 = serial).",
+    )
+    parser.add_argument(
+        "--download-retries",
+        type=int,
+        default=2,
+        help="Extra download attempts per symbol, with exponential backoff (default: 2).",
+    )
+    parser.add_argument(
+        "--cache-format",
+        choices=["csv", "parquet", "feather", "npy"],
+        default="csv",
+        help="On-disk format for price and returns caches (default: csv).",
+    )
+    parser.add_argument(
+        "--pca-cache-dir",
+        nargs="?",
+        const=DEFAULT_PCA_CACHE_DIR,
+        default=None,
+        metavar="DIR",
+        help=(
+            "Persist PCA fits to DIR (default when given without a value: "
+            "data/pca_cache) so reruns on unchanged data skip them. Default: memory only."
+        ),
+    )
+    parser.add_argument(
+        "--no-shared-store",
+        action="store_true",
+        help=(
+            "Download each index's symbols separately instead of fetching the "
+            "union of all selected indices once into data/shared/."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Run this many indices in parallel processes (default: 1). "
+            "Each index logs to data/<index>/pipeline.log."
+        ),
+    )
     parser.add_argument(
         "--capital",
         type=float,
         default=1_000_000.0,
         help="Starting capital in rupees for the PnL overlay (default: ₹10,00,000).",
     )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Record wall time, CPU time and peak RSS per stage and index, print "
+            "a summary table and save the spans to PATH (.json or .csv)."
+        ),
+    )
     args = parser.parse_args()
 
+    if args.profile:
+        instrumentation.enable()
+
     # Filter to requested indices
     selected = ALL_INDICES
     if args.index:
@@ -113,21 +278,53 @@ def main() -> None:
 
     print(f"Running pipeline for {len(selected)} index/indices: {[n for n, _ in selected]}")
 
-    failed: list[str] = []
-    for index_name, symbols_file in selected:
-        cfg = build_config(
+    store_path = None
+    if not args.no_shared_store:
+        store_path = os.path.join(SHARED_DIR, f"raw_prices.{args.cache_format}")
+        build_price_store(
+            selected,
+            store_path,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            period=args.period,
+            refresh_cache=args.refresh_cache,
+            download_workers=args.download_workers,
+            download_retries=args.download_retries,
+        )
+
+    configs = [
+        build_config(
             index_name=index_name,
             symbols_filename=symbols_file,
             start_date=args.start_date,
             end_date=args.end_date,
             period=args.period,
             capital=args.capital,
+            download_workers=args.download_workers,
+            download_retries=args.download_retries,
+            cache_format=args.cache_format,
+            price_store_path=store_path,
+            pca_cache_dir=args.pca_cache_dir,
         )
-        try:
-            run_pipeline(cfg, refresh_cache=args.refresh_cache)
-        except Exception as exc:
-            print(f"\n[ERROR] {index_name}: {exc}")
-            failed.append(index_name)
+        for index_name, symbols_file in selected
+    ]
+
+    failed: list[str] = []
+    if args.workers > 1 and len(configs) > 1:
+        failed = run_parallel(configs, refresh_cache=args.refresh_cache, workers=args.workers)
+    else:
+        for cfg in configs:
+            try:
+                run_pipeline(cfg, refresh_cache=args.refresh_cache)
+            except Exception as exc:
+                print(f"\n[ERROR] {cfg.index_name}: {exc}")
+                failed.append(cfg.index_name)
+
+    recorder = instrumentation.disable()
+    if recorder is not None:
+        print(f"\nStage timings:\n{recorder.format_table()}")
+        recorder.write(args.profile)
+        print(f"Run report -> {args.profile}")
 
     print(f"\n{'='*60}")
     if failed:
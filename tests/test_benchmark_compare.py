@@ -0,0 +1,85 @@
+"""Tests for the ``benchmarks.compare`` regression gate."""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.compare import MIN_REPEATS, compare_results
+
+
+def _payload(median_s: float, repeats: int, seed: int, references: bool = True) -> dict:
+    rng = np.random.default_rng(seed)
+    times = median_s * (1.0 + 0.05 * rng.standard_normal(repeats))
+    record = {"function": "compute_pca", "n_assets": 50, "years": 5, "times_s": times.tolist()}
+    if references:
+        record["reference_s"] = (0.003 * (1.0 + 0.05 * rng.standard_normal(repeats))).tolist()
+    return {"meta": {"repeats": repeats}, "results": [record]}
+
+
+def _status(baseline: dict, candidate: dict) -> str:
+    return compare_results(baseline, candidate)["status"].iloc[0]
+
+
+def test_clear_slowdown_is_a_regression():
+    assert _status(_payload(0.100, MIN_REPEATS, 0), _payload(0.200, MIN_REPEATS, 1)) == "REGRESSION"
+
+
+def test_clear_speedup_is_an_improvement():
+    assert _status(_payload(0.200, MIN_REPEATS, 0), _payload(0.100, MIN_REPEATS, 1)) == "improvement"
+
+
+def test_too_few_repeats_never_gates():
+    assert _status(_payload(0.100, MIN_REPEATS - 1, 0), _payload(0.200, MIN_REPEATS - 1, 1)) == "too few repeats"
+
+
+def test_same_distribution_is_ok():
+    assert _status(_payload(0.100, 15, 0), _payload(0.100, 15, 1)) == "ok"
+
+
+def test_slowdown_below_size_scaled_floor_is_ok():
+    # 20% of 2 ms is 0.4 ms, under the 0.5 * sqrt(2) ms floor.
+    assert _status(_payload(0.002, 15, 0), _payload(0.0024, 15, 1)) == "ok"
+
+
+def test_references_cancel_machine_drift():
+    baseline = _payload(0.100, MIN_REPEATS, 0)
+    candidate = _payload(0.100, MIN_REPEATS, 1)
+    record = candidate["results"][0]
+    record["times_s"] = [t * 1.5 for t in record["times_s"]]
+    record["reference_s"] = [r * 1.5 for r in record["reference_s"]]
+    assert _status(baseline, candidate) == "ok"
+    del record["reference_s"]
+    assert _status(baseline, candidate) == "REGRESSION"
+
+
+def test_missing_case():
+    baseline = _payload(0.100, MIN_REPEATS, 0)
+    candidate = {"meta": {}, "results": []}
+    assert _status(baseline, candidate) == "missing"
+
+
+@pytest.mark.skipif(
+    not os.environ.get("RUN_BENCHMARKS"),
+    reason="wall-clock check; set RUN_BENCHMARKS=1 (e.g. in a benchmark job) to run",
+)
+def test_rerun_of_same_tree_passes(tmp_path):
+    """Timing the same tree twice (suite, then compare's rerun) must not gate."""
+    baseline = tmp_path / "base.json"
+    suite = [
+        sys.executable, "-m", "benchmarks.suite",
+        "--assets", "10", "30", "--years", "1", "--output", str(baseline),
+    ]
+    subprocess.run(suite, cwd=PROJECT_ROOT, check=True, capture_output=True)
+    gate = subprocess.run(
+        [sys.executable, "-m", "benchmarks.compare", str(baseline)],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert gate.returncode == 0, gate.stdout + gate.stderr
@@ -0,0 +1,66 @@
+"""Tests for the streaming Ledoit-Wolf estimator against ``sklearn.covariance.LedoitWolf``."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+from sklearn.covariance import LedoitWolf
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from nifty50_stat_arb.covariance import StreamingLedoitWolf, rolling_ledoit_wolf
+
+
+def _returns(n_rows=300, n_assets=12, seed=0):
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0004, 0.01, (n_rows, 1))
+    return market * rng.uniform(0.5, 1.5, n_assets) + rng.normal(0.0, 0.008, (n_rows, n_assets))
+
+
+def _assert_matches_sklearn(covariance, shrinkage, window):
+    reference = LedoitWolf().fit(window)
+    np.testing.assert_allclose(covariance, reference.covariance_, rtol=1e-9, atol=1e-15)
+    assert shrinkage == pytest.approx(reference.shrinkage_, rel=1e-9)
+
+
+def test_add_remove_matches_refit_on_each_window():
+    returns = _returns()
+    window = 60
+    estimator = StreamingLedoitWolf(returns.shape[1])
+    for row in returns[:window]:
+        estimator.add(row)
+
+    for end in range(window, 120):
+        _assert_matches_sklearn(*estimator.covariance(), returns[end - window:end])
+        estimator.slide(returns[end], returns[end - window])
+
+
+def test_from_window_matches_incremental_build():
+    returns = _returns()[:80]
+    incremental = StreamingLedoitWolf(returns.shape[1])
+    for row in returns:
+        incremental.add(row)
+
+    batched, batched_shrinkage = StreamingLedoitWolf.from_window(returns).covariance()
+    streamed, streamed_shrinkage = incremental.covariance()
+    np.testing.assert_allclose(batched, streamed, rtol=1e-12, atol=1e-18)
+    assert batched_shrinkage == pytest.approx(streamed_shrinkage, rel=1e-12)
+
+
+@pytest.mark.parametrize("step", [1, 5])
+def test_rolling_ledoit_wolf_matches_sklearn(step):
+    returns = _returns()
+    window = 50
+    ends = []
+    for end, covariance, shrinkage in rolling_ledoit_wolf(returns, window, step=step, refresh_every=40):
+        _assert_matches_sklearn(covariance, shrinkage, returns[end - window:end])
+        ends.append(end)
+
+    assert ends == list(range(window, len(returns) + 1, step))
+
+
+def test_remove_from_empty_window_raises():
+    with pytest.raises(ValueError):
+        StreamingLedoitWolf(3).remove(np.zeros(3))
@@ -0,0 +1,55 @@
+"""Tests for ``nifty50_stat_arb.instrumentation`` spans."""
+
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from nifty50_stat_arb import instrumentation
+
+
+@pytest.fixture
+def recorder():
+    yield instrumentation.enable()
+    instrumentation.disable()
+
+
+def test_nesting_is_tracked_per_thread(recorder):
+    barrier = threading.Barrier(4)
+
+    def work(name):
+        with instrumentation.span("outer", index=name):
+            barrier.wait()
+            with instrumentation.span("inner"):
+                barrier.wait()
+
+    threads = [threading.Thread(target=work, args=(f"idx{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    frame = recorder.to_frame()
+    inner = frame[frame["stage"] == "inner"]
+    assert sorted(inner["index"]) == [f"idx{i}" for i in range(4)]
+    assert (inner["depth"] == 1).all()
+    assert (frame.loc[frame["stage"] == "outer", "depth"] == 0).all()
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs procfs")
+def test_rss_delta_is_per_stage(recorder):
+    with instrumentation.span("allocate"):
+        kept = np.ones(64 * 2**20 // 8)  # 64 MiB, touched
+    with instrumentation.span("idle"):
+        pass
+
+    frame = recorder.to_frame().set_index("stage")
+    assert frame.loc["allocate", "rss_delta_mb"] > 50
+    assert abs(frame.loc["idle", "rss_delta_mb"]) < 5
+    assert frame.loc["idle", "rss_mb"] > 50
+    del kept
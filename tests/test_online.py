@@ -0,0 +1,89 @@
+"""Tests for ``nifty50_stat_arb.online`` against the block backtest's signals and positions."""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.synthetic import synthetic_returns
+from nifty50_stat_arb.online import OnlineResidualSignal, replay_positions
+from nifty50_stat_arb.pca_backtest import (
+    BacktestConfig,
+    _get_refit_trade_blocks,
+    compute_block_betas,
+    compute_block_signals,
+    simulate_positions,
+)
+
+
+def _config(lookback, entry_z, exit_z):
+    # On synthetic_returns 0.99 keeps every component, leaving residuals of
+    # pure rounding noise; 0.6 leaves a real idiosyncratic part.
+    return BacktestConfig(
+        variance_threshold=0.6,
+        lookback=lookback,
+        long_entry_z=-entry_z,
+        short_entry_z=entry_z,
+        long_exit_z=exit_z,
+        short_exit_z=-exit_z,
+    )
+
+
+@pytest.mark.parametrize("lookback, entry_z, exit_z", [(60, 1.5, 0.0), (20, 2.0, 0.5)])
+def test_replay_matches_backtest_positions(lookback, entry_z, exit_z):
+    returns = synthetic_returns(1500, 30, seed=1)
+    config = _config(lookback, entry_z, exit_z)
+
+    signals = compute_block_signals(returns, config)
+    expected = pd.concat([
+        pd.DataFrame(
+            simulate_positions(s.zscores.to_numpy(), config),
+            index=s.zscores.index,
+            columns=s.zscores.columns,
+        )
+        for s in signals
+    ])
+    replayed = replay_positions(returns, config)
+
+    assert len(signals) > 1 and expected.to_numpy().any()
+    assert (replayed.index == expected.index).all()
+    np.testing.assert_array_equal(replayed[expected.columns].to_numpy(), expected.to_numpy())
+
+
+def test_update_zscores_match_block_zscores():
+    returns = synthetic_returns(1000, 20, seed=2)
+    config = _config(40, 1.5, 0.0)
+    blocks = _get_refit_trade_blocks(returns.index, config.refit_months, config.trade_months)
+    signal = compute_block_signals(returns, config)[0]
+    fit_dates, _ = blocks[signal.block_num - 1]
+    betas = compute_block_betas(returns, config)[signal.block_num - 1]
+
+    engine = OnlineResidualSignal(betas, config)
+    engine.warm_up(returns.loc[fit_dates, engine.assets].to_numpy())
+    trade_rows = returns.loc[signal.zscores.index, engine.assets].to_numpy()
+    zscores = np.array([engine.update(row)[0] for row in trade_rows])
+
+    np.testing.assert_allclose(zscores, signal.zscores[engine.assets].to_numpy(), rtol=1e-12, atol=1e-12)
+
+
+def test_update_reports_position_changes():
+    returns = synthetic_returns(400, 10, seed=3)
+    config = _config(20, 1.0, 0.0)
+    betas = compute_block_betas(returns, config)[0]
+    engine = OnlineResidualSignal(betas, config)
+    engine.warm_up(returns.iloc[:120].to_numpy())
+
+    previous = engine.positions.copy()
+    for row in returns.iloc[120:200].to_numpy():
+        _, changes = engine.update(row)
+        np.testing.assert_array_equal(changes, engine.positions - previous)
+        previous = engine.positions.copy()
+    assert np.abs(previous).sum() > 0
+
+    engine.reset_positions()
+    assert not engine.positions.any()
@@ -0,0 +1,86 @@
+"""Tests for the shared ``PriceStore`` in period mode (offline, fake downloader)."""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from nifty50_stat_arb.data_fetcher import DataFetcher, PriceStore, last_completed_business_day
+
+SYMBOLS = [f"S{i}" for i in range(6)]
+
+
+class FakeMarket:
+    """``yf.download`` stand-in serving synthetic closes up to ``visible_end``."""
+
+    def __init__(self, lag_days: int = 0):
+        end = last_completed_business_day()
+        index = pd.bdate_range(end - pd.DateOffset(years=3), end)
+        rng = np.random.default_rng(0)
+        steps = rng.normal(0.0, 0.01, (len(index), len(SYMBOLS)))
+        self.prices = pd.DataFrame(np.exp(np.cumsum(steps, axis=0)), index=index, columns=SYMBOLS)
+        self.visible_end = end - pd.offsets.BDay(lag_days)
+        self.calls = []
+
+    def __call__(self, symbol, start=None, end=None, period=None, progress=False):
+        self.calls.append(symbol)
+        series = self.prices[symbol].loc[:self.visible_end]
+        if start:
+            series = series.loc[(series.index >= pd.Timestamp(start)) & (series.index < pd.Timestamp(end))]
+        else:
+            series = series.loc[series.index >= self.visible_end - pd.DateOffset(years=int(period[:-1]))]
+        return pd.DataFrame({"Close": series})
+
+
+def _populate(market, store):
+    store.populate(DataFetcher(symbols=SYMBOLS, downloader=market), SYMBOLS, period="1y")
+    return store
+
+
+def _fetch(market, store, tmp_path):
+    fetcher = DataFetcher(symbols=SYMBOLS[:4], downloader=market, price_store=store)
+    return fetcher.fetch_data(
+        period="1y",
+        cache_path=str(tmp_path / "prices.npy"),
+        returns_cache_path=str(tmp_path / "returns.npy"),
+    )
+
+
+def test_fresh_store_is_reused_without_downloads(tmp_path):
+    market = FakeMarket()
+    store = _populate(market, PriceStore())
+    _fetch(market, store, tmp_path)
+    market.calls.clear()
+
+    _populate(market, store)
+    _fetch(market, store, tmp_path)
+    assert market.calls == []
+
+
+def test_stale_cache_is_extended_from_the_store(tmp_path):
+    market = FakeMarket(lag_days=3)
+    store = _populate(market, PriceStore())
+    stale = _fetch(market, store, tmp_path)
+
+    market.visible_end = last_completed_business_day()
+    _populate(market, store)
+    market.calls.clear()
+    prices = _fetch(market, store, tmp_path)
+
+    assert market.calls == []
+    assert prices.index[-1] == market.visible_end > stale.index[-1]
+    expected = DataFetcher(symbols=SYMBOLS[:4], downloader=market).fetch_data(period="1y")
+    assert prices.index.equals(expected.index)
+    np.testing.assert_array_equal(prices.to_numpy(), expected.to_numpy())
+
+
+def test_store_is_trimmed_to_the_period():
+    market = FakeMarket()
+    store = PriceStore(market.prices.copy())
+    _populate(market, store)
+    assert store.prices.index[0] >= last_completed_business_day() - pd.DateOffset(years=1)
+    assert store.prices.index[-1] == market.visible_end
@@ -0,0 +1,58 @@
+"""Tests for ``nifty50_stat_arb.rolling`` against ``DataFrame.rolling().std()``."""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from nifty50_stat_arb.rolling import RollingMoments, rolling_std, rolling_std_windows
+
+
+def _long_series(n_rows: int = 6000, n_columns: int = 6) -> np.ndarray:
+    """Large mean, volatility shifting by 1000x, a few NaNs."""
+    rng = np.random.default_rng(0)
+    scale = np.repeat([1e-2, 1e-5, 1.0, 1e-4], n_rows // 4)[:, None]
+    values = 1e4 + scale * rng.standard_normal((n_rows, n_columns))
+    values[rng.integers(0, n_rows, 20), rng.integers(0, n_columns, 20)] = np.nan
+    return values
+
+
+def _pandas_std(values: np.ndarray, window: int) -> np.ndarray:
+    std = pd.DataFrame(values).rolling(window).std().to_numpy()
+    return np.where(std > 0, std, np.nan)
+
+
+def test_long_series_matches_pandas_exactly():
+    values = _long_series()
+    for window in (20, 60):
+        np.testing.assert_array_equal(rolling_std(values, window), _pandas_std(values, window))
+
+
+def test_segments_match_rolling_each_on_its_own():
+    values = _long_series()
+    starts = [0, 700, 1900, 2000, 4500]
+    stacked = rolling_std_windows(values, [20, 60], segment_starts=starts)
+    for window, std in zip((20, 60), stacked):
+        for start, end in zip(starts, starts[1:] + [len(values)]):
+            np.testing.assert_array_equal(std[start:end], _pandas_std(values[start:end], window))
+
+
+def test_streaming_matches_batch():
+    values = _long_series(1500)
+    moments = RollingMoments(60, values.shape[1])
+    streamed = np.empty_like(values)
+    for i, row in enumerate(values):
+        moments.push(row)
+        streamed[i] = moments.std()
+    np.testing.assert_array_equal(streamed, _pandas_std(values, 60))
+
+
+def test_zero_variance_window_is_nan():
+    values = np.concatenate([np.random.default_rng(1).standard_normal(50), np.full(50, 3.0)])
+    std = rolling_std(values, 20, segment_starts=[0, 10])
+    assert np.isnan(std[-1])
+    assert np.isfinite(std[40])
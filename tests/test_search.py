@@ -0,0 +1,115 @@
+"""Tests for the budgeted search strategies in ``nifty50_stat_arb.search``."""
+
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from nifty50_stat_arb.search import SEARCH_STRATEGIES, SearchSpace, run_search
+
+ENTRY = [round(1.0 + 0.1 * i, 1) for i in range(21)]
+EXIT = [round(-0.5 + 0.1 * i, 1) for i in range(21)]
+OPTIMUM = {"entry_z": 2.2, "exit_z": 0.3}
+
+
+def _space():
+    return SearchSpace({"entry_z": ENTRY, "exit_z": EXIT}, constraint=lambda p: p["exit_z"] < p["entry_z"])
+
+
+def _objective(params, fidelity):
+    """Smooth bowl peaking at OPTIMUM; lower fidelity adds a fixed bias."""
+    distance = (params["entry_z"] - OPTIMUM["entry_z"]) ** 2 + (params["exit_z"] - OPTIMUM["exit_z"]) ** 2
+    return -distance - (1.0 - fidelity)
+
+
+@pytest.mark.parametrize("strategy", sorted(SEARCH_STRATEGIES))
+def test_budget_constraint_and_reproducibility(strategy):
+    space = _space()
+    result = run_search(strategy, space, _objective, budget=40, seed=3)
+    again = run_search(strategy, space, _objective, budget=40, seed=3)
+
+    assert 0 < len(result.evaluations) <= 40
+    assert [e.order for e in result.evaluations] == list(range(len(result.evaluations)))
+    assert all(space.is_valid(e.params) for e in result.evaluations)
+    assert [(e.params, e.fidelity, e.score) for e in result.evaluations] == [
+        (e.params, e.fidelity, e.score) for e in again.evaluations
+    ]
+
+    full = [e for e in result.evaluations if e.fidelity >= 1.0]
+    assert result.best_score == max(e.score for e in full)
+    assert _objective(result.best_params, 1.0) == result.best_score
+    assert len(result.to_frame()) == len(result.evaluations)
+
+
+def test_grid_covers_the_space_and_finds_the_optimum():
+    space = _space()
+    result = run_search("grid", space, _objective)
+
+    assert len(result.evaluations) == len(space)
+    assert result.best_params == OPTIMUM
+
+
+def test_grid_with_a_small_budget_is_strided():
+    result = run_search("grid", _space(), _objective, budget=10)
+    assert len(result.evaluations) == 10
+    assert len({tuple(e.params.values()) for e in result.evaluations}) == 10
+
+
+@pytest.mark.parametrize("strategy", ["random", "tpe"])
+def test_points_are_never_repeated(strategy):
+    result = run_search(strategy, _space(), _objective, budget=60, seed=0)
+    points = [tuple(e.params.values()) for e in result.evaluations]
+    assert len(points) == len(set(points)) == 60
+
+
+def test_halving_promotes_the_best_of_each_rung():
+    result = run_search("halving", _space(), _objective, budget=60, seed=0)
+    rungs = sorted({e.rung for e in result.evaluations})
+    assert rungs == list(range(len(rungs))) and len(rungs) > 1
+
+    for rung in rungs[1:]:
+        previous = [e for e in result.evaluations if e.rung == rung - 1]
+        current = [e for e in result.evaluations if e.rung == rung]
+        assert current[0].fidelity > previous[0].fidelity
+        ranked = sorted(previous, key=lambda e: -e.score)[: len(current)]
+        assert [e.params for e in current] == [e.params for e in ranked]
+    assert result.evaluations[-1].fidelity == 1.0
+
+
+def test_tpe_beats_its_random_start_up():
+    result = run_search("tpe", _space(), _objective, budget=60, seed=0, n_startup=15)
+    startup_best = max(e.score for e in result.evaluations[:15])
+    assert result.best_score > startup_best
+    assert result.best_score > -0.05
+
+
+def test_fold_scores_are_averaged_and_nan_ranks_last():
+    def objective(params, fidelity):
+        if params["entry_z"] == 1.0:
+            return math.nan
+        return np.array([1.0, 2.0, 3.0]) * params["entry_z"]
+
+    space = SearchSpace({"entry_z": [1.0, 2.0]})
+    result = run_search("grid", space, objective)
+
+    assert result.evaluations[0].score == -math.inf
+    assert result.evaluations[1].score == pytest.approx(4.0)
+    assert result.evaluations[1].fold_scores == (2.0, 4.0, 6.0)
+    assert result.best_params == {"entry_z": 2.0}
+    frame = result.to_frame()
+    assert frame.loc[1, "score_std"] == pytest.approx(2.0)
+    assert list(frame.loc[1, ["fold_1", "fold_2", "fold_3"]]) == [2.0, 4.0, 6.0]
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        run_search("annealing", _space(), _objective)
+    with pytest.raises(ValueError):
+        run_search("grid", _space(), _objective, budget=0)
+    with pytest.raises(ValueError):
+        SearchSpace({"entry_z": [1.0]}, constraint=lambda p: False)
@@ -0,0 +1,90 @@
+"""Round-trip tests for the ``nifty50_stat_arb.storage`` backends."""
+
+import importlib.util
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from nifty50_stat_arb.storage import append_frame, find_frame, read_frame, read_frame_labels, write_frame
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+needs_pyarrow = pytest.mark.skipif(not HAS_PYARROW, reason="parquet/feather need pyarrow")
+
+EXTENSIONS = [
+    ".csv",
+    pytest.param(".parquet", marks=needs_pyarrow),
+    pytest.param(".feather", marks=needs_pyarrow),
+    ".npy",
+]
+
+
+def _frame(n_rows=50, start="2020-01-01", seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0.0, 0.01, (n_rows, 4))
+    values[3, 1] = np.nan
+    return pd.DataFrame(values, index=pd.bdate_range(start, periods=n_rows), columns=["A", "B", "C", "D"])
+
+
+def _assert_same(actual, expected, ext):
+    assert list(actual.columns) == list(expected.columns)
+    assert (actual.index == expected.index).all()
+    if ext == ".csv":
+        # pandas' default float parser is off by up to ~1e-16 absolute.
+        np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=0, atol=1e-15)
+    else:
+        np.testing.assert_array_equal(actual.to_numpy(), expected.to_numpy())
+
+
+@pytest.mark.parametrize("ext", EXTENSIONS)
+def test_round_trip(tmp_path, ext):
+    frame = _frame()
+    path = str(tmp_path / f"returns{ext}")
+    write_frame(frame, path)
+
+    _assert_same(read_frame(path), frame, ext)
+    index, columns = read_frame_labels(path)
+    assert (index == frame.index).all() and columns == list(frame.columns)
+    # Only the table (and its .npy side files) are left behind, no temporaries.
+    assert not [name for name in os.listdir(tmp_path) if ".tmp" in name]
+    assert find_frame(str(tmp_path / "returns")) == path
+
+
+@pytest.mark.parametrize("ext", EXTENSIONS)
+def test_append(tmp_path, ext):
+    frame = _frame(60)
+    path = str(tmp_path / f"prices{ext}")
+    append_frame(frame.iloc[:40], path)
+    append_frame(frame.iloc[40:], path)
+
+    _assert_same(read_frame(path), frame, ext)
+
+
+def test_npy_is_memory_mapped_read_only(tmp_path):
+    frame = _frame()
+    path = str(tmp_path / "returns.npy")
+    write_frame(frame, path)
+
+    mapped = read_frame(path, mmap=True)
+    values = mapped.to_numpy()
+    base = values
+    while base.base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert isinstance(base, np.memmap)
+    _assert_same(mapped, frame, ".npy")
+    with pytest.raises(ValueError):
+        values[0, 0] = 1.0
+
+
+def test_rows_come_back_sorted(tmp_path):
+    frame = _frame()
+    path = str(tmp_path / "returns.npy")
+    write_frame(frame.iloc[::-1], path)
+
+    _assert_same(read_frame(path), frame, ".npy")
+    assert read_frame_labels(path)[0].is_monotonic_increasing
@@ -0,0 +1,54 @@
+"""Tests for checkpoint reuse in ``tune_hyperparams`` (evaluation log keys and opt-in resume)."""
+
+import dataclasses
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from nifty50_stat_arb.pca_backtest import BacktestConfig
+from nifty50_stat_arb.tuning_log import EvaluationLog
+from tune_hyperparams import TuningCheckpoint
+
+PARAMS = {"entry_z": 1.5, "exit_z": 0.5}
+
+
+def _checkpointed_calls(log_path, config, resume=True):
+    """Evaluations ``TuningCheckpoint.wrap`` actually ran for one lookup of PARAMS."""
+    calls = []
+
+    def objective(params, fidelity):
+        calls.append(params)
+        return 1.0
+
+    checkpoint = TuningCheckpoint(EvaluationLog(log_path, resume=resume), "IDX", "fingerprint", "float64")
+    checkpoint.wrap(objective, config)(PARAMS, 1.0)
+    return len(calls)
+
+
+def test_scores_are_only_reused_on_resume(tmp_path):
+    log_path = str(tmp_path / "log.jsonl")
+    config = BacktestConfig(returns_path="returns.csv", pca_components_path="pca.csv")
+
+    assert _checkpointed_calls(log_path, config) == 1
+    assert _checkpointed_calls(log_path, config, resume=False) == 1
+    assert _checkpointed_calls(log_path, config) == 0
+
+
+def test_every_scored_setting_is_part_of_the_key(tmp_path):
+    log_path = str(tmp_path / "log.jsonl")
+    config = BacktestConfig(returns_path="returns.csv", pca_components_path="pca.csv")
+    assert _checkpointed_calls(log_path, config) == 1
+
+    for change in [
+        {"pca_solver": "truncated"},
+        {"variance_threshold": 0.9},
+        {"refit_mode": "daily"},
+        {"lookback": config.lookback + 5},
+    ]:
+        assert _checkpointed_calls(log_path, dataclasses.replace(config, **change)) == 1, change
+
+    # File locations do not change a score.
+    moved = dataclasses.replace(config, returns_path="elsewhere.csv", pca_cache_dir=str(tmp_path))
+    assert _checkpointed_calls(log_path, moved) == 0
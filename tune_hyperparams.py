@@ -1,16 +1,49 @@
 #!/usr/bin/env python3
 """
-Coarse-to-fine grid search for PCA residual strategy hyperparameters.
+Hyperparameter search for the PCA residual strategy.
 
 For each sector index:
   1. Load returns and split chronologically into 70 / 15 / 15 (train / val / test).
   2. Run the rolling refit/trade strategy on the TRAIN + VAL slices only.
      - PCA is refit every 6 months within each slice.
      - The Sharpe ratio on the VAL slice is the optimisation objective.
-  3. Coarse pass: broad grid over (entry_z, exit_z).
-  4. Fine pass: zoom in ±step around the coarse winner with tighter spacing.
-  5. Report best params and val Sharpe per index.
-  6. Evaluate best params on the held-out TEST slice and report test Sharpe.
+  3. Search (entry_z, exit_z) with the chosen strategy (``--search``):
+     - coarse-fine (default): broad grid, then a fine grid ±step around
+       the coarse winner with tighter spacing.
+     - grid / random / halving / tpe: ``nifty50_stat_arb.search`` strategies
+       over SEARCH_ENTRY x SEARCH_EXIT with a fixed ``--budget`` of
+       evaluations and a ``--seed``. ``halving`` scores early rungs on
+       prefixes of the VAL slice.
+  4. Report best params and val Sharpe per index.
+  5. Evaluate best params on the held-out TEST slice and report test Sharpe.
+
+Joint mode: give several values to ``--lookback``, ``--refit-months`` or
+``--trade-months`` and the window settings are tuned together with the
+thresholds. The VAL signals for every window combination are built up front
+by ``compute_signal_grid``, which fits each refit window once, computes
+residuals once per fit window and rolls every lookback in one pass.
+coarse-fine then runs per combination; the other strategies search the
+windows as extra dimensions.
+
+Walk-forward CV (``--cv-folds K``): instead of the single VAL slice, the
+TRAIN + VAL span is cut into K + 1 equal chunks and fold k validates on
+chunk k + 1 with everything before it as (expanding) history. Signals are
+built once over the whole span and cut at the fold boundaries, so K folds
+cost one set of PCA fits; every parameter set is then scored on all folds
+in one vectorized pass. The objective is the mean fold Sharpe, and the
+std across folds is reported next to it. TEST stays held out as before.
+
+Every evaluated point is written to ``--search-log`` (one row per
+evaluation, with a column for every tuned dimension) so a search can be
+audited afterwards.
+
+Checkpointing: each score is appended to ``--log`` (JSON lines, see
+``nifty50_stat_arb.tuning_log``) the moment it is computed, keyed by index,
+data fingerprint, every backtest setting that affects the score and a
+version of the scoring code (a hash of its source). Rerunning with
+``--resume`` after a crash or Ctrl-C reuses the logged scores and skips
+finished indices; without it every score is recomputed. ``--from-log``
+rebuilds the output CSVs from the log without tuning.
 
 Symmetry enforced:
   long_entry_z  = -entry_z
@@ -23,13 +56,27 @@ Usage:
     python tune_hyperparams.py
     python tune_hyperparams.py --index nifty_bank nifty_it
     python tune_hyperparams.py --index nifty50 --lookback 60
+    python tune_hyperparams.py --workers 4
+    python tune_hyperparams.py --search tpe --budget 40 --seed 7
+    python tune_hyperparams.py --lookback 20 40 60 --refit-months 3 6 --trade-months 3 6
+    python tune_hyperparams.py --cv-folds 5
+    python tune_hyperparams.py --pca-cache-dir          # reuse PCA fits across runs
+    python tune_hyperparams.py --resume                 # continue an interrupted run
+    python tune_hyperparams.py --from-log
 """
 
 from __future__ import annotations
 
 import argparse
+import contextlib
+import dataclasses
+import glob
+import hashlib
+import io
+import math
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from itertools import product
 
 import numpy as np
@@ -38,7 +85,28 @@ import pandas as pd
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, PROJECT_ROOT)
 
-from nifty50_stat_arb.pca_backtest import BacktestConfig, load_returns, run_backtest_on_df
+from nifty50_stat_arb.pca_backtest import (
+    BacktestConfig,
+    BlockSignal,
+    annualized_sharpe,
+    build_signals,
+    compute_signal_grid,
+    evaluate_threshold_grid,
+    load_returns,
+    run_backtest_on_signals,
+)
+from nifty50_stat_arb.pca_cache import DEFAULT_PCA_CACHE_DIR, get_pca_cache
+from nifty50_stat_arb.search import (
+    SEARCH_STRATEGIES,
+    Evaluation,
+    Objective,
+    SearchResult,
+    SearchSpace,
+    fold_std,
+    run_search,
+)
+from nifty50_stat_arb.storage import find_frame
+from nifty50_stat_arb.tuning_log import EvaluationLog, data_fingerprint, record_key, results_from_log
 
 # ---------------------------------------------------------------------------
 # Index registry (mirrors run_indices.py)
@@ -64,6 +132,35 @@ COARSE_EXIT  = [0.0, 0.25, 0.5, 0.75, 1.0]       # exit_z candidates
 FINE_STEP    = 0.1                                 # fine grid resolution
 FINE_RADIUS  = 0.3                                 # search ± this around coarse best
 
+# Candidate lattice for the pluggable search strategies.
+SEARCH_ENTRY = [round(v, 2) for v in np.arange(0.5, 3.05, 0.1).tolist()]
+SEARCH_EXIT  = [round(v, 2) for v in np.arange(0.0, 1.55, 0.1).tolist()]
+SEARCH_METHODS = ["coarse-fine", *SEARCH_STRATEGIES]
+DEFAULT_BUDGET = 60                                # evaluations per index (non-default searches)
+
+DEFAULT_LOG_PATH = os.path.join(PROJECT_ROOT, "data", "tuning_log.jsonl")
+
+# Bump when logged scores must not be reused although no hashed source changed.
+CHECKPOINT_SCHEMA = 2
+
+# BacktestConfig fields that do not change a score: file locations and the
+# PCA cache directory. The thresholds are keyed through the searched params.
+_UNSCORED_FIELDS = {"returns_path", "pca_components_path", "pca_cache_dir"}
+_THRESHOLD_FIELDS = {"long_entry_z", "short_entry_z", "long_exit_z", "short_exit_z"}
+
+
+def _scoring_code_version() -> str:
+    """Hash of ``CHECKPOINT_SCHEMA``, this script and every module of the package."""
+    package_dir = os.path.dirname(os.path.abspath(sys.modules[BacktestConfig.__module__].__file__))
+    digest = hashlib.sha1(str(CHECKPOINT_SCHEMA).encode())
+    for path in [os.path.abspath(__file__), *sorted(glob.glob(os.path.join(package_dir, "*.py")))]:
+        with open(path, "rb") as fh:
+            digest.update(fh.read())
+    return digest.hexdigest()
+
+
+SCORING_CODE_VERSION = _scoring_code_version()
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -85,6 +182,31 @@ def split_returns(
     return train, val, test
 
 
+Fold = tuple[pd.Timestamp, pd.Timestamp]
+
+
+def walk_forward_folds(
+    returns: pd.DataFrame,
+    n_folds: int,
+    train_frac: float = 0.70,
+    val_frac: float   = 0.15,
+) -> list[Fold]:
+    """Validation windows of an expanding-window walk-forward split.
+
+    The TRAIN + VAL span of ``split_returns`` is cut into ``n_folds + 1``
+    equal chunks (any remainder goes to the first); fold k validates on
+    chunk k + 1 and may use every day before it. Returns the first and
+    last day of each validation window; the TEST slice is never included.
+    """
+    dev_end = int(len(returns) * (train_frac + val_frac))
+    fold_len = dev_end // (n_folds + 1) if n_folds >= 1 else 0
+    if fold_len < 2:
+        raise ValueError(f"cannot cut {dev_end} train + val days into {n_folds} walk-forward folds")
+    dates = returns.index
+    starts = [dev_end - (n_folds - k) * fold_len for k in range(n_folds)]
+    return [(dates[start], dates[start + fold_len - 1]) for start in starts]
+
+
 def compute_sharpe(results: pd.DataFrame) -> float:
     """Annualised Sharpe (rf = 0) from a backtest result DataFrame."""
     if results.empty or results["strategy_return"].std(ddof=1) == 0:
@@ -102,8 +224,10 @@ def _make_config(
     lookback: int,
     refit_months: int,
     trade_months: int,
+    dtype: str = "float64",
+    pca_cache_dir: str | None = None,
 ) -> BacktestConfig:
-    returns_path = os.path.join(PROJECT_ROOT, "data", index_name, "returns.csv")
+    returns_path = find_frame(os.path.join(PROJECT_ROOT, "data", index_name, "returns"))
     pca_path     = os.path.join(PROJECT_ROOT, "data", index_name, "pca_components.csv")
     return BacktestConfig(
         returns_path=returns_path,
@@ -115,26 +239,356 @@ def _make_config(
         short_exit_z=-exit_z,
         refit_months=refit_months,
         trade_months=trade_months,
+        pca_cache_dir=pca_cache_dir,
+        dtype=dtype,
     )
 
 
+_SIGNAL_CACHE: dict[tuple, list[BlockSignal]] = {}
+
+
+def slice_signals(returns_slice: pd.DataFrame, config: BacktestConfig) -> list[BlockSignal]:
+    """Memoized signal stage for a returns slice.
+
+    Keyed by a hash of the slice (values, dates, columns) plus the parameters
+    the signals depend on (lookback, refit/trade months), so every threshold
+    pair tried on the same slice reuses one set of PCA fits and z-scores.
+    """
+    key = _signal_key(_slice_digest(returns_slice), config)
+    if key not in _SIGNAL_CACHE:
+        _SIGNAL_CACHE[key] = build_signals(returns_slice, config)
+    return _SIGNAL_CACHE[key]
+
+
+def _slice_digest(returns_slice: pd.DataFrame) -> str:
+    return data_fingerprint(returns_slice)
+
+
+def _signal_key(slice_digest: str, config: BacktestConfig) -> tuple:
+    return (
+        slice_digest,
+        config.lookback,
+        config.refit_months,
+        config.trade_months,
+        config.refit_mode,
+        config.daily_fit_window,
+        config.subspace_iterations,
+        config.pca_solver,
+        config.variance_threshold,
+        config.dtype,
+    )
+
+
+def prime_signal_cache(
+    returns_slice: pd.DataFrame,
+    config_template: BacktestConfig,
+    lookbacks: list[int],
+    refit_months: list[int],
+    trade_months: list[int],
+) -> int:
+    """Fill the ``slice_signals`` memo for every window combination in one shared pass.
+
+    Uses ``compute_signal_grid`` (calendar refits only), so later lookups
+    for any (lookback, refit_months, trade_months) in the grid are hits.
+    Returns the number of combinations added.
+    """
+    if config_template.refit_mode != "calendar":
+        return 0
+    slice_digest = _slice_digest(returns_slice)
+    grid = compute_signal_grid(returns_slice, config_template, lookbacks, refit_months, trade_months)
+    for (lookback, refit, trade), signals in grid.items():
+        config = BacktestConfig(**{
+            **config_template.__dict__,
+            "lookback": lookback,
+            "refit_months": refit,
+            "trade_months": trade,
+        })
+        _SIGNAL_CACHE[_signal_key(slice_digest, config)] = signals
+    return len(grid)
+
+
 def evaluate_on_slice(
     returns_slice: pd.DataFrame,
     config: BacktestConfig,
 ) -> float:
     """Run backtest on a returns slice and return its Sharpe ratio."""
-    results = run_backtest_on_df(returns_slice, config, verbose=False)
+    results = run_backtest_on_signals(slice_signals(returns_slice, config), config, verbose=False)
     return compute_sharpe(results)
 
 
+def signal_prefix(signals: list[BlockSignal], fidelity: float) -> list[BlockSignal]:
+    """Signals cut to the first ``fidelity`` share of their trade days.
+
+    Z-scores only look backwards, so this equals the signals of the
+    validation prefix ending on that day, without recomputing anything.
+    """
+    if fidelity >= 1.0:
+        return signals
+    remaining = max(2, int(math.ceil(fidelity * sum(len(s.zscores) for s in signals))))
+    prefix = []
+    for signal in signals:
+        if remaining < 2:  # a block needs two days to produce a PnL row
+            break
+        n = min(remaining, len(signal.zscores))
+        prefix.append(BlockSignal(
+            block_num=signal.block_num,
+            fit_dates=signal.fit_dates,
+            zscores=signal.zscores.iloc[:n],
+            returns=signal.returns.iloc[:n],
+        ))
+        remaining -= n
+    return prefix
+
+
+def signal_window(signals: list[BlockSignal], start: pd.Timestamp, end: pd.Timestamp) -> list[BlockSignal]:
+    """Signals restricted to the trade days in [start, end].
+
+    Blocks left with fewer than two days (no PnL row) are dropped.
+    """
+    window = []
+    for signal in signals:
+        dates = signal.zscores.index
+        mask = (dates >= start) & (dates <= end)
+        if mask.sum() < 2:
+            continue
+        window.append(BlockSignal(
+            block_num=signal.block_num,
+            fit_dates=signal.fit_dates,
+            zscores=signal.zscores.loc[mask],
+            returns=signal.returns.loc[mask],
+        ))
+    return window
+
+
+def fold_signals(
+    dev_returns: pd.DataFrame,
+    config: BacktestConfig,
+    folds: list[Fold],
+) -> list[list[BlockSignal]]:
+    """Memoized per-fold signals: ``slice_signals`` of the whole span, cut at the folds.
+
+    Z-scores and refits only look backwards, so a fold's cut equals the
+    signals a walk-forward run would produce with all earlier days as
+    history, and every fold shares the one set of PCA fits.
+    """
+    key = (*_signal_key(_slice_digest(dev_returns), config), tuple(folds))
+    if key not in _SIGNAL_CACHE:
+        signals = slice_signals(dev_returns, config)
+        _SIGNAL_CACHE[key] = [signal_window(signals, start, end) for start, end in folds]
+    return _SIGNAL_CACHE[key]
+
+
+def walk_forward_scores(
+    per_fold: list[list[BlockSignal]],
+    folds: list[Fold],
+    entry_candidates: list[float],
+    exit_candidates: list[float],
+) -> dict[tuple[float, float], np.ndarray]:
+    """Val Sharpe (``annualized_sharpe``) of every (entry_z, exit_z) pair on every fold.
+
+    The blocks of all folds go through one ``evaluate_threshold_grid``
+    scan (positions reset at each block, hence at each fold); the daily PnL
+    is then split by fold. Folds without PnL score -inf.
+    """
+    pairs = [(e, x) for e, x in product(entry_candidates, exit_candidates) if x < e]
+    scores = np.full((len(pairs), len(folds)), -np.inf)
+    blocks = [signal for signals in per_fold for signal in signals]
+    if blocks and pairs:
+        _, daily = evaluate_threshold_grid(
+            [s.zscores for s in blocks],
+            [s.returns for s in blocks],
+            entry_candidates,
+            exit_candidates,
+        )
+        fold_of_day = np.searchsorted(
+            pd.DatetimeIndex([start for start, _ in folds]), daily.index, side="right"
+        ) - 1
+        values = daily.to_numpy()
+        for k in range(len(folds)):
+            scores[:, k] = annualized_sharpe(values[fold_of_day == k], axis=0)
+    return dict(zip(pairs, scores))
+
+
+def _config_with_params(config_template: BacktestConfig, params: dict) -> BacktestConfig:
+    """Template with symmetric thresholds (and any other searched fields) from ``params``."""
+    overrides = {k: v for k, v in params.items() if k not in ("entry_z", "exit_z")}
+    return BacktestConfig(**{
+        **config_template.__dict__,
+        **overrides,
+        "long_entry_z": -params["entry_z"],
+        "short_entry_z": +params["entry_z"],
+        "long_exit_z": +params["exit_z"],
+        "short_exit_z": -params["exit_z"],
+    })
+
+
+def _full_params(config: BacktestConfig, params: dict) -> dict:
+    """``params`` completed with every scored setting of ``config`` it does not override.
+
+    That is each ``BacktestConfig`` field except paths, the PCA cache
+    directory and the thresholds (which the searched params carry).
+    """
+    settings = {
+        field.name: getattr(config, field.name)
+        for field in dataclasses.fields(config)
+        if field.name not in _UNSCORED_FIELDS | _THRESHOLD_FIELDS
+    }
+    return {**settings, **params}
+
+
+class TuningCheckpoint:
+    """Logged val scores for one index and dataset (see ``nifty50_stat_arb.tuning_log``).
+
+    Keys cover the index, the returns fingerprint, the precision, the full
+    parameter set (thresholds plus every scored ``BacktestConfig`` field,
+    see ``_full_params``), the fidelity, the metric (``annualized_sharpe``
+    for the batched grid, ``compute_sharpe`` for single backtests) and
+    ``SCORING_CODE_VERSION``, so a score is only reused where it would be
+    recomputed identically. With walk-forward ``folds`` the fold windows
+    are part of the key too, and records keep the per-fold scores.
+    """
+
+    def __init__(
+        self,
+        log: EvaluationLog,
+        index_name: str,
+        fingerprint: str,
+        dtype: str,
+        folds: list[Fold] | None = None,
+    ):
+        self.log = log
+        self.index_name = index_name
+        self.fingerprint = fingerprint
+        self.dtype = dtype
+        self.folds = [[str(start.date()), str(end.date())] for start, end in folds] if folds else None
+        self.reused = 0
+
+    def _key(self, params: dict, fidelity: float, metric: str) -> str:
+        fields = {"folds": self.folds} if self.folds else {}
+        return record_key(
+            kind="evaluation",
+            code=SCORING_CODE_VERSION,
+            index=self.index_name,
+            fingerprint=self.fingerprint,
+            dtype=self.dtype,
+            params=params,
+            fidelity=fidelity,
+            metric=metric,
+            **fields,
+        )
+
+    def lookup(
+        self, params: dict, fidelity: float = 1.0, metric: str = "compute_sharpe"
+    ) -> float | list[float] | None:
+        """Logged score (per-fold scores under walk-forward CV), or None."""
+        record = self.log.lookup(self._key(params, fidelity, metric))
+        if record is None:
+            return None
+        self.reused += 1
+        return record.get("fold_scores", record["score"])
+
+    def store(
+        self,
+        params: dict,
+        score: float | np.ndarray,
+        fidelity: float = 1.0,
+        metric: str = "compute_sharpe",
+    ) -> None:
+        """Log ``score``, or per-fold scores (their mean becomes the record's score)."""
+        record = {
+            "key": self._key(params, fidelity, metric),
+            "kind": "evaluation",
+            "code": SCORING_CODE_VERSION,
+            "index": self.index_name,
+            "fingerprint": self.fingerprint,
+            "dtype": self.dtype,
+            "params": params,
+            "fidelity": fidelity,
+            "metric": metric,
+            "score": float(np.mean(score)),
+        }
+        if np.ndim(score):
+            record["folds"] = self.folds
+            record["fold_scores"] = [float(s) for s in score]
+        self.log.append(record)
+
+    def wrap(
+        self,
+        objective: Objective,
+        config_template: BacktestConfig,
+        metric: str = "compute_sharpe",
+    ) -> Objective:
+        """``objective`` that serves logged scores and logs new ones."""
+
+        def checkpointed(params: dict, fidelity: float) -> float | list[float]:
+            full = _full_params(config_template, params)
+            score = self.lookup(full, fidelity, metric)
+            if score is None:
+                score = objective(params, fidelity)
+                self.store(full, score, fidelity, metric)
+            return score
+
+        return checkpointed
+
+
+def threshold_objective(val_returns: pd.DataFrame, config_template: BacktestConfig) -> Objective:
+    """Val Sharpe of a parameter dict on the first ``fidelity`` share of ``val_returns``."""
+
+    def objective(params: dict, fidelity: float) -> float:
+        config = _config_with_params(config_template, params)
+        signals = signal_prefix(slice_signals(val_returns, config), fidelity)
+        if not signals:
+            return -np.inf
+        return compute_sharpe(run_backtest_on_signals(signals, config, verbose=False))
+
+    return objective
+
+
+def walk_forward_objective(
+    dev_returns: pd.DataFrame,
+    config_template: BacktestConfig,
+    folds: list[Fold],
+) -> Objective:
+    """Per-fold val Sharpes of a parameter dict, each on the first ``fidelity`` share of its fold."""
+
+    def objective(params: dict, fidelity: float) -> np.ndarray:
+        config = _config_with_params(config_template, params)
+        per_fold = [signal_prefix(signals, fidelity) for signals in fold_signals(dev_returns, config, folds)]
+        entry_z, exit_z = params["entry_z"], params["exit_z"]
+        return walk_forward_scores(per_fold, folds, [entry_z], [exit_z])[entry_z, exit_z]
+
+    return objective
+
+
+def threshold_space(windows: dict[str, list[int]] | None = None) -> SearchSpace:
+    """SEARCH_ENTRY x SEARCH_EXIT (exit_z < entry_z), plus any window dimensions in ``windows``."""
+    return SearchSpace(
+        {"entry_z": SEARCH_ENTRY, "exit_z": SEARCH_EXIT, **(windows or {})},
+        constraint=lambda p: p["exit_z"] < p["entry_z"],
+    )
+
+
 def grid_search(
     val_returns: pd.DataFrame,
     entry_candidates: list[float],
     exit_candidates: list[float],
     config_template: BacktestConfig,
+    batched: bool = True,
+    evaluations: list[Evaluation] | None = None,
+    checkpoint: TuningCheckpoint | None = None,
+    folds: list[Fold] | None = None,
 ) -> tuple[float, float, float]:
     """
     Exhaustive grid search over (entry_z, exit_z) pairs.
+    Signals for ``val_returns`` are computed once and shared by every pair.
+    With ``batched`` all pairs are evaluated in a single vectorized pass
+    (``evaluate_threshold_grid``); otherwise one backtest per pair.
+    With walk-forward ``folds``, ``val_returns`` is the TRAIN + VAL span and
+    each pair scores the mean of its fold Sharpes (always batched, all
+    folds in the same pass).
+    Each evaluated pair is appended to ``evaluations`` when given. With a
+    ``checkpoint`` logged scores are reused (the batched pass only runs if
+    some pair is missing) and new ones are logged.
     Returns (best_entry_z, best_exit_z, best_val_sharpe).
     """
     best_entry, best_exit, best_sharpe = entry_candidates[0], exit_candidates[0], -np.inf
@@ -142,23 +596,72 @@ def grid_search(
     total = sum(1 for e, x in product(entry_candidates, exit_candidates) if x < e)
     done  = 0
 
+    if batched or folds:
+        pairs = [(e, x) for e, x in product(entry_candidates, exit_candidates) if x < e]
+        scores: dict[tuple[float, float], float | np.ndarray] = {}  # per-fold arrays with ``folds``
+        if checkpoint is not None:
+            for entry_z, exit_z in pairs:
+                params = _full_params(config_template, {"entry_z": entry_z, "exit_z": exit_z})
+                logged = checkpoint.lookup(params, metric="annualized_sharpe")
+                if logged is not None:
+                    scores[entry_z, exit_z] = np.asarray(logged) if folds else logged
+        if len(scores) < len(pairs):
+            if folds:
+                fresh = walk_forward_scores(
+                    fold_signals(val_returns, config_template, folds),
+                    folds,
+                    entry_candidates,
+                    exit_candidates,
+                )
+            else:
+                signals = slice_signals(val_returns, config_template)
+                surface, _ = evaluate_threshold_grid(
+                    [s.zscores for s in signals],
+                    [s.returns for s in signals],
+                    entry_candidates,
+                    exit_candidates,
+                )
+                fresh = {(e, x): surface.loc[e, x] for e, x in pairs}
+            for entry_z, exit_z in pairs:
+                if (entry_z, exit_z) in scores:
+                    continue
+                scores[entry_z, exit_z] = fresh[entry_z, exit_z]
+                if checkpoint is not None:
+                    params = _full_params(config_template, {"entry_z": entry_z, "exit_z": exit_z})
+                    checkpoint.store(params, scores[entry_z, exit_z], metric="annualized_sharpe")
+        else:
+            print(f"    reusing {len(pairs)} logged pairs")
+
+        for entry_z, exit_z in pairs:
+            value = scores[entry_z, exit_z]
+            fold_scores = tuple(float(s) for s in value) if folds else ()
+            sharpe = float(np.mean(value)) if folds else value
+            if evaluations is not None:
+                evaluations.append(Evaluation(
+                    len(evaluations), {"entry_z": entry_z, "exit_z": exit_z}, sharpe, fold_scores=fold_scores
+                ))
+            if sharpe > best_sharpe:
+                best_sharpe = sharpe
+                best_entry  = entry_z
+                best_exit   = exit_z
+        label = f"mean val_sharpe over {len(folds)} folds" if folds else "val_sharpe"
+        print(f"    evaluated {total} pairs in one pass  best {label}={best_sharpe: .3f}")
+        return best_entry, best_exit, best_sharpe
+
     for entry_z, exit_z in product(entry_candidates, exit_candidates):
         if exit_z >= entry_z:          # constraint: exit must be less extreme than entry
             continue
 
-        cfg = BacktestConfig(
-            returns_path=config_template.returns_path,
-            pca_components_path=config_template.pca_components_path,
-            lookback=config_template.lookback,
-            long_entry_z=-entry_z,
-            short_entry_z=+entry_z,
-            long_exit_z=+exit_z,
-            short_exit_z=-exit_z,
-            refit_months=config_template.refit_months,
-            trade_months=config_template.trade_months,
-        )
+        cfg = _config_with_params(config_template, {"entry_z": entry_z, "exit_z": exit_z})
 
-        sharpe = evaluate_on_slice(val_returns, cfg)
+        params = _full_params(cfg, {"entry_z": entry_z, "exit_z": exit_z})
+        sharpe = None if checkpoint is None else checkpoint.lookup(params)
+        if sharpe is None:
+            sharpe = evaluate_on_slice(val_returns, cfg)
+            if checkpoint is not None:
+                checkpoint.store(params, sharpe)
+        if evaluations is not None:
+            evaluations.append(Evaluation(len(evaluations), {"entry_z": entry_z, "exit_z": exit_z}, sharpe))
         done += 1
         print(
             f"    [{done:>3}/{total}] entry={entry_z:.2f}  exit={exit_z:.2f}"
@@ -193,41 +696,22 @@ def fine_grid(
     return entry_vals, exit_vals
 
 
-def tune_index(
-    index_name: str,
-    lookback: int,
-    refit_months: int,
-    trade_months: int,
-) -> dict:
-    """Full coarse-to-fine tuning for a single index. Returns a results dict."""
-    returns_path = os.path.join(PROJECT_ROOT, "data", index_name, "returns.csv")
-
-    if not os.path.exists(returns_path):
-        print(f"  [SKIP] returns file not found: {returns_path}")
-        return {}
-
-    returns = load_returns(returns_path)
-    train, val, test = split_returns(returns)
-
-    n_total = len(returns)
-    n_train = len(train)
-    n_val   = len(val)
-    n_test  = len(test)
-    print(
-        f"  Data split: total={n_total} days  "
-        f"train={n_train} ({train.index[0].date()} to {train.index[-1].date()})  "
-        f"val={n_val} ({val.index[0].date()} to {val.index[-1].date()})  "
-        f"test={n_test} ({test.index[0].date()} to {test.index[-1].date()})"
-    )
-
-    config_template = _make_config(index_name, 1.5, 0.0, lookback, refit_months, trade_months)
+def coarse_fine_search(
+    val_returns: pd.DataFrame,
+    config_template: BacktestConfig,
+    checkpoint: TuningCheckpoint | None = None,
+    folds: list[Fold] | None = None,
+) -> SearchResult:
+    """The coarse grid, then the fine grid around its winner; both recorded."""
+    evaluations: list[Evaluation] = []
 
     # ------------------------------------------------------------------
     # COARSE pass — evaluate on val slice
     # ------------------------------------------------------------------
     print("  [Coarse grid]")
     best_entry_c, best_exit_c, best_sharpe_c = grid_search(
-        val, COARSE_ENTRY, COARSE_EXIT, config_template
+        val_returns, COARSE_ENTRY, COARSE_EXIT, config_template,
+        evaluations=evaluations, checkpoint=checkpoint, folds=folds,
     )
     print(
         f"  Coarse best: entry_z={best_entry_c:.2f}  exit_z={best_exit_c:.2f}"
@@ -240,36 +724,232 @@ def tune_index(
     print("  [Fine grid]")
     fine_entry_vals, fine_exit_vals = fine_grid(best_entry_c, best_exit_c, FINE_STEP, FINE_RADIUS)
     best_entry_f, best_exit_f, best_sharpe_f = grid_search(
-        val, fine_entry_vals, fine_exit_vals, config_template
+        val_returns, fine_entry_vals, fine_exit_vals, config_template,
+        evaluations=evaluations, checkpoint=checkpoint, folds=folds,
     )
     print(
         f"  Fine best:   entry_z={best_entry_f:.2f}  exit_z={best_exit_f:.2f}"
         f"  val_sharpe={best_sharpe_f:.3f}"
     )
+    return SearchResult(
+        "coarse-fine",
+        {"entry_z": best_entry_f, "exit_z": best_exit_f},
+        best_sharpe_f,
+        evaluations,
+    )
+
+
+def joint_coarse_fine_search(
+    val_returns: pd.DataFrame,
+    config_template: BacktestConfig,
+    windows: dict[str, list[int]],
+    checkpoint: TuningCheckpoint | None = None,
+    folds: list[Fold] | None = None,
+) -> SearchResult:
+    """``coarse_fine_search`` for every window combination; the best combination wins.
+
+    Each evaluation's params include the window settings it ran with.
+    """
+    evaluations: list[Evaluation] = []
+    best = SearchResult("coarse-fine", {}, -np.inf)
+    for combo in product(*windows.values()):
+        settings = dict(zip(windows, combo))
+        print("  [" + "  ".join(f"{name}={value}" for name, value in settings.items()) + "]")
+        config = BacktestConfig(**{**config_template.__dict__, **settings})
+        result = coarse_fine_search(val_returns, config, checkpoint, folds)
+        for e in result.evaluations:
+            evaluations.append(Evaluation(
+                len(evaluations), {**e.params, **settings}, e.score, e.fidelity, e.rung, e.fold_scores
+            ))
+        if result.best_score > best.best_score or not best.best_params:
+            best = SearchResult("coarse-fine", {**result.best_params, **settings}, result.best_score)
+    best.evaluations = evaluations
+    return best
+
+
+def _as_list(value: int | list[int]) -> list[int]:
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def tune_index(
+    index_name: str,
+    lookback: int | list[int],
+    refit_months: int | list[int],
+    trade_months: int | list[int],
+    dtype: str = "float64",
+    search: str = "coarse-fine",
+    budget: int = DEFAULT_BUDGET,
+    seed: int = 0,
+    search_log: list[dict] | None = None,
+    log_path: str | None = None,
+    resume: bool = False,
+    cv_folds: int = 0,
+    pca_cache_dir: str | None = None,
+) -> dict:
+    """Tune a single index with the ``search`` method. Returns a results dict.
+
+    ``lookback``, ``refit_months`` and ``trade_months`` may be lists; with
+    more than one value in any of them the windows are tuned jointly with
+    the thresholds. Every evaluated point is appended to ``search_log`` (one
+    dict per evaluation, tagged with the index and window settings) when
+    given.
+
+    With ``log_path`` every score is checkpointed to that evaluation log as
+    it is computed; with ``resume`` scores and finished results already in
+    the log (for the same data, settings and scoring code) are reused.
+
+    With ``cv_folds`` > 0 each configuration is scored by walk-forward CV
+    over the TRAIN + VAL span (``walk_forward_folds``) instead of on the VAL
+    slice: ``val_sharpe`` is the mean fold Sharpe and ``val_sharpe_std``
+    its std across folds. ``pca_cache_dir`` persists PCA fits between runs
+    (None keeps them in memory).
+    """
+    returns_path = find_frame(os.path.join(PROJECT_ROOT, "data", index_name, "returns"))
+
+    if not os.path.exists(returns_path):
+        print(f"  [SKIP] returns file not found: {returns_path}")
+        return {}
+
+    returns = load_returns(returns_path, mmap=True, dtype=dtype)
+    _SIGNAL_CACHE.clear()  # signals never carry over between indices
+    train, val, test = split_returns(returns)
+    folds = walk_forward_folds(returns, cv_folds) if cv_folds else None
+    search_slice = returns.iloc[: len(train) + len(val)] if folds else val
+
+    windows = {
+        "lookback": _as_list(lookback),
+        "refit_months": _as_list(refit_months),
+        "trade_months": _as_list(trade_months),
+    }
+    config_template = _make_config(
+        index_name, 1.5, 0.0, *(values[0] for values in windows.values()), dtype, pca_cache_dir
+    )
+    checkpoint = None
+    if log_path:
+        log = EvaluationLog(log_path, resume=resume)
+        fingerprint = data_fingerprint(returns)
+        settings = {
+            "search": search,
+            "budget": None if search == "coarse-fine" else budget,
+            "seed": None if search == "coarse-fine" else seed,
+            "windows": windows,
+            "dtype": dtype,
+            "config": _full_params(config_template, {}),
+        }
+        if folds:
+            settings["cv_folds"] = cv_folds
+        result_key = record_key(
+            kind="result", code=SCORING_CODE_VERSION, index=index_name, fingerprint=fingerprint, settings=settings
+        )
+        finished = log.lookup(result_key)
+        if finished is not None:
+            print("  [RESUME] already tuned with these settings; using the logged result")
+            if search_log is not None:
+                search_log.extend({"index": index_name, **row} for row in finished["evaluations"])
+            return finished["row"]
+        checkpoint = TuningCheckpoint(log, index_name, fingerprint, dtype, folds)
+
+    n_total = len(returns)
+    n_train = len(train)
+    n_val   = len(val)
+    n_test  = len(test)
+    print(
+        f"  Data split: total={n_total} days  "
+        f"train={n_train} ({train.index[0].date()} to {train.index[-1].date()})  "
+        f"val={n_val} ({val.index[0].date()} to {val.index[-1].date()})  "
+        f"test={n_test} ({test.index[0].date()} to {test.index[-1].date()})"
+    )
+    if folds:
+        print(f"  Walk-forward CV: {len(folds)} folds over train + val (history expands each fold)")
+        for k, (start, end) in enumerate(folds, start=1):
+            print(f"    fold {k}: val {start.date()} to {end.date()}")
+
+    tuned_windows = {name: values for name, values in windows.items() if len(values) > 1}
+    if tuned_windows:
+        combos = prime_signal_cache(search_slice, config_template, *windows.values())
+        print(f"  Joint search: {combos} window combinations, signals built in one shared pass")
+
+    if search == "coarse-fine":
+        if tuned_windows:
+            result = joint_coarse_fine_search(search_slice, config_template, windows, checkpoint, folds)
+        else:
+            result = coarse_fine_search(search_slice, config_template, checkpoint, folds)
+    else:
+        print(f"  [{search} search, budget {budget}, seed {seed}]")
+        if folds:
+            objective = walk_forward_objective(search_slice, config_template, folds)
+            metric = "annualized_sharpe"
+        else:
+            objective = threshold_objective(val, config_template)
+            metric = "compute_sharpe"
+        if checkpoint is not None:
+            objective = checkpoint.wrap(objective, config_template, metric)
+        result = run_search(
+            search,
+            threshold_space(tuned_windows),
+            objective,
+            budget=budget,
+            seed=seed,
+        )
+        if not result.best_params:
+            print(f"  [SKIP] no full-fidelity evaluation within {budget} evaluations")
+            return {}
+        print(
+            f"  Best of {len(result.evaluations)}: entry_z={result.best_params['entry_z']:.2f}"
+            f"  exit_z={result.best_params['exit_z']:.2f}  val_sharpe={result.best_score:.3f}"
+        )
+    best_entry_f = result.best_params["entry_z"]
+    best_exit_f = result.best_params["exit_z"]
+    best_sharpe_f = result.best_score
+    best_fold_scores = next(
+        (e.fold_scores for e in result.evaluations if e.fidelity >= 1.0 and e.params == result.best_params),
+        (),
+    )
+    if folds:
+        print(
+            f"  Best fold Sharpes: {'  '.join(f'{s:.3f}' for s in best_fold_scores)}"
+            f"  (mean {best_sharpe_f:.3f}, std {fold_std(best_fold_scores):.3f})"
+        )
+    evaluations = result.to_frame()
+    for name, values in windows.items():
+        if name not in evaluations:
+            evaluations[name] = values[0]
+    leading = ["order", "strategy", "entry_z", "exit_z", *windows]
+    evaluations = evaluations[leading + [c for c in evaluations.columns if c not in leading]]
+    if tuned_windows and not evaluations.empty:
+        full = evaluations[evaluations["fidelity"] >= 1.0]
+        by_window = full.groupby(list(windows))["score"].max().rename("best_val_sharpe")
+        print(by_window.to_frame().to_string())
+    if checkpoint is not None and checkpoint.reused:
+        print(f"  Reused {checkpoint.reused} logged scores from {log_path}")
+    if search_log is not None:
+        search_log.extend({"index": index_name, **row} for row in evaluations.to_dict("records"))
 
     # ------------------------------------------------------------------
     # TEST evaluation — held-out, never seen during tuning
     # ------------------------------------------------------------------
-    best_cfg = BacktestConfig(
-        returns_path=config_template.returns_path,
-        pca_components_path=config_template.pca_components_path,
-        lookback=lookback,
-        long_entry_z=-best_entry_f,
-        short_entry_z=+best_entry_f,
-        long_exit_z=+best_exit_f,
-        short_exit_z=-best_exit_f,
-        refit_months=refit_months,
-        trade_months=trade_months,
-    )
+    best_cfg = _config_with_params(config_template, result.best_params)
+    if tuned_windows:
+        print(
+            f"  Best windows: lookback={best_cfg.lookback}  refit_months={best_cfg.refit_months}"
+            f"  trade_months={best_cfg.trade_months}"
+        )
     test_sharpe = evaluate_on_slice(test, best_cfg)
     print(f"  Test Sharpe (held-out): {test_sharpe:.3f}")
+    print(f"  PCA cache: {get_pca_cache(config_template.pca_cache_dir).stats}")
 
-    return {
+    row = {
         "index":        index_name,
         "entry_z":      best_entry_f,
         "exit_z":       best_exit_f,
         "val_sharpe":   best_sharpe_f,
         "test_sharpe":  test_sharpe,
+        **({"val_sharpe_std": fold_std(best_fold_scores), "cv_folds": len(folds)} if folds else {}),
+        "lookback":     best_cfg.lookback,
+        "refit_months": best_cfg.refit_months,
+        "trade_months": best_cfg.trade_months,
+        "search":       search,
+        "evaluations":  len(result.evaluations),
         "train_start":  str(train.index[0].date()),
         "train_end":    str(train.index[-1].date()),
         "val_start":    str(val.index[0].date()),
@@ -277,6 +957,146 @@ def tune_index(
         "test_start":   str(test.index[0].date()),
         "test_end":     str(test.index[-1].date()),
     }
+    if checkpoint is not None:
+        checkpoint.log.append({
+            "key": result_key,
+            "kind": "result",
+            "code": SCORING_CODE_VERSION,
+            "index": index_name,
+            "fingerprint": fingerprint,
+            "settings": settings,
+            "row": row,
+            "evaluations": evaluations.to_dict("records"),
+        })
+    return row
+
+
+def _tune_index_worker(
+    index_name: str,
+    lookback: int | list[int],
+    refit_months: int | list[int],
+    trade_months: int | list[int],
+    dtype: str = "float64",
+    search: str = "coarse-fine",
+    budget: int = DEFAULT_BUDGET,
+    seed: int = 0,
+    log_path: str | None = None,
+    resume: bool = False,
+    cv_folds: int = 0,
+    pca_cache_dir: str | None = None,
+) -> tuple[str, dict, str, list[dict]]:
+    """Process-pool entry point: tune one index with its output captured.
+
+    Each worker loads the returns file itself (memory-mapped for ``.npy``
+    caches), so the matrix is never pickled across processes. The captured
+    log is returned so the parent can print it as one uninterrupted block,
+    along with the index's evaluation records.
+    """
+    buffer = io.StringIO()
+    search_log: list[dict] = []
+    with contextlib.redirect_stdout(buffer):
+        row = tune_index(
+            index_name=index_name,
+            lookback=lookback,
+            refit_months=refit_months,
+            trade_months=trade_months,
+            dtype=dtype,
+            search=search,
+            budget=budget,
+            seed=seed,
+            search_log=search_log,
+            log_path=log_path,
+            resume=resume,
+            cv_folds=cv_folds,
+            pca_cache_dir=pca_cache_dir,
+        )
+    return index_name, row, buffer.getvalue(), search_log
+
+
+def _print_index_header(index_name: str) -> None:
+    print(f"\n{'=' * 60}")
+    print(f"Tuning: {index_name}")
+    print(f"{'=' * 60}")
+
+
+def tune_indices(
+    index_names: list[str],
+    lookback: int | list[int],
+    refit_months: int | list[int],
+    trade_months: int | list[int],
+    workers: int = 1,
+    dtype: str = "float64",
+    search: str = "coarse-fine",
+    budget: int = DEFAULT_BUDGET,
+    seed: int = 0,
+    search_log: list[dict] | None = None,
+    log_path: str | None = None,
+    resume: bool = False,
+    cv_folds: int = 0,
+    pca_cache_dir: str | None = None,
+) -> list[dict]:
+    """Tune several indices, optionally in a process pool.
+
+    Rows come back in ``index_names`` order regardless of completion order.
+    With ``workers > 1`` each index's log is printed in one piece as it
+    finishes, followed by a one-line progress note. Evaluation records of
+    every index are appended to ``search_log`` when given. All indices
+    checkpoint to the same ``log_path``.
+    """
+    rows_by_index: dict[str, dict] = {}
+    logs_by_index: dict[str, list[dict]] = {}
+
+    if workers <= 1 or len(index_names) <= 1:
+        for index_name in index_names:
+            _print_index_header(index_name)
+            logs_by_index[index_name] = []
+            rows_by_index[index_name] = tune_index(
+                index_name=index_name,
+                lookback=lookback,
+                refit_months=refit_months,
+                trade_months=trade_months,
+                dtype=dtype,
+                search=search,
+                budget=budget,
+                seed=seed,
+                search_log=logs_by_index[index_name],
+                log_path=log_path,
+                resume=resume,
+                cv_folds=cv_folds,
+                pca_cache_dir=pca_cache_dir,
+            )
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(index_names))) as pool:
+            futures = [
+                pool.submit(
+                    _tune_index_worker,
+                    name,
+                    lookback,
+                    refit_months,
+                    trade_months,
+                    dtype,
+                    search,
+                    budget,
+                    seed,
+                    log_path,
+                    resume,
+                    cv_folds,
+                    pca_cache_dir,
+                )
+                for name in index_names
+            ]
+            for done, future in enumerate(as_completed(futures), start=1):
+                index_name, row, log, index_log = future.result()
+                _print_index_header(index_name)
+                print(log, end="")
+                print(f"  [{done}/{len(index_names)} indices done]")
+                rows_by_index[index_name] = row
+                logs_by_index[index_name] = index_log
+
+    if search_log is not None:
+        for name in index_names:
+            search_log.extend(logs_by_index.get(name, []))
+    return [rows_by_index[name] for name in index_names if rows_by_index.get(name)]
 
 
 # ---------------------------------------------------------------------------
@@ -285,7 +1105,7 @@ def tune_index(
 
 def main() -> None:
     parser = argparse.ArgumentParser(
-        description="Coarse-to-fine grid search for PCA stat-arb z-score thresholds."
+        description="Hyperparameter search for PCA stat-arb z-score thresholds."
     )
     parser.add_argument(
         "--index",
@@ -296,20 +1116,23 @@ def main() -> None:
     parser.add_argument(
         "--lookback",
         type=int,
-        default=60,
-        help="Rolling z-score lookback window in trading days (default: 60).",
+        nargs="+",
+        default=[60],
+        help="Rolling z-score lookback window(s) in trading days; several values tune it (default: 60).",
     )
     parser.add_argument(
         "--refit-months",
         type=int,
-        default=6,
-        help="PCA refit window in months (default: 6).",
+        nargs="+",
+        default=[6],
+        help="PCA refit window(s) in months; several values tune it (default: 6).",
     )
     parser.add_argument(
         "--trade-months",
         type=int,
-        default=6,
-        help="Trade window in months after each refit (default: 6).",
+        nargs="+",
+        default=[6],
+        help="Trade window(s) in months after each refit; several values tune it (default: 6).",
     )
     parser.add_argument(
         "--output",
@@ -317,28 +1140,121 @@ def main() -> None:
         default=os.path.join(PROJECT_ROOT, "data", "tuning_results.csv"),
         help="Path to save tuning results CSV.",
     )
+    parser.add_argument(
+        "--search",
+        choices=SEARCH_METHODS,
+        default="coarse-fine",
+        help="Search strategy (default: coarse-fine grid).",
+    )
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=DEFAULT_BUDGET,
+        help=f"Evaluations per index for grid/random/halving/tpe (default: {DEFAULT_BUDGET}).",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed for random/halving/tpe searches (default: 0).",
+    )
+    parser.add_argument(
+        "--cv-folds",
+        type=int,
+        default=0,
+        help="Score each configuration by walk-forward CV with this many folds "
+             "over train + val (default: 0, the single val slice).",
+    )
+    parser.add_argument(
+        "--search-log",
+        type=str,
+        default=os.path.join(PROJECT_ROOT, "data", "tuning_evaluations.csv"),
+        help="Path to save every evaluated point (one row per evaluation).",
+    )
+    parser.add_argument(
+        "--log",
+        type=str,
+        default=DEFAULT_LOG_PATH,
+        help="Append-only evaluation log every score is checkpointed to.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse scores and finished indices already in --log for the same data, "
+             "settings and code (default: recompute everything; new records are appended either way).",
+    )
+    parser.add_argument(
+        "--from-log",
+        action="store_true",
+        help="Only rebuild --output and --search-log from the results in --log.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Tune this many indices in parallel processes (default: 1).",
+    )
+    parser.add_argument(
+        "--pca-cache-dir",
+        nargs="?",
+        const=DEFAULT_PCA_CACHE_DIR,
+        default=None,
+        metavar="DIR",
+        help="Persist PCA fits to DIR (data/pca_cache if no value) for reuse by "
+             "later runs and workers. Default: memory only.",
+    )
+    parser.add_argument(
+        "--dtype",
+        choices=["float64", "float32"],
+        default="float64",
+        help="Precision of residuals, z-scores and PnL during the sweep (default: float64).",
+    )
     args = parser.parse_args()
 
     selected = {name for name, _ in ALL_INDICES}
     if args.index:
         selected = set(args.index)
 
-    results_rows: list[dict] = []
+    if args.from_log:
+        summary, evaluations = results_from_log(args.log)
+        if summary.empty:
+            print(f"No finished results in {args.log}.")
+            return
+        summary = summary[summary.index.isin(selected)]
+        columns = ["entry_z", "exit_z", "val_sharpe", "test_sharpe"]
+        if "val_sharpe_std" in summary:
+            columns.insert(3, "val_sharpe_std")
+        print(summary[columns].to_string())
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+        summary.to_csv(args.output)
+        print(f"\nResults rebuilt from {args.log} saved to {args.output}")
+        if not evaluations.empty:
+            evaluations[evaluations["index"].isin(selected)].to_csv(args.search_log, index=False)
+            print(f"Evaluations saved to {args.search_log}")
+        return
 
-    for index_name, _ in ALL_INDICES:
-        if index_name not in selected:
-            continue
-        print(f"\n{'=' * 60}")
-        print(f"Tuning: {index_name}")
-        print(f"{'=' * 60}")
-        row = tune_index(
-            index_name=index_name,
-            lookback=args.lookback,
-            refit_months=args.refit_months,
-            trade_months=args.trade_months,
-        )
-        if row:
-            results_rows.append(row)
+    search_log: list[dict] = []
+    results_rows = tune_indices(
+        [name for name, _ in ALL_INDICES if name in selected],
+        lookback=args.lookback,
+        refit_months=args.refit_months,
+        trade_months=args.trade_months,
+        workers=args.workers,
+        dtype=args.dtype,
+        search=args.search,
+        budget=args.budget,
+        seed=args.seed,
+        search_log=search_log,
+        log_path=args.log,
+        resume=args.resume,
+        cv_folds=args.cv_folds,
+        pca_cache_dir=args.pca_cache_dir,
+    )
+
+    if search_log:
+        os.makedirs(os.path.dirname(args.search_log), exist_ok=True)
+        pd.DataFrame(search_log).to_csv(args.search_log, index=False)
+        print(f"\nSaved {len(search_log)} evaluations to {args.search_log}")
 
     if not results_rows:
         print("\nNo results to save.")
@@ -351,7 +1267,12 @@ def main() -> None:
     print(f"\n{'=' * 60}")
     print("TUNING SUMMARY")
     print(f"{'=' * 60}")
-    print(summary[["entry_z", "exit_z", "val_sharpe", "test_sharpe"]].to_string())
+    columns = ["entry_z", "exit_z", "val_sharpe", "test_sharpe"]
+    if args.cv_folds:
+        columns.insert(3, "val_sharpe_std")
+    if len(args.lookback) > 1 or len(args.refit_months) > 1 or len(args.trade_months) > 1:
+        columns += ["lookback", "refit_months", "trade_months"]
+    print(summary[columns].to_string())
 
     os.makedirs(os.path.dirname(args.output), exist_ok=True)
     summary.to_csv(args.output)